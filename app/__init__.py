@@ -1,15 +1,17 @@
 import os
 import secrets
-import psycopg2
 from dotenv import load_dotenv
 from flask import Flask
 from flask_login import LoginManager
 
 from app.models.users import User
 from app.routes import init_app
-from app.utils.database import check_db_health, close_db, init_db, get_db
-from app.utils.init_db import init_db
+from app.utils.database import close_db
+from app.utils.email import outbox_cli
+from app.utils.migrations import check_schema_version, db_cli
 from app.utils.logger import setup_logger
+from app.utils.maps_manager import maps_cli
+from app.utils.rate_limit import ratelimit_cli, trust_proxies
 
 load_dotenv()
 
@@ -24,6 +26,12 @@ def create_app(test_config=None):
     app.config.from_mapping(
         SECRET_KEY='dev',
         DATABASE=os.path.join(app.instance_path, 'activity.sqlite'),
+        MAIL_SERVER=os.environ.get('MAIL_SERVER', 'localhost'),
+        MAIL_PORT=int(os.environ.get('MAIL_PORT', 587)),
+        MAIL_USE_TLS=os.environ.get('MAIL_USE_TLS', 'true').lower() in ('1', 'true', 'yes'),
+        MAIL_USERNAME=os.environ.get('MAIL_USERNAME'),
+        MAIL_PASSWORD=os.environ.get('MAIL_PASSWORD'),
+        MAIL_DEFAULT_SENDER=os.environ.get('MAIL_DEFAULT_SENDER', 'events@localhost'),
     )
 
     if test_config is None:
@@ -36,46 +44,29 @@ def create_app(test_config=None):
     except OSError:
         pass
 
-    # Initialize database
-    init_db(app)
+    # Client addresses (per-IP rate limits) come from X-Forwarded-For behind proxies
+    trust_proxies(app)
+
+    # Return pooled connections at the end of every request/app context
+    app.teardown_appcontext(close_db)
+
+    # Schema changes are applied with `flask db upgrade`; startup only checks the version
+    app.cli.add_command(db_cli)
+    app.cli.add_command(maps_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(ratelimit_cli)
+    check_schema_version(app)
 
     # Initialize login manager
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
 
+    # Served from a per-worker cache, so authenticated requests need no extra query
     @login_manager.user_loader
     def load_user(user_id):
-        return User.get(user_id)
+        return User.load(user_id)
 
-    # Create admin user INSIDE create_app()
-    with app.app_context():
-        db = get_db()
-        cur = db.cursor()
-        try:
-            cur.execute(
-                "SELECT * FROM resident WHERE role = 'admin'"
-            )
-            admin = cur.fetchone()
-            
-            if not admin:
-                from werkzeug.security import generate_password_hash
-                cur.execute(
-                    """
-                    INSERT INTO resident (username, email, password_hash, role)
-                    VALUES (%s, %s, %s, %s)
-                    """,
-                    ('admin', 'admin@example.com', generate_password_hash('admin'), 'admin')
-                )
-                db.commit()
-
-        except psycopg2.errors.UndefinedTable:
-            log.error("Table 'resident' does not exist. Did the database schema fail to initialize?")
-        finally:
-            cur.close()
-
-    app.teardown_appcontext(close_db)
-    
     # Register all blueprints
     init_app(app=app)
 
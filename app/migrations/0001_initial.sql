@@ -1,17 +1,9 @@
-DROP TABLE IF EXISTS hosts;
-DROP TABLE IF EXISTS member;
-DROP TABLE IF EXISTS prerequisite;
-DROP TABLE IF EXISTS review;
-DROP TABLE IF EXISTS session;
-DROP TABLE IF EXISTS event;
-DROP TABLE IF EXISTS location;
-DROP TABLE IF EXISTS activity_group;
-DROP TABLE IF EXISTS resident;
-DROP TABLE IF EXISTS waitlist;
-DROP TABLE IF EXISTS registrations;
+-- 0001: baseline schema.
+-- Idempotent so databases originally built from app/utils/schema.sql can be
+-- adopted by the migration runner without losing data.
 
 -- Table: resident
-CREATE TABLE resident (
+CREATE TABLE IF NOT EXISTS resident (
     resident_id SERIAL PRIMARY KEY,
     username TEXT UNIQUE NOT NULL,
     email TEXT UNIQUE,
@@ -22,7 +14,7 @@ CREATE TABLE resident (
 );
 
 -- Table: activity_group
-CREATE TABLE activity_group (
+CREATE TABLE IF NOT EXISTS activity_group (
     name TEXT PRIMARY KEY,
     category TEXT NOT NULL,
     description TEXT NOT NULL,
@@ -41,7 +33,7 @@ CREATE TABLE activity_group (
 );
 
 -- Table: review
-CREATE TABLE review (
+CREATE TABLE IF NOT EXISTS review (
     review_id SERIAL PRIMARY KEY,
     resident_id INTEGER NOT NULL,
     activity_group_name TEXT NOT NULL,
@@ -55,7 +47,7 @@ CREATE TABLE review (
 );
 
 -- Table: location
-CREATE TABLE location (
+CREATE TABLE IF NOT EXISTS location (
     id SERIAL PRIMARY KEY,
     address TEXT NOT NULL,
     city TEXT NOT NULL,
@@ -65,7 +57,7 @@ CREATE TABLE location (
 );
 
 -- Table: event
-CREATE TABLE event (
+CREATE TABLE IF NOT EXISTS event (
     id SERIAL PRIMARY KEY,
     activity_group_name TEXT NOT NULL,
     date DATE NOT NULL,
@@ -82,7 +74,7 @@ CREATE TABLE event (
 );
 
 -- Table: session
-CREATE TABLE session (
+CREATE TABLE IF NOT EXISTS session (
     id SERIAL PRIMARY KEY,
     activity_group_name TEXT NOT NULL,
     event_id INTEGER NOT NULL,
@@ -95,7 +87,7 @@ CREATE TABLE session (
 );
 
 -- Table: member (associative)
-CREATE TABLE member (
+CREATE TABLE IF NOT EXISTS member (
     resident_id INTEGER,
     activity_group_name TEXT,
     join_date DATE,
@@ -106,7 +98,7 @@ CREATE TABLE member (
 );
 
 -- Table: hosts (associative)
-CREATE TABLE hosts (
+CREATE TABLE IF NOT EXISTS hosts (
     activity_group_name TEXT,
     session_id INTEGER,
     PRIMARY KEY (activity_group_name, session_id),
@@ -115,7 +107,7 @@ CREATE TABLE hosts (
 );
 
 -- Table: prerequisite (associative, self-referencing)
-CREATE TABLE prerequisite (
+CREATE TABLE IF NOT EXISTS prerequisite (
     id SERIAL PRIMARY KEY,
     event_id INTEGER NOT NULL,
     prerequisite_event_id INTEGER NOT NULL,
@@ -129,7 +121,7 @@ CREATE TABLE prerequisite (
 );
 
 -- Table: registrations
-CREATE TABLE registrations (
+CREATE TABLE IF NOT EXISTS registrations (
     id SERIAL PRIMARY KEY,
     event_id INTEGER NOT NULL,
     user_id INTEGER NOT NULL,
@@ -141,7 +133,7 @@ CREATE TABLE registrations (
 );
 
 -- Table: waitlist
-CREATE TABLE waitlist (
+CREATE TABLE IF NOT EXISTS waitlist (
     id SERIAL PRIMARY KEY,
     event_id INTEGER NOT NULL,
     user_id INTEGER NOT NULL,
@@ -150,3 +142,6 @@ CREATE TABLE waitlist (
     FOREIGN KEY (user_id) REFERENCES resident(resident_id),
     UNIQUE (event_id, user_id)
 );
+
+-- event.name is written by the create-event form but was never in schema.sql
+ALTER TABLE event ADD COLUMN IF NOT EXISTS name TEXT;
@@ -0,0 +1,41 @@
+-- 0002: secondary indexes for the hot read paths.
+-- registrations(event_id, user_id) and waitlist(event_id, user_id) already have
+-- UNIQUE indexes; these cover the remaining lookups and sort orders.
+
+-- Seat counts: list_events, Event.register_user, profile dashboards
+CREATE INDEX IF NOT EXISTS registrations_event_registered_idx
+    ON registrations (event_id)
+    WHERE status = 'registered';
+
+-- "My events" on the resident profile and prerequisite history lookups
+CREATE INDEX IF NOT EXISTS registrations_user_status_idx
+    ON registrations (user_id, status, event_id);
+
+-- Waitlist head for promotion and ordered waitlist listings
+CREATE INDEX IF NOT EXISTS waitlist_event_created_idx
+    ON waitlist (event_id, created_at);
+
+CREATE INDEX IF NOT EXISTS waitlist_user_idx
+    ON waitlist (user_id);
+
+-- Reviews for a group, newest first
+CREATE INDEX IF NOT EXISTS review_group_date_idx
+    ON review (activity_group_name, review_date DESC);
+
+-- Prerequisite graph, both directions
+CREATE INDEX IF NOT EXISTS prerequisite_event_idx
+    ON prerequisite (event_id, prerequisite_event_id);
+
+CREATE INDEX IF NOT EXISTS prerequisite_prerequisite_event_idx
+    ON prerequisite (prerequisite_event_id);
+
+-- Sessions of an event
+CREATE INDEX IF NOT EXISTS session_event_date_idx
+    ON session (event_id, date);
+
+-- Event listings by date and the organizer dashboard
+CREATE INDEX IF NOT EXISTS event_date_idx
+    ON event (date);
+
+CREATE INDEX IF NOT EXISTS event_created_by_idx
+    ON event (created_by);
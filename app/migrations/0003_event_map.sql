@@ -0,0 +1,9 @@
+-- 0003: map embeds move from app/data/maps_data.json into the database.
+-- Existing embeds are copied over with `flask maps import-json`.
+
+CREATE TABLE IF NOT EXISTS event_map (
+    event_id INTEGER PRIMARY KEY,
+    embed_url TEXT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES event(id) ON DELETE CASCADE
+);
@@ -0,0 +1,17 @@
+-- 0004: denormalized seat counters on event.
+-- Kept exact by the Event model in the same transaction as every registration,
+-- cancellation and waitlist change; `flask events reconcile-counts` repairs drift.
+
+ALTER TABLE event
+    ADD COLUMN IF NOT EXISTS registered_count INTEGER NOT NULL DEFAULT 0 CHECK (registered_count >= 0),
+    ADD COLUMN IF NOT EXISTS waitlist_count INTEGER NOT NULL DEFAULT 0 CHECK (waitlist_count >= 0);
+
+UPDATE event e
+SET registered_count = (
+        SELECT COUNT(*) FROM registrations r
+        WHERE r.event_id = e.id AND r.status = 'registered'
+    ),
+    waitlist_count = (
+        SELECT COUNT(*) FROM waitlist w
+        WHERE w.event_id = e.id
+    );
@@ -0,0 +1,22 @@
+-- 0005: outbox for outgoing email.
+-- Request handlers insert rows (usually in the same transaction as the change
+-- they announce); `flask outbox worker` delivers them over a reused SMTP connection.
+
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'sending', 'sent', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    claimed_at TIMESTAMP,
+    sent_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Work queue: only undelivered rows are indexed
+CREATE INDEX IF NOT EXISTS notification_outbox_due_idx
+    ON notification_outbox (next_attempt_at, id)
+    WHERE status IN ('pending', 'sending');
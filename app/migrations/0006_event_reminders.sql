@@ -0,0 +1,4 @@
+-- 0006: remember which events already had their day-before reminders queued,
+-- so re-running the reminder job (or running two at once) never double-sends.
+
+ALTER TABLE event ADD COLUMN IF NOT EXISTS reminders_sent_at TIMESTAMP;
@@ -0,0 +1,34 @@
+-- 0007: append-only log of prerequisite edge changes.
+-- Each worker keeps the prerequisite graph in memory and catches up by reading
+-- the log rows it has not seen yet. Writers take an advisory lock (released at
+-- commit), so log ids become visible in increasing order and a reader that has
+-- seen id N never misses a row below N.
+
+CREATE TABLE IF NOT EXISTS prerequisite_log (
+    id BIGSERIAL PRIMARY KEY,
+    event_id INTEGER NOT NULL,
+    prerequisite_event_id INTEGER NOT NULL,
+    delta SMALLINT NOT NULL CHECK (delta IN (-1, 1)),
+    logged_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION log_prerequisite_change() RETURNS trigger AS $$
+BEGIN
+    -- Same key as app.services.prerequisite_graph.LOCK_KEY
+    PERFORM pg_advisory_xact_lock(7301843);
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        INSERT INTO prerequisite_log (event_id, prerequisite_event_id, delta)
+        VALUES (OLD.event_id, OLD.prerequisite_event_id, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO prerequisite_log (event_id, prerequisite_event_id, delta)
+        VALUES (NEW.event_id, NEW.prerequisite_event_id, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS prerequisite_log_trigger ON prerequisite;
+CREATE TRIGGER prerequisite_log_trigger
+    AFTER INSERT OR UPDATE OF event_id, prerequisite_event_id OR DELETE ON prerequisite
+    FOR EACH ROW EXECUTE FUNCTION log_prerequisite_change();
@@ -0,0 +1,179 @@
+-- 0008: materialized prerequisite qualifications.
+-- One row per (user, prerequisite) the user has ever satisfied, holding the last
+-- day the qualification is valid: the latest qualifying session of the
+-- prerequisite event plus the prerequisite's qualification_period. Statement
+-- triggers on registrations, session and prerequisite keep it current, so a
+-- prerequisite check is an index lookup compared against CURRENT_DATE.
+
+CREATE TABLE IF NOT EXISTS qualification (
+    user_id INTEGER NOT NULL REFERENCES resident(resident_id) ON DELETE CASCADE,
+    prerequisite_id INTEGER NOT NULL REFERENCES prerequisite(id) ON DELETE CASCADE,
+    prerequisite_event_id INTEGER NOT NULL,
+    qualified_until DATE NOT NULL,
+    PRIMARY KEY (user_id, prerequisite_id)
+);
+
+CREATE INDEX IF NOT EXISTS qualification_prerequisite_event_idx
+    ON qualification (prerequisite_event_id, user_id);
+
+-- Recompute the qualifications earned through the given (user, prerequisite
+-- event) pairs; a NULL user array means every user of the given events.
+CREATE OR REPLACE FUNCTION refresh_qualifications(p_user_ids INTEGER[], p_event_ids INTEGER[])
+RETURNS void AS $$
+BEGIN
+    IF p_user_ids IS NULL THEN
+        DELETE FROM qualification WHERE prerequisite_event_id = ANY(p_event_ids);
+        INSERT INTO qualification (user_id, prerequisite_id, prerequisite_event_id, qualified_until)
+        SELECT r.user_id, p.id, p.prerequisite_event_id, MAX(s.date) + p.qualification_period
+        FROM prerequisite p
+        JOIN registrations r ON r.event_id = p.prerequisite_event_id AND r.status = 'completed'
+        JOIN session s ON s.event_id = p.prerequisite_event_id
+                      AND s.attendance >= p.minimum_performance
+        WHERE p.prerequisite_event_id = ANY(p_event_ids)
+        GROUP BY r.user_id, p.id
+        ON CONFLICT (user_id, prerequisite_id)
+        DO UPDATE SET qualified_until = EXCLUDED.qualified_until;
+    ELSE
+        DELETE FROM qualification q
+        USING UNNEST(p_user_ids, p_event_ids) AS k(user_id, event_id)
+        WHERE q.user_id = k.user_id AND q.prerequisite_event_id = k.event_id;
+        INSERT INTO qualification (user_id, prerequisite_id, prerequisite_event_id, qualified_until)
+        SELECT r.user_id, p.id, p.prerequisite_event_id, MAX(s.date) + p.qualification_period
+        FROM (SELECT DISTINCT * FROM UNNEST(p_user_ids, p_event_ids) AS k(user_id, event_id)) k
+        JOIN prerequisite p ON p.prerequisite_event_id = k.event_id
+        JOIN registrations r ON r.user_id = k.user_id AND r.event_id = k.event_id
+                            AND r.status = 'completed'
+        JOIN session s ON s.event_id = p.prerequisite_event_id
+                      AND s.attendance >= p.minimum_performance
+        GROUP BY r.user_id, p.id
+        ON CONFLICT (user_id, prerequisite_id)
+        DO UPDATE SET qualified_until = EXCLUDED.qualified_until;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- A registration becoming (or ceasing to be) 'completed'
+CREATE OR REPLACE FUNCTION registrations_refresh_qualifications() RETURNS trigger AS $$
+DECLARE
+    users INTEGER[];
+    events INTEGER[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(user_id), array_agg(event_id) INTO users, events
+        FROM new_rows
+        WHERE status = 'completed'
+          AND event_id IN (SELECT prerequisite_event_id FROM prerequisite);
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(user_id), array_agg(event_id) INTO users, events
+        FROM old_rows
+        WHERE status = 'completed'
+          AND event_id IN (SELECT prerequisite_event_id FROM prerequisite);
+    ELSE
+        SELECT array_agg(user_id), array_agg(event_id) INTO users, events
+        FROM (
+            SELECT user_id, event_id FROM old_rows WHERE status = 'completed'
+            UNION
+            SELECT user_id, event_id FROM new_rows WHERE status = 'completed'
+        ) changed
+        WHERE event_id IN (SELECT prerequisite_event_id FROM prerequisite);
+    END IF;
+    IF users IS NOT NULL THEN
+        PERFORM refresh_qualifications(users, events);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Session attendance recorded or changed
+CREATE OR REPLACE FUNCTION session_refresh_qualifications() RETURNS trigger AS $$
+DECLARE
+    events INTEGER[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT event_id) INTO events FROM new_rows
+        WHERE event_id IN (SELECT prerequisite_event_id FROM prerequisite);
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT event_id) INTO events FROM old_rows
+        WHERE event_id IN (SELECT prerequisite_event_id FROM prerequisite);
+    ELSE
+        SELECT array_agg(DISTINCT event_id) INTO events
+        FROM (SELECT event_id FROM old_rows UNION SELECT event_id FROM new_rows) changed
+        WHERE event_id IN (SELECT prerequisite_event_id FROM prerequisite);
+    END IF;
+    IF events IS NOT NULL THEN
+        PERFORM refresh_qualifications(NULL, events);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- New or edited prerequisites (deleted ones cascade)
+CREATE OR REPLACE FUNCTION prerequisite_refresh_qualifications() RETURNS trigger AS $$
+DECLARE
+    events INTEGER[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT prerequisite_event_id) INTO events FROM new_rows;
+    ELSE
+        SELECT array_agg(DISTINCT prerequisite_event_id) INTO events
+        FROM (
+            SELECT prerequisite_event_id FROM old_rows
+            UNION
+            SELECT prerequisite_event_id FROM new_rows
+        ) changed;
+    END IF;
+    IF events IS NOT NULL THEN
+        PERFORM refresh_qualifications(NULL, events);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS registrations_qualification_insert ON registrations;
+CREATE TRIGGER registrations_qualification_insert
+    AFTER INSERT ON registrations REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION registrations_refresh_qualifications();
+
+DROP TRIGGER IF EXISTS registrations_qualification_update ON registrations;
+CREATE TRIGGER registrations_qualification_update
+    AFTER UPDATE ON registrations REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION registrations_refresh_qualifications();
+
+DROP TRIGGER IF EXISTS registrations_qualification_delete ON registrations;
+CREATE TRIGGER registrations_qualification_delete
+    AFTER DELETE ON registrations REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION registrations_refresh_qualifications();
+
+DROP TRIGGER IF EXISTS session_qualification_insert ON session;
+CREATE TRIGGER session_qualification_insert
+    AFTER INSERT ON session REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION session_refresh_qualifications();
+
+DROP TRIGGER IF EXISTS session_qualification_update ON session;
+CREATE TRIGGER session_qualification_update
+    AFTER UPDATE ON session REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION session_refresh_qualifications();
+
+DROP TRIGGER IF EXISTS session_qualification_delete ON session;
+CREATE TRIGGER session_qualification_delete
+    AFTER DELETE ON session REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION session_refresh_qualifications();
+
+DROP TRIGGER IF EXISTS prerequisite_qualification_insert ON prerequisite;
+CREATE TRIGGER prerequisite_qualification_insert
+    AFTER INSERT ON prerequisite REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION prerequisite_refresh_qualifications();
+
+DROP TRIGGER IF EXISTS prerequisite_qualification_update ON prerequisite;
+CREATE TRIGGER prerequisite_qualification_update
+    AFTER UPDATE ON prerequisite REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION prerequisite_refresh_qualifications();
+
+-- Backfill
+INSERT INTO qualification (user_id, prerequisite_id, prerequisite_event_id, qualified_until)
+SELECT r.user_id, p.id, p.prerequisite_event_id, MAX(s.date) + p.qualification_period
+FROM prerequisite p
+JOIN registrations r ON r.event_id = p.prerequisite_event_id AND r.status = 'completed'
+JOIN session s ON s.event_id = p.prerequisite_event_id AND s.attendance >= p.minimum_performance
+GROUP BY r.user_id, p.id
+ON CONFLICT (user_id, prerequisite_id) DO NOTHING;
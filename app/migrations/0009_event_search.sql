@@ -0,0 +1,57 @@
+-- 0009: full-text search for events.
+-- search_vector (ranked word/prefix matches) and search_text (substring
+-- matches through pg_trgm) are kept current by triggers on event and location.
+
+ALTER TABLE event ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+ALTER TABLE event ADD COLUMN IF NOT EXISTS search_text TEXT;
+
+CREATE OR REPLACE FUNCTION event_search_document() RETURNS trigger AS $$
+DECLARE
+    loc location%ROWTYPE;
+BEGIN
+    SELECT * INTO loc FROM location WHERE id = NEW.location_id;
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', concat_ws(' ', NEW.name, NEW.activity_group_name)), 'A')
+        || setweight(to_tsvector('simple', concat_ws(' ', loc.city, loc.state)), 'B')
+        || setweight(to_tsvector('simple', concat_ws(' ', loc.address, loc.zip_code)), 'C');
+    NEW.search_text := lower(concat_ws(' ', NEW.name, NEW.activity_group_name,
+                                       loc.address, loc.city, loc.state, loc.zip_code));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS event_search_trigger ON event;
+CREATE TRIGGER event_search_trigger
+    BEFORE INSERT OR UPDATE OF name, activity_group_name, location_id ON event
+    FOR EACH ROW EXECUTE FUNCTION event_search_document();
+
+-- An edited address re-indexes the events held there
+CREATE OR REPLACE FUNCTION location_search_document() RETURNS trigger AS $$
+BEGIN
+    UPDATE event SET location_id = location_id WHERE location_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS location_search_trigger ON location;
+CREATE TRIGGER location_search_trigger
+    AFTER UPDATE OF address, city, state, zip_code ON location
+    FOR EACH ROW EXECUTE FUNCTION location_search_document();
+
+-- Backfill through the trigger
+UPDATE event SET location_id = location_id;
+
+CREATE INDEX IF NOT EXISTS event_search_vector_idx ON event USING GIN (search_vector);
+
+-- Substring search needs pg_trgm; without it search falls back to word/prefix matches
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS event_search_text_trgm_idx
+            ON event USING GIN (search_text gin_trgm_ops);
+    ELSE
+        RAISE NOTICE 'pg_trgm is not available; event search will not match substrings';
+    END IF;
+END;
+$$;
@@ -0,0 +1,30 @@
+-- 0010: versioned activity_group catalog.
+-- Workers keep every activity group in memory. Each statement that writes the
+-- table bumps its version here and sends NOTIFY activity_group_catalog with the
+-- new version; notifications are delivered on commit, so listeners reload only
+-- once the change is visible to them.
+
+CREATE TABLE IF NOT EXISTS catalog_version (
+    name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO catalog_version (name) VALUES ('activity_group') ON CONFLICT (name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_activity_group_version() RETURNS trigger AS $$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    UPDATE catalog_version SET version = version + 1
+    WHERE name = 'activity_group'
+    RETURNING version INTO new_version;
+    -- Same channel as app.services.activity_group_catalog.CHANNEL
+    PERFORM pg_notify('activity_group_catalog', new_version::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS activity_group_catalog_version ON activity_group;
+CREATE TRIGGER activity_group_catalog_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON activity_group
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_activity_group_version();
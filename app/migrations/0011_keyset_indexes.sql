@@ -0,0 +1,22 @@
+-- 0011: indexes matching the keyset pagination orders.
+-- Pages are read as (sort key, id) < (last key seen) in descending order; with
+-- the id tie-breaker in the index the next page starts with an index seek
+-- instead of re-reading and sorting the rows before it.
+
+DROP INDEX IF EXISTS review_group_date_idx;
+CREATE INDEX IF NOT EXISTS review_group_date_id_idx
+    ON review (activity_group_name, review_date, review_id);
+
+CREATE INDEX IF NOT EXISTS review_resident_date_id_idx
+    ON review (resident_id, review_date, review_id);
+
+DROP INDEX IF EXISTS session_event_date_idx;
+CREATE INDEX IF NOT EXISTS session_event_date_id_idx
+    ON session (event_id, date, id);
+
+CREATE INDEX IF NOT EXISTS session_date_id_idx
+    ON session (date, id);
+
+DROP INDEX IF EXISTS event_date_idx;
+CREATE INDEX IF NOT EXISTS event_date_id_idx
+    ON event (date, id);
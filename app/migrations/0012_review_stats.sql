@@ -0,0 +1,26 @@
+-- 0012: per-group review aggregates.
+-- Kept exact by the Review model in the same transaction as every review
+-- create, update and delete; `flask reviews reconcile-stats` repairs drift.
+
+CREATE TABLE IF NOT EXISTS review_stats (
+    activity_group_name TEXT PRIMARY KEY REFERENCES activity_group(name),
+    review_count INTEGER NOT NULL DEFAULT 0 CHECK (review_count >= 0),
+    rating_sum INTEGER NOT NULL DEFAULT 0 CHECK (rating_sum >= 0),
+    stars_1 INTEGER NOT NULL DEFAULT 0 CHECK (stars_1 >= 0),
+    stars_2 INTEGER NOT NULL DEFAULT 0 CHECK (stars_2 >= 0),
+    stars_3 INTEGER NOT NULL DEFAULT 0 CHECK (stars_3 >= 0),
+    stars_4 INTEGER NOT NULL DEFAULT 0 CHECK (stars_4 >= 0),
+    stars_5 INTEGER NOT NULL DEFAULT 0 CHECK (stars_5 >= 0)
+);
+
+INSERT INTO review_stats (activity_group_name, review_count, rating_sum,
+                          stars_1, stars_2, stars_3, stars_4, stars_5)
+SELECT activity_group_name, COUNT(*), SUM(star_rating),
+       COUNT(*) FILTER (WHERE star_rating = 1),
+       COUNT(*) FILTER (WHERE star_rating = 2),
+       COUNT(*) FILTER (WHERE star_rating = 3),
+       COUNT(*) FILTER (WHERE star_rating = 4),
+       COUNT(*) FILTER (WHERE star_rating = 5)
+FROM review
+GROUP BY activity_group_name
+ON CONFLICT (activity_group_name) DO NOTHING;
@@ -0,0 +1,17 @@
+-- 0013: indexes for the paged organizer dashboard.
+-- The dashboard pages an organizer's events by (date, id) and loads each
+-- event's registrants and waitlist on demand, a page at a time, by
+-- (created_at, id). These replace the single-column indexes they extend.
+
+DROP INDEX IF EXISTS event_created_by_idx;
+CREATE INDEX IF NOT EXISTS event_created_by_date_id_idx
+    ON event (created_by, date, id);
+
+DROP INDEX IF EXISTS registrations_event_registered_idx;
+CREATE INDEX IF NOT EXISTS registrations_event_registered_created_id_idx
+    ON registrations (event_id, created_at, id)
+    WHERE status = 'registered';
+
+DROP INDEX IF EXISTS waitlist_event_created_idx;
+CREATE INDEX IF NOT EXISTS waitlist_event_created_id_idx
+    ON waitlist (event_id, created_at, id);
@@ -0,0 +1,13 @@
+-- 0014: token buckets for login and registration rate limits.
+-- One row per limited key (a route with a client IP or a username), shared by
+-- every worker. Each request takes a token with a single conditional upsert
+-- that first refills the bucket for the time since its last update. UNLOGGED:
+-- buckets are cheap to lose on a crash and not worth a WAL write per attempt.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_bucket (
+    key TEXT PRIMARY KEY,
+    capacity DOUBLE PRECISION NOT NULL CHECK (capacity >= 1),
+    refill_per_second DOUBLE PRECISION NOT NULL CHECK (refill_per_second > 0),
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL
+);
@@ -0,0 +1,8 @@
+-- 0015: group ratings join the activity_group catalog.
+-- Workers keep review_stats in memory next to the groups for the landing page,
+-- so writes to it bump the same catalog version and NOTIFY as activity_group.
+
+DROP TRIGGER IF EXISTS review_stats_catalog_version ON review_stats;
+CREATE TRIGGER review_stats_catalog_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON review_stats
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_activity_group_version();
@@ -1,5 +1,228 @@
-from app.utils.database import get_db
-from datetime import datetime
+import re
+
+import psycopg2
+from blinker import Namespace
+
+from app.utils.database import PreparedStatement, get_db
+from app.utils.pagination import decode_cursor, keyset_page
+from datetime import date, datetime
+
+_signals = Namespace()
+
+# Sent with (event_id, user_ids=[...]) from inside the transaction that promoted
+# the users, so receivers writing through get_db() commit or roll back with it.
+waitlist_promoted = _signals.signal("waitlist-promoted")
+
+# Words of a search query; anything else (tsquery operators, punctuation) is dropped
+_SEARCH_WORD = re.compile(r"[^\W_]+")
+
+# Whether the pg_trgm substring index exists; looked up once per process
+_trigram_search = None
+
+# How many of the newest matching events Event.search ranks by relevance
+SEARCH_CANDIDATES = 500
+
+EVENTS_PER_PAGE = 20
+DASHBOARD_EVENTS_PER_PAGE = 50
+REGISTRANTS_PER_PAGE = 50
+
+# Whether a user already holds a registration or waitlist entry, and a seat for
+# them if neither and the event has room; run with the event row locked
+CLAIM_SEAT_SQL = """
+    WITH state AS (
+        SELECT
+            EXISTS (SELECT 1 FROM event WHERE id = %(event_id)s) AS event_exists,
+            EXISTS (
+                SELECT 1 FROM registrations
+                WHERE event_id = %(event_id)s AND user_id = %(user_id)s
+            ) AS registered,
+            EXISTS (
+                SELECT 1 FROM waitlist
+                WHERE event_id = %(event_id)s AND user_id = %(user_id)s
+            ) AS waitlisted
+    ),
+    seat AS (
+        UPDATE event
+        SET registered_count = registered_count + 1
+        WHERE id = %(event_id)s
+          AND (COALESCE(max_participants, 0) = 0 OR registered_count < max_participants)
+          AND NOT (SELECT registered OR waitlisted FROM state)
+        RETURNING id
+    )
+    SELECT state.*, EXISTS (SELECT 1 FROM seat) AS has_seat FROM state
+"""
+
+# The earliest waitlisted user of an event who can be emailed
+WAITLIST_HEAD_SQL = """
+    SELECT w.id, w.user_id, r.email,
+           COALESCE(e.name, e.activity_group_name) AS event_name, e.date
+    FROM waitlist w
+    JOIN resident r ON w.user_id = r.resident_id
+    JOIN event e ON e.id = w.event_id
+    WHERE w.event_id = %s AND r.email IS NOT NULL
+    ORDER BY w.created_at ASC
+    LIMIT 1
+"""
+
+# Paged listings: each query's {after} is empty for the first page and its
+# keyset condition, e.g. EVENTS_PAGE_AFTER, for the page after a token
+
+# All events, newest first by (date, id)
+EVENTS_PAGE_SQL = """
+    SELECT e.*, l.address, l.city, l.state, l.zip_code
+    FROM event e
+    LEFT JOIN location l ON e.location_id = l.id
+    {after}
+    ORDER BY e.date DESC, e.id DESC
+    LIMIT %s
+"""
+EVENTS_PAGE_AFTER = "WHERE (e.date, e.id) < (%s, %s)"
+
+# The events an organizer created, newest first by (date, id)
+ORGANIZER_EVENTS_SQL = """
+    SELECT id, activity_group_name, date, max_participants, registered_count, waitlist_count
+    FROM event
+    WHERE created_by = %s {after}
+    ORDER BY date DESC, id DESC
+    LIMIT %s
+"""
+ORGANIZER_EVENTS_AFTER = "AND (date, id) < (%s, %s)"
+
+# Registrant lists of an event, in sign-up order by (created_at, id): (query, keyset condition)
+REGISTRANT_LISTS = {
+    "registered": (
+        """
+        SELECT r.id, r.created_at, r.status, u.resident_id, u.username, u.email
+        FROM registrations r
+        JOIN resident u ON r.user_id = u.resident_id
+        WHERE r.event_id = %s AND r.status = 'registered' {after}
+        ORDER BY r.created_at, r.id
+        LIMIT %s
+        """,
+        "AND (r.created_at, r.id) > (%s, %s)",
+    ),
+    "waitlisted": (
+        """
+        SELECT w.id, w.created_at, u.resident_id, u.username, u.email
+        FROM waitlist w
+        JOIN resident u ON w.user_id = u.resident_id
+        WHERE w.event_id = %s {after}
+        ORDER BY w.created_at, w.id
+        LIMIT %s
+        """,
+        "AND (w.created_at, w.id) > (%s, %s)",
+    ),
+}
+
+# A resident's events for the profile page
+REGISTERED_EVENTS_SQL = """
+    SELECT e.id, e.activity_group_name, e.date
+    FROM event e
+    JOIN registrations r ON r.event_id = e.id
+    WHERE r.user_id = %s AND r.status = 'registered'
+"""
+WAITLISTED_EVENTS_SQL = """
+    SELECT e.id, e.activity_group_name, e.date
+    FROM event e
+    JOIN waitlist w ON w.event_id = e.id
+    WHERE w.user_id = %s
+"""
+
+# Search: {conditions} always includes SEARCH_MATCH when the query has words,
+# which may use %(pattern)s for the pg_trgm substring match
+SEARCH_SQL = """
+    SELECT e.*, l.address, l.city, l.state, l.zip_code,
+           ts_rank(e.search_vector, query) AS rank
+    FROM (
+        SELECT e.*
+        FROM event e, to_tsquery('simple', %(tsquery)s) AS query
+        WHERE {conditions}
+        ORDER BY e.date DESC
+        LIMIT %(candidates)s
+    ) AS e
+    LEFT JOIN location l ON e.location_id = l.id,
+         to_tsquery('simple', %(tsquery)s) AS query
+    ORDER BY rank DESC, e.date DESC
+    LIMIT %(limit)s
+"""
+SEARCH_MATCH = "e.search_vector @@ query"
+
+# Everything the event page shows, in one round trip: the event and its
+# location, the map embed, the viewer's registration and waitlist state (NULL
+# and false for anonymous viewers) and the prerequisites as a JSON array.
+# The event columns are listed because the statement is prepared: with e.* a
+# migration that adds a column would break it on every pooled connection.
+EVENT_DETAIL_SQL = """
+    SELECT e.id, e.activity_group_name, e.name, e.date, e.location_id,
+           e.max_participants, e.cost, e.registration_required,
+           e.registration_deadline, e.created_by, e.created_at,
+           e.registered_count, e.waitlist_count, e.reminders_sent_at,
+           l.address, l.city, l.state, l.zip_code,
+           m.embed_url AS maps_embed,
+           (SELECT r.status FROM registrations r
+            WHERE r.event_id = e.id AND r.user_id = %(user_id)s) AS registration_status,
+           EXISTS (SELECT 1 FROM waitlist w
+                   WHERE w.event_id = e.id AND w.user_id = %(user_id)s) AS on_waitlist,
+           COALESCE(
+               (SELECT json_agg(to_jsonb(p) || jsonb_build_object(
+                                    'activity_group_name', pe.activity_group_name, 'date', pe.date)
+                                ORDER BY p.id)
+                FROM prerequisite p
+                JOIN event pe ON p.prerequisite_event_id = pe.id
+                WHERE p.event_id = e.id),
+               '[]'
+           ) AS prerequisites
+    FROM event e
+    LEFT JOIN location l ON e.location_id = l.id
+    LEFT JOIN event_map m ON m.event_id = e.id
+    WHERE e.id = %(event_id)s
+"""
+
+# Planning the query above takes several times longer than running it
+_event_detail = PreparedStatement("event_detail", EVENT_DETAIL_SQL, "event_id", "user_id")
+
+
+def _after_key(after):
+    return decode_cursor(after, date, int) if after else ()
+
+
+PROMOTE_WAITLIST_SQL = """
+    WITH seats AS (
+        SELECT CASE WHEN COALESCE(max_participants, 0) = 0 THEN NULL
+                    ELSE GREATEST(max_participants - registered_count, 0)
+               END AS free
+        FROM event
+        WHERE id = %(event_id)s
+    ),
+    head AS (
+        SELECT id
+        FROM waitlist
+        WHERE event_id = %(event_id)s
+        ORDER BY created_at, id
+        LIMIT (SELECT free FROM seats)
+    ),
+    promoted AS (
+        DELETE FROM waitlist w
+        USING head
+        WHERE w.id = head.id
+        RETURNING w.id, w.user_id, w.created_at
+    ),
+    registered AS (
+        INSERT INTO registrations (event_id, user_id, status)
+        SELECT %(event_id)s, user_id, 'registered' FROM promoted
+        ON CONFLICT (event_id, user_id) DO UPDATE
+            SET status = 'registered', created_at = CURRENT_TIMESTAMP
+            WHERE registrations.status <> 'registered'
+        RETURNING user_id
+    ),
+    counters AS (
+        UPDATE event
+        SET registered_count = registered_count + (SELECT COUNT(*) FROM registered),
+            waitlist_count = waitlist_count - (SELECT COUNT(*) FROM promoted)
+        WHERE id = %(event_id)s AND EXISTS (SELECT 1 FROM promoted)
+    )
+    SELECT user_id FROM promoted ORDER BY created_at, id
+"""
 
 
 class Event:
@@ -62,10 +285,37 @@ class Event:
         
         return dict(event) if event else None
 
+    @staticmethod
+    def get_detail(event_id, user_id=None):
+        """Get an event with everything its page shows, in one query.
+
+        Adds ``maps_embed``, ``prerequisites`` (dicts, dates as ISO strings) and
+        ``is_registered``/``is_waitlisted`` for ``user_id`` to the row of ``get``,
+        less the search columns.
+        """
+        db = get_db()
+        cursor = db.cursor()
+        _event_detail.execute(cursor, {"event_id": event_id, "user_id": user_id})
+        event = cursor.fetchone()
+        cursor.close()
+        if event is None:
+            return None
+
+        event = dict(event)
+        status = event.pop('registration_status')
+        on_waitlist = event.pop('on_waitlist')
+        # A registration row of any status takes precedence over the waitlist
+        event['is_registered'] = status == 'registered'
+        event['is_waitlisted'] = status is None and on_waitlist
+        return event
+
 
     @staticmethod
     def get_all(search_query=None, exclude_event_id=None):
         """Get all events, optionally filtered by search query."""
+        if search_query:
+            return Event.search(search_query, exclude_event_id=exclude_event_id)
+
         db = get_db()
         cursor = db.cursor()
         query = """
@@ -76,17 +326,6 @@ class Event:
         """
         params = []
         
-        if search_query:
-            query += """
-                AND (
-                    e.activity_group_name ILIKE %s
-                    OR l.address ILIKE %s
-                    OR l.city ILIKE %s
-                )
-            """
-            search_term = f"%{search_query}%"
-            params.extend([search_term, search_term, search_term])
-        
         if exclude_event_id:
             query += " AND e.id != %s"
             params.append(exclude_event_id)
@@ -99,6 +338,108 @@ class Event:
         
         return [dict(event) for event in events if event is not None and isinstance(event, dict)]
 
+    @staticmethod
+    def get_page(after=None, per_page=EVENTS_PER_PAGE):
+        """Fetch a page of events, newest first.
+
+        ``after`` is the token returned with the previous page; returns
+        ``(events, token for the next page or None)``.
+        """
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(
+            EVENTS_PAGE_SQL.format(after=EVENTS_PAGE_AFTER if after else ""),
+            (*_after_key(after), per_page + 1)
+        )
+        events = [dict(event) for event in cursor.fetchall()]
+        cursor.close()
+        return keyset_page(events, per_page, "date", "id")
+
+    @staticmethod
+    def get_created_by(user_id, after=None, per_page=DASHBOARD_EVENTS_PER_PAGE):
+        """Fetch a page of the events an organizer created, newest first; see get_page.
+
+        Seat counts come from the event row; registrant lists are loaded
+        separately, per event, with get_registrants.
+        """
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(
+            ORGANIZER_EVENTS_SQL.format(after=ORGANIZER_EVENTS_AFTER if after else ""),
+            (user_id, *_after_key(after), per_page + 1)
+        )
+        events = [dict(event) for event in cursor.fetchall()]
+        cursor.close()
+        return keyset_page(events, per_page, "date", "id")
+
+    @staticmethod
+    def get_registrants(event_id, kind, after=None, per_page=REGISTRANTS_PER_PAGE):
+        """Fetch a page of an event's ``kind`` ("registered" or "waitlisted") users in sign-up order.
+
+        ``after`` is the token returned with the previous page; returns
+        ``(users, token for the next page or None)``.
+        """
+        query, after_condition = REGISTRANT_LISTS[kind]
+        key = decode_cursor(after, datetime, int) if after else ()
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(
+            query.format(after=after_condition if after else ""),
+            (event_id, *key, per_page + 1)
+        )
+        users = [dict(user) for user in cursor.fetchall()]
+        cursor.close()
+        return keyset_page(users, per_page, "created_at", "id")
+
+    @staticmethod
+    def search(search_query, limit=50, exclude_event_id=None, date=None):
+        """Events matching the words of ``search_query``, best match first, then newest.
+
+        Each word matches event name, group, and location words by prefix via the
+        search_vector GIN index. When pg_trgm is installed the whole query also
+        matches as a substring of the same fields. Relevance is ranked among the
+        newest ``SEARCH_CANDIDATES`` matches.
+        """
+        global _trigram_search
+
+        db = get_db()
+        cursor = db.cursor()
+        if _trigram_search is None:
+            cursor.execute("SELECT to_regclass('event_search_text_trgm_idx') IS NOT NULL AS present")
+            _trigram_search = cursor.fetchone()['present']
+
+        words = _SEARCH_WORD.findall((search_query or '').lower())
+        params = {
+            'tsquery': ' & '.join(f"{word}:*" for word in words),
+            'limit': limit,
+        }
+        conditions = []
+        if words:
+            match = SEARCH_MATCH
+            phrase = ' '.join(search_query.lower().split())
+            if _trigram_search and len(phrase) >= 3:
+                match += " OR e.search_text LIKE %(pattern)s"
+                escaped = phrase.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                params['pattern'] = f"%{escaped}%"
+            conditions.append(f"({match})")
+        if exclude_event_id:
+            conditions.append("e.id != %(exclude_event_id)s")
+            params['exclude_event_id'] = exclude_event_id
+        if date:
+            conditions.append("e.date = %(date)s")
+            params['date'] = date
+        if not conditions:
+            cursor.close()
+            return []
+
+        # Only the newest SEARCH_CANDIDATES matches are ranked: common words match
+        # a large share of all events, and ranking every one of them costs far
+        # more than walking event_date_id_idx until enough matches turn up.
+        params['candidates'] = SEARCH_CANDIDATES
+        cursor.execute(SEARCH_SQL.format(conditions=' AND '.join(conditions)), params)
+        events = [dict(event) for event in cursor.fetchall()]
+        cursor.close()
+        return events
 
 
     @staticmethod
@@ -119,9 +460,17 @@ class Event:
         query = f"UPDATE event SET {set_clause} WHERE id = %s"
         
         params = list(updates.values()) + [event_id]
-        cursor.execute(query, params)
-        db.commit()
-        cursor.close()
+        try:
+            cursor.execute(query, params)
+            if 'max_participants' in updates:
+                # A capacity increase frees seats for the waitlist
+                Event._promote_waitlist(cursor, event_id)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
 
 
     @staticmethod
@@ -148,6 +497,28 @@ class Event:
         cursor.close()
 
 
+    @staticmethod
+    def get_registered_events(user_id):
+        """The events a user holds a seat at, for their profile."""
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(REGISTERED_EVENTS_SQL, (user_id,))
+        events = cursor.fetchall()
+        cursor.close()
+        return events
+
+
+    @staticmethod
+    def get_waitlisted_events(user_id):
+        """The events a user is waitlisted for, for their profile."""
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(WAITLISTED_EVENTS_SQL, (user_id,))
+        events = cursor.fetchall()
+        cursor.close()
+        return events
+
+
     @staticmethod
     def get_registered_users(event_id):
         """Get all users registered for an event."""
@@ -189,112 +560,169 @@ class Event:
 
     @staticmethod
     def register_user(event_id, user_id):
-        """Register a user for an event."""
+        """Register a user for an event, or waitlist them if it is full.
+
+        The event row is locked before choosing between a seat and the
+        waitlist, the same lock cancellations take, so a seat freed while a
+        full event is being joined cannot be missed and concurrent
+        registrations can never oversell capacity.
+        """
         db = get_db()
         cursor = db.cursor()
-
-        event = Event.get(event_id)
-        if not event:
+        try:
+            cursor.execute("SELECT 1 FROM event WHERE id = %s FOR UPDATE", (event_id,))
+            cursor.execute(CLAIM_SEAT_SQL, {'event_id': event_id, 'user_id': user_id})
+            state = cursor.fetchone()
+            if not state['event_exists']:
+                raise ValueError("Event not found")
+            if state['registered']:
+                raise ValueError("User is already registered for this event")
+            if state['waitlisted']:
+                raise ValueError("User is already on the waitlist for this event")
+
+            if state['has_seat']:
+                cursor.execute(
+                    """
+                    INSERT INTO registrations (event_id, user_id, status)
+                    VALUES (%s, %s, 'registered')
+                    """,
+                    (event_id, user_id)
+                )
+            else:
+                cursor.execute(
+                    """
+                    WITH counter AS (
+                        UPDATE event SET waitlist_count = waitlist_count + 1 WHERE id = %(event_id)s
+                    )
+                    INSERT INTO waitlist (event_id, user_id) VALUES (%(event_id)s, %(user_id)s)
+                    """,
+                    {'event_id': event_id, 'user_id': user_id}
+                )
+            db.commit()
+            return state['has_seat']  # False means added to the waitlist
+        except psycopg2.errors.UniqueViolation:
+            # A concurrent request for the same user won the race
+            db.rollback()
+            raise ValueError("User is already registered for this event")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
             cursor.close()
-            raise ValueError("Event not found")
 
-        # Check if user is already registered
-        cursor.execute(
-            "SELECT * FROM registrations WHERE event_id = %s AND user_id = %s",
-            (event_id, user_id)
-        )
-        existing = cursor.fetchone()
 
-        if existing:
-            cursor.close()
-            raise ValueError("User is already registered for this event")
+    @staticmethod
+    def cancel_registration(event_id, user_id):
+        """Cancel a user's registration for an event and refill the freed seat."""
+        return Event.remove_registrations(event_id, [user_id])
+
 
-        # Check if event is full
-        if event['max_participants']:
+    @staticmethod
+    def remove_registrations(event_id, user_ids):
+        """Remove several users from an event's registrations and waitlist at once.
+
+        Freed seats are refilled from the waitlist in the same transaction.
+        Returns the IDs of the users who were promoted.
+        """
+        db = get_db()
+        cursor = db.cursor()
+        try:
+            cursor.execute("SELECT 1 FROM event WHERE id = %s FOR UPDATE", (event_id,))
             cursor.execute(
                 """
-                SELECT COUNT(*) AS count
-                FROM registrations
-                WHERE event_id = %s AND status = 'registered'
+                WITH removed AS (
+                    DELETE FROM registrations
+                    WHERE event_id = %(event_id)s AND user_id = ANY(%(user_ids)s)
+                    RETURNING status
+                ),
+                unlisted AS (
+                    DELETE FROM waitlist
+                    WHERE event_id = %(event_id)s AND user_id = ANY(%(user_ids)s)
+                    RETURNING id
+                )
+                UPDATE event
+                SET registered_count = registered_count
+                        - (SELECT COUNT(*) FROM removed WHERE status = 'registered'),
+                    waitlist_count = waitlist_count - (SELECT COUNT(*) FROM unlisted)
+                WHERE id = %(event_id)s
                 """,
-                (event_id,)
+                {'event_id': event_id, 'user_ids': list(user_ids)}
             )
-            registered_count = cursor.fetchone()['count']
+            promoted = Event._promote_waitlist(cursor, event_id)
+            db.commit()
+            return promoted
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
 
-            if registered_count >= event['max_participants']:
-                # Add to waitlist
-                cursor.execute(
-                    """
-                    INSERT INTO waitlist (event_id, user_id)
-                    VALUES (%s, %s)
-                    """,
-                    (event_id, user_id)
-                )
-                db.commit()
-                cursor.close()
-                return False  # Added to waitlist
 
-        # Register user
-        cursor.execute(
-            """
-            INSERT INTO registrations (event_id, user_id, status)
-            VALUES (%s, %s, 'registered')
-            """,
-            (event_id, user_id)
-        )
-        db.commit()
-        cursor.close()
-        return True  # Successfully registered
+    @staticmethod
+    def promote_waitlist(event_id):
+        """Fill every free seat of an event from its waitlist; returns promoted user IDs."""
+        db = get_db()
+        cursor = db.cursor()
+        try:
+            promoted = Event._promote_waitlist(cursor, event_id)
+            db.commit()
+            return promoted
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
 
 
     @staticmethod
-    def cancel_registration(event_id, user_id):
-        """Cancel a user's registration for an event."""
+    def _promote_waitlist(cursor, event_id):
+        """Move users from the head of the waitlist into every free seat.
+
+        Runs inside the caller's transaction: the event row is locked so
+        concurrent registrations cannot take the same seats, and a single
+        statement moves the rows and updates the counters.
+        """
+        cursor.execute("SELECT 1 FROM event WHERE id = %s FOR UPDATE", (event_id,))
+        cursor.execute(PROMOTE_WAITLIST_SQL, {'event_id': event_id})
+        promoted = [row['user_id'] for row in cursor.fetchall()]
+        if promoted:
+            waitlist_promoted.send(event_id, user_ids=promoted)
+        return promoted
+
+
+    @staticmethod
+    def reconcile_counts():
+        """Recompute every event's seat counters from registrations and waitlist.
+
+        Returns the IDs of events whose counters had drifted.
+        """
         db = get_db()
         cursor = db.cursor()
-
-        # Remove registration
+        # Block registrations while recounting so the fix cannot race them
+        cursor.execute("SELECT id FROM event ORDER BY id FOR UPDATE")
         cursor.execute(
             """
-            DELETE FROM registrations
-            WHERE event_id = %s AND user_id = %s
-            """,
-            (event_id, user_id)
-        )
-
-        # Check if there are waitlisted users
-        cursor.execute(
+            WITH actual AS (
+                SELECT e.id,
+                       (SELECT COUNT(*) FROM registrations r
+                        WHERE r.event_id = e.id AND r.status = 'registered') AS registered_count,
+                       (SELECT COUNT(*) FROM waitlist w WHERE w.event_id = e.id) AS waitlist_count
+                FROM event e
+            )
+            UPDATE event e
+            SET registered_count = actual.registered_count,
+                waitlist_count = actual.waitlist_count
+            FROM actual
+            WHERE e.id = actual.id
+              AND (e.registered_count, e.waitlist_count)
+                  IS DISTINCT FROM (actual.registered_count, actual.waitlist_count)
+            RETURNING e.id
             """
-            SELECT * FROM waitlist
-            WHERE event_id = %s
-            ORDER BY created_at ASC
-            LIMIT 1
-            """,
-            (event_id,)
         )
-        waitlisted = cursor.fetchone()
-
-        if waitlisted:
-            # Register the first waitlisted user
-            cursor.execute(
-                """
-                INSERT INTO registrations (event_id, user_id, status)
-                VALUES (%s, %s, 'registered')
-                """,
-                (event_id, waitlisted['user_id'])
-            )
-
-            # Remove from waitlist
-            cursor.execute(
-                """
-                DELETE FROM waitlist
-                WHERE event_id = %s AND user_id = %s
-                """,
-                (event_id, waitlisted['user_id'])
-            )
-
+        drifted = [row['id'] for row in cursor.fetchall()]
         db.commit()
         cursor.close()
+        return drifted
 
 
     @staticmethod
@@ -316,102 +744,16 @@ class Event:
         return [dict(row) for row in prerequisites]
 
 
-    def update(self):
-        """Update this event instance in the database."""
-        if self.max_participants < 0 or self.cost < 0:
-            raise ValueError("Max participants and cost must be non-negative")
-
-        db = get_db()
-        cursor = db.cursor()
-        cursor.execute(
-            """
-            UPDATE event
-            SET activity_group_name = %s, date = %s, location_id = %s,
-                max_participants = %s, cost = %s, registration_required = %s,
-                registration_deadline = %s
-            WHERE id = %s
-            """,
-            (
-                self.activity_group_name,
-                self.date,
-                self.location_id,
-                self.max_participants,
-                self.cost,
-                self.registration_required,
-                self.registration_deadline,
-                self.id,
-            ),
-        )
-        db.commit()
-        cursor.close()
-
-
-    def delete(self):
-        """Delete this event instance and related records from the database."""
-        db = get_db()
-        cursor = db.cursor()
-
-        # First delete all prerequisites where this event is either the main event or a prerequisite
-        cursor.execute("DELETE FROM prerequisite WHERE event_id = %s", (self.id,))
-        cursor.execute("DELETE FROM prerequisite WHERE prerequisite_event_id = %s", (self.id,))
-
-        # Delete the event itself
-        cursor.execute("DELETE FROM event WHERE id = %s", (self.id,))
-
-        db.commit()
-        cursor.close()
-
-
     @staticmethod
     def event_registration(event_id, user_id):
         """Register a user for an event, or add them to the waitlist if full."""
-        db = get_db()
-        cursor = db.cursor()
+        try:
+            registered = Event.register_user(event_id, user_id)
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
 
-        # Fetch event capacity and current number of registrations
-        cursor.execute(
-            """
-            SELECT max_participants,
-                   (SELECT COUNT(*) FROM registrations WHERE event_id = %s) AS current_participants
-            FROM event WHERE id = %s
-            """,
-            (event_id, event_id),
-        )
-        event = cursor.fetchone()
-
-        if not event:
-            cursor.close()
-            return {"success": False, "message": "Event not found"}
-
-        if event["current_participants"] < event["max_participants"]:
-            # Event has space - register the user
-            cursor.execute(
-                """
-                INSERT INTO registrations (event_id, user_id)
-                VALUES (%s, %s)
-                """,
-                (event_id, user_id),
-            )
-            db.commit()
-            cursor.close()
+        if registered:
             return {"success": True, "message": "Successfully registered for the event"}
-
-        # Check if the user is already on the waitlist
-        waitlist = Event.get_waitlist(user_id, event_id)
-        if waitlist:
-            cursor.close()
-            return {"success": False, "message": "User is already on the waitlist"}
-
-        # Add the user to the waitlist
-        cursor.execute(
-            """
-            INSERT INTO waitlist (event_id, user_id)
-            VALUES (%s, %s)
-            """,
-            (event_id, user_id),
-        )
-        db.commit()
-        cursor.close()
         return {"success": True, "message": "Event is full. Added to the waitlist"}
 
 
@@ -433,39 +775,20 @@ class Event:
 
     @staticmethod
     def notify_waitlist(event_id):
+        """Email the earliest waitlisted user with an address on file that a spot may be available."""
+        from app.utils.email import enqueue_email, waitlist_notification
+
         db = get_db()
         cursor = db.cursor()
-        cursor.execute(
-            """
-            SELECT w.id, w.user_id, r.email
-            FROM waitlist w
-            JOIN resident r ON w.user_id = r.resident_id
-            WHERE w.event_id = %s AND w.status = 'waiting'
-            ORDER BY w.added_at ASC
-            LIMIT 1
-            """,
-            (event_id,),
-        )
+        cursor.execute(WAITLIST_HEAD_SQL, (event_id,))
         waitlist_user = cursor.fetchone()
+        cursor.close()
 
         if not waitlist_user:
-            cursor.close()
-            return {"success": False, "message": "No users on the waitlist"}
-
-        # Simulate sending a notification
-        print(f"Notifying user {waitlist_user['email']} about an open spot in event {event_id}")
+            return {"success": False, "message": "No one on the waitlist has an email address on file"}
 
-        # Update waitlist status to 'notified'
-        cursor.execute(
-            """
-            UPDATE waitlist
-            SET status = 'notified'
-            WHERE id = %s
-            """,
-            (waitlist_user["id"],),
-        )
-        db.commit()
-        cursor.close()
+        subject, body = waitlist_notification(waitlist_user["event_name"], waitlist_user["date"])
+        enqueue_email(waitlist_user["email"], subject, body)
         return {
             "success": True,
             "message": "User notified",
@@ -473,97 +796,21 @@ class Event:
         }
 
 
-    @staticmethod
-    def confirm_waitlist(event_id, user_id):
-        db = get_db()
-        cursor = db.cursor()
-        cursor.execute(
-            """
-            SELECT * FROM waitlist
-            WHERE event_id = %s AND user_id = %s AND status = 'notified'
-            """,
-            (event_id, user_id),
-        )
-        waitlist_entry = cursor.fetchone()
-
-        if not waitlist_entry:
-            cursor.close()
-            return {"success": False, "message": "No notification found for this user"}
-
-        # Register the user
-        cursor.execute(
-            """
-            INSERT INTO registrations (event_id, user_id)
-            VALUES (%s, %s)
-            """,
-            (event_id, user_id),
-        )
-
-        # Remove the user from the waitlist
-        cursor.execute(
-            """
-            DELETE FROM waitlist
-            WHERE id = %s
-            """,
-            (waitlist_entry["id"],),
-        )
-        db.commit()
-        cursor.close()
-        return {"success": True, "message": "Waitlist spot confirmed and registered"}
-
-
     @staticmethod
     def event_notification():
-        db = get_db()
-        cursor = db.cursor()
-        cursor.execute(
-            """
-            SELECT e.id, e.activity_group_name, e.date, u.email
-            FROM event e
-            JOIN registrations r ON r.event_id = e.id 
-            JOIN resident u ON r.user_id = u.resident_id
-            WHERE e.date BETWEEN NOW() AND NOW() + INTERVAL '1 day'
-            """
-        )
-        events = cursor.fetchall()
+        """Queue the day-before reminder digests; see app.utils.reminders."""
+        from app.utils.reminders import send_event_reminders
 
-        for event in events:
-            print(
-                f"Sending notification to {event['email']} for event {event['activity_group_name']}"
-            )
-        
-        cursor.close()
+        return send_event_reminders()
 
 
     @staticmethod
     def search_events(search_term, date, location):
-        db = get_db()
-        cursor = db.cursor()
-        query = """
-            SELECT e.id, e.activity_group_name, e.date, e.location_id
-            FROM event e
-            LEFT JOIN location l ON e.location_id = l.id
-            WHERE 1=1
-        """
-        params = []
-
-        if search_term:
-            query += " AND e.activity_group_name ILIKE %s"
-            params.append(f"%{search_term}%")
-        if date:
-            query += " AND e.date = %s"
-            params.append(date)
-        if location:
-            query += (
-                " AND (l.address ILIKE %s OR l.city ILIKE %s OR l.state ILIKE %s OR l.zip_code ILIKE %s)"
-            )
-            params.extend([f"%{location}%", f"%{location}%", f"%{location}%", f"%{location}%"])
-
-        query += " ORDER BY e.date DESC"
-        cursor.execute(query, params)
-        events = cursor.fetchall()
-        cursor.close()
-        return events
+        search_query = ' '.join(term for term in (search_term, location) if term)
+        return [
+            {key: event[key] for key in ('id', 'activity_group_name', 'date', 'location_id')}
+            for event in Event.search(search_query, date=date)
+        ]
 
 
     @staticmethod
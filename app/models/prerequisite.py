@@ -1,5 +1,23 @@
+from app.services.prerequisite_graph import LOCK_KEY, prerequisite_graph
+from app.services.qualifications import qualification_cache
 from app.utils.database import get_db
 
+# An event's prerequisites, and the events that list one as a prerequisite,
+# each with the other event's group and date
+PREREQUISITES_SQL = """
+    SELECT p.*, e.activity_group_name, e.date
+    FROM prerequisite p
+    JOIN event e ON p.prerequisite_event_id = e.id
+    WHERE p.event_id = %s
+"""
+DEPENDENT_EVENTS_SQL = """
+    SELECT p.*, e.activity_group_name, e.date
+    FROM prerequisite p
+    JOIN event e ON p.event_id = e.id
+    WHERE p.prerequisite_event_id = %s
+"""
+
+
 class Prerequisite:
     def __init__(
         self,
@@ -17,35 +35,45 @@ class Prerequisite:
 
     @staticmethod
     def create(event_id, prerequisite_event_id, minimum_performance, qualification_period, is_waiver_allowed):
+        event_id, prerequisite_event_id = int(event_id), int(prerequisite_event_id)
+        if event_id == prerequisite_event_id:
+            raise ValueError("An event cannot be its own prerequisite")
+
         db = get_db()
         cursor = db.cursor()
+        try:
+            # Hold the graph lock until commit so two inserts cannot close a cycle together
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (LOCK_KEY,))
+            prerequisite_graph.refresh(force=True)
+            if prerequisite_graph.would_create_cycle(event_id, prerequisite_event_id):
+                raise ValueError("This prerequisite would create a circular dependency")
 
-        if event_id == prerequisite_event_id:
-            raise ValueError("An event cannot be its own prerequisite")
-        
-        # Check if prerequisite already exists
-        cursor.execute(
-            "SELECT * FROM prerequisite WHERE event_id = %s AND prerequisite_event_id = %s",
-            (event_id, prerequisite_event_id)
-        )
-        existing = cursor.fetchone()
-        
-        if existing:
+            # Check if prerequisite already exists
+            cursor.execute(
+                "SELECT 1 FROM prerequisite WHERE event_id = %s AND prerequisite_event_id = %s",
+                (event_id, prerequisite_event_id)
+            )
+            if cursor.fetchone():
+                raise ValueError("This prerequisite already exists")
+
+            # Insert new prerequisite
+            cursor.execute(
+                """
+                INSERT INTO prerequisite (
+                    event_id, prerequisite_event_id, minimum_performance,
+                    qualification_period, is_waiver_allowed
+                ) VALUES (%s, %s, %s, %s, %s)
+                """,
+                (event_id, prerequisite_event_id, minimum_performance, qualification_period, is_waiver_allowed)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
             cursor.close()
-            raise ValueError("This prerequisite already exists")
-        
-        # Insert new prerequisite
-        cursor.execute(
-            """
-            INSERT INTO prerequisite (
-                event_id, prerequisite_event_id, minimum_performance,
-                qualification_period, is_waiver_allowed
-            ) VALUES (%s, %s, %s, %s, %s)
-            """,
-            (event_id, prerequisite_event_id, minimum_performance, qualification_period, is_waiver_allowed)
-        )
-        db.commit()
-        cursor.close()
+        prerequisite_graph.refresh(force=True)
+        qualification_cache.invalidate()
 
     @staticmethod
     def remove(prerequisite_id):
@@ -57,88 +85,53 @@ class Prerequisite:
         )
         db.commit()
         cursor.close()
+        prerequisite_graph.refresh(force=True)
+        qualification_cache.invalidate()
 
     @staticmethod
-    def get_prerequisites(event_id):
-        db = get_db()
-        cursor = db.cursor()
+    def _get_events(event_ids):
+        """Event rows for ``event_ids``, in the given order."""
+        if not event_ids:
+            return []
+        cursor = get_db().cursor()
         cursor.execute(
-            """
-            SELECT p.*, e.activity_group_name, e.date
-            FROM prerequisite p
-            JOIN event e ON p.prerequisite_event_id = e.id
-            WHERE p.event_id = %s
-            """,
-            (event_id,)
+            "SELECT id, activity_group_name, name, date FROM event WHERE id = ANY(%s)",
+            (event_ids,)
         )
-        prerequisites = cursor.fetchall()
+        events = {row['id']: dict(row) for row in cursor.fetchall()}
         cursor.close()
-        return [dict(prereq) for prereq in prerequisites]
+        return [events[event_id] for event_id in event_ids if event_id in events]
 
     @staticmethod
-    def check_prerequisites(user_id, event_id):
+    def get_all_prerequisites(event_id):
+        """Direct and indirect prerequisite events of an event, nearest first."""
+        return Prerequisite._get_events(prerequisite_graph.prerequisites_of(event_id))
+
+    @staticmethod
+    def get_all_dependent_events(event_id):
+        """Events that directly or indirectly require this one, nearest first."""
+        return Prerequisite._get_events(prerequisite_graph.dependents_of(event_id))
+
+    @staticmethod
+    def get_prerequisites(event_id):
         db = get_db()
         cursor = db.cursor()
-
-        cursor.execute(
-            """
-            SELECT p.*, e.activity_group_name, e.date
-            FROM prerequisite p
-            JOIN event e ON p.prerequisite_event_id = e.id
-            WHERE p.event_id = %s
-            """,
-            (event_id,)
-        )
+        cursor.execute(PREREQUISITES_SQL, (event_id,))
         prerequisites = cursor.fetchall()
-
-        if not prerequisites:
-            cursor.close()
-            return True, []
-
-        unmet_prerequisites = []
-        for prereq in prerequisites:
-            cursor.execute(
-                """
-                SELECT r.*, s.attendance
-                FROM registrations r
-                JOIN session s ON r.event_id = s.event_id
-                WHERE r.user_id = %s AND r.event_id = %s
-                AND r.status = 'completed'
-                AND s.attendance >= %s
-                AND s.date >= CURRENT_DATE - INTERVAL '%s days'
-                """,
-                (
-                    user_id,
-                    prereq['prerequisite_event_id'],
-                    prereq['minimum_performance'],
-                    prereq['qualification_period'],
-                )
-            )
-            registration = cursor.fetchone()
-            if not registration:
-                unmet_prerequisites.append({
-                    'event_name': prereq['activity_group_name'],
-                    'date': prereq['date'],
-                    'minimum_performance': prereq['minimum_performance'],
-                    'qualification_period': prereq['qualification_period'],
-                    'is_waiver_allowed': prereq['is_waiver_allowed'],
-                })
         cursor.close()
+        return [dict(prereq) for prereq in prerequisites]
+
+    @staticmethod
+    def check_prerequisites(user_id, event_id):
+        """Return ``(met, unmet)`` from the cached qualification lookup."""
+        unmet_prerequisites = qualification_cache.unmet(user_id, event_id)
         return len(unmet_prerequisites) == 0, unmet_prerequisites
 
     @staticmethod
     def get_dependent_events(prerequisite_event_id):
         db = get_db()
         cursor = db.cursor()
-        cursor.execute(
-            """
-            SELECT p.*, e.activity_group_name, e.date
-            FROM prerequisite p
-            JOIN event e ON p.event_id = e.id
-            WHERE p.prerequisite_event_id = %s
-            """,
-            (prerequisite_event_id,)
-        )
+        cursor.execute(DEPENDENT_EVENTS_SQL, (prerequisite_event_id,))
         dependent_events = cursor.fetchall()
         cursor.close()
         return [dict(dep) for dep in dependent_events]
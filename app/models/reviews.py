@@ -1,4 +1,33 @@
+import datetime
+
+from app.services.review_stats import apply_review_delta, review_ratings
 from app.utils.database import get_db
+from app.utils.pagination import decode_cursor, keyset_page
+
+# Newest-first review pages; {after} is empty for the first page and
+# REVIEWS_AFTER, the keyset condition, for the page after a token
+GROUP_REVIEWS_SQL = """
+    SELECT r.*, u.username AS resident_name
+    FROM review r
+    JOIN resident u ON r.resident_id = u.resident_id
+    WHERE r.activity_group_name = %s {after}
+    ORDER BY r.review_date DESC, r.review_id DESC
+    LIMIT %s
+"""
+RESIDENT_REVIEWS_SQL = """
+    SELECT r.*, ag.name AS activity_group_name
+    FROM review r
+    JOIN activity_group ag ON r.activity_group_name = ag.name
+    WHERE r.resident_id = %s {after}
+    ORDER BY r.review_date DESC, r.review_id DESC
+    LIMIT %s
+"""
+REVIEWS_AFTER = "AND (r.review_date, r.review_id) < (%s, %s)"
+
+
+def _after_key(after):
+    return decode_cursor(after, datetime.date, int) if after else ()
+
 
 class Review:
     def __init__(
@@ -47,8 +76,10 @@ class Review:
             ),
         )
         review_id = cursor.fetchone()["review_id"]
+        apply_review_delta(cursor, activity_group_name, star_rating, 1)
         db.commit()
         cursor.close()
+        review_ratings.invalidate(activity_group_name)
         return review_id
 
     @staticmethod
@@ -80,6 +111,12 @@ class Review:
             raise ValueError("Star rating must be between 1 and 5")
         db = get_db()
         cursor = db.cursor()
+        # The stored rating, not this object's copy, is what review_stats counted
+        cursor.execute(
+            "SELECT activity_group_name, star_rating FROM review WHERE review_id = %s FOR UPDATE",
+            (self.review_id,),
+        )
+        old = cursor.fetchone()
         cursor.execute(
             """UPDATE review
                SET content = %s,
@@ -95,65 +132,118 @@ class Review:
                 self.review_id,
             ),
         )
+        if old is not None and old["star_rating"] != self.star_rating:
+            apply_review_delta(cursor, old["activity_group_name"], old["star_rating"], -1)
+            apply_review_delta(cursor, old["activity_group_name"], self.star_rating, 1)
         db.commit()
         cursor.close()
+        if old is not None:
+            review_ratings.invalidate(old["activity_group_name"])
 
     def delete(self):
         """Hard delete the review from the database."""
         db = get_db()
         cursor = db.cursor()
-        cursor.execute("DELETE FROM review WHERE review_id = %s", (self.review_id,))
+        cursor.execute(
+            "DELETE FROM review WHERE review_id = %s RETURNING activity_group_name, star_rating",
+            (self.review_id,),
+        )
+        deleted = cursor.fetchone()
+        if deleted is not None:
+            apply_review_delta(cursor, deleted["activity_group_name"], deleted["star_rating"], -1)
         db.commit()
         cursor.close()
+        if deleted is not None:
+            review_ratings.invalidate(deleted["activity_group_name"])
 
     @staticmethod
-    def get_by_activity_group(activity_group_name, page=1, per_page=10):
-        """Fetch reviews for an activity group with pagination."""
+    def get_by_activity_group(activity_group_name, after=None, per_page=10):
+        """Fetch a page of reviews for an activity group, newest first.
+
+        ``after`` is the token returned with the previous page; returns
+        ``(reviews, token for the next page or None)``.
+        """
         db = get_db()
-        offset = (page - 1) * per_page
         cursor = db.cursor()
         cursor.execute(
-            """SELECT r.*, u.username AS resident_name
-               FROM review r
-               JOIN resident u ON r.resident_id = u.resident_id
-               WHERE r.activity_group_name = %s
-               ORDER BY r.review_date DESC
-               LIMIT %s OFFSET %s""",
-            (activity_group_name, per_page, offset),
+            GROUP_REVIEWS_SQL.format(after=REVIEWS_AFTER if after else ""),
+            (activity_group_name, *_after_key(after), per_page + 1),
         )
-        reviews = cursor.fetchall()
+        reviews = [dict(review) for review in cursor.fetchall()]
         cursor.close()
-        return [dict(review) for review in reviews]
+        return keyset_page(reviews, per_page, "review_date", "review_id")
 
     @staticmethod
-    def get_by_resident(resident_id, page=1, per_page=10):
-        """Fetch reviews by a resident with pagination."""
+    def get_by_resident(resident_id, after=None, per_page=10):
+        """Fetch a page of reviews by a resident, newest first; see get_by_activity_group."""
         db = get_db()
-        offset = (page - 1) * per_page
         cursor = db.cursor()
         cursor.execute(
-            """SELECT r.*, ag.name AS activity_group_name
-               FROM review r
-               JOIN activity_group ag ON r.activity_group_name = ag.name
-               WHERE r.resident_id = %s
-               ORDER BY r.review_date DESC
-               LIMIT %s OFFSET %s""",
-            (resident_id, per_page, offset),
+            RESIDENT_REVIEWS_SQL.format(after=REVIEWS_AFTER if after else ""),
+            (resident_id, *_after_key(after), per_page + 1),
         )
-        reviews = cursor.fetchall()
+        reviews = [dict(review) for review in cursor.fetchall()]
         cursor.close()
-        return [dict(review) for review in reviews]
+        return keyset_page(reviews, per_page, "review_date", "review_id")
 
     @staticmethod
     def get_average_rating(activity_group_name):
+        return review_ratings.get(activity_group_name)["average"]
+
+    @staticmethod
+    def get_ratings(activity_group_names):
+        """Rating summaries for several groups at once, keyed by group name.
+
+        Each is ``{"count", "average", "histogram": [1-star, ..., 5-star]}``,
+        read from review_stats rather than aggregated over the reviews.
+        """
+        return review_ratings.get_many(activity_group_names)
+
+    @staticmethod
+    def reconcile_stats():
+        """Recompute every group's review_stats row from its reviews.
+
+        Returns the names of groups whose stats had drifted.
+        """
         db = get_db()
         cursor = db.cursor()
+        # Block review writes while recounting so the fix cannot race them
+        cursor.execute("LOCK TABLE review IN SHARE MODE")
         cursor.execute(
-            """SELECT AVG(star_rating) AS avg_rating
-               FROM review
-               WHERE activity_group_name = %s""",
-            (activity_group_name,),
+            """
+            WITH actual AS (
+                SELECT g.activity_group_name,
+                       COUNT(r.review_id) AS review_count,
+                       COALESCE(SUM(r.star_rating), 0) AS rating_sum,
+                       COUNT(*) FILTER (WHERE r.star_rating = 1) AS stars_1,
+                       COUNT(*) FILTER (WHERE r.star_rating = 2) AS stars_2,
+                       COUNT(*) FILTER (WHERE r.star_rating = 3) AS stars_3,
+                       COUNT(*) FILTER (WHERE r.star_rating = 4) AS stars_4,
+                       COUNT(*) FILTER (WHERE r.star_rating = 5) AS stars_5
+                FROM (SELECT activity_group_name FROM review_stats
+                      UNION SELECT activity_group_name FROM review) g
+                LEFT JOIN review r ON r.activity_group_name = g.activity_group_name
+                GROUP BY g.activity_group_name
+            )
+            INSERT INTO review_stats AS s
+            SELECT * FROM actual
+            ON CONFLICT (activity_group_name) DO UPDATE SET
+                review_count = EXCLUDED.review_count,
+                rating_sum = EXCLUDED.rating_sum,
+                stars_1 = EXCLUDED.stars_1,
+                stars_2 = EXCLUDED.stars_2,
+                stars_3 = EXCLUDED.stars_3,
+                stars_4 = EXCLUDED.stars_4,
+                stars_5 = EXCLUDED.stars_5
+            WHERE (s.review_count, s.rating_sum, s.stars_1, s.stars_2, s.stars_3, s.stars_4, s.stars_5)
+                  IS DISTINCT FROM
+                  (EXCLUDED.review_count, EXCLUDED.rating_sum, EXCLUDED.stars_1, EXCLUDED.stars_2,
+                   EXCLUDED.stars_3, EXCLUDED.stars_4, EXCLUDED.stars_5)
+            RETURNING s.activity_group_name
+            """
         )
-        result = cursor.fetchone()
+        drifted = [row["activity_group_name"] for row in cursor.fetchall()]
+        db.commit()
         cursor.close()
-        return result["avg_rating"] if result and result["avg_rating"] is not None else 0
+        review_ratings.invalidate()
+        return drifted
@@ -1,4 +1,28 @@
+import datetime
+
 from app.utils.database import get_db
+from app.utils.pagination import decode_cursor, keyset_page
+
+# Newest-first session pages; {after} is empty for the first page and the
+# matching keyset condition for the page after a token
+SESSIONS_SQL = """
+    SELECT * FROM session
+    {after}
+    ORDER BY date DESC, id DESC
+    LIMIT %s
+"""
+SESSIONS_AFTER = "WHERE (date, id) < (%s, %s)"
+EVENT_SESSIONS_SQL = """
+    SELECT * FROM session
+    WHERE event_id = %s {after}
+    ORDER BY date DESC, id DESC
+    LIMIT %s
+"""
+EVENT_SESSIONS_AFTER = "AND (date, id) < (%s, %s)"
+
+
+def _after_key(after):
+    return decode_cursor(after, datetime.date, int) if after else ()
 
 
 class Session:
@@ -46,32 +70,34 @@ class Session:
         )
 
     @staticmethod
-    def get_all(page=1, per_page=10):
-        """Fetch all sessions with pagination."""
+    def get_all(after=None, per_page=10):
+        """Fetch a page of sessions, newest first.
+
+        ``after`` is the token returned with the previous page; returns
+        ``(sessions, token for the next page or None)``.
+        """
         db = get_db()
-        offset = (page - 1) * per_page
-        sessions = db.execute(
-            """SELECT * FROM session
-               WHERE is_deleted = 0
-               ORDER BY date DESC
-               LIMIT ? OFFSET ?""",
-            (per_page, offset),
-        ).fetchall()
-        return sessions
+        cursor = db.cursor()
+        cursor.execute(
+            SESSIONS_SQL.format(after=SESSIONS_AFTER if after else ""),
+            (*_after_key(after), per_page + 1),
+        )
+        sessions = [dict(session) for session in cursor.fetchall()]
+        cursor.close()
+        return keyset_page(sessions, per_page, "date", "id")
 
     @staticmethod
-    def get_by_event(event_id, page=1, per_page=10):
-        """Fetch sessions by event ID with pagination."""
+    def get_by_event(event_id, after=None, per_page=10):
+        """Fetch a page of an event's sessions, newest first; see get_all."""
         db = get_db()
-        offset = (page - 1) * per_page
-        sessions = db.execute(
-            """SELECT * FROM session
-               WHERE event_id = ? AND is_deleted = 0
-               ORDER BY date DESC
-               LIMIT ? OFFSET ?""",
-            (event_id, per_page, offset),
-        ).fetchall()
-        return sessions
+        cursor = db.cursor()
+        cursor.execute(
+            EVENT_SESSIONS_SQL.format(after=EVENT_SESSIONS_AFTER if after else ""),
+            (event_id, *_after_key(after), per_page + 1),
+        )
+        sessions = [dict(session) for session in cursor.fetchall()]
+        cursor.close()
+        return keyset_page(sessions, per_page, "date", "id")
 
     def update(self):
         if self.attendance < 0:
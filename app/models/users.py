@@ -1,10 +1,9 @@
-from flask_bcrypt import Bcrypt
 from flask_login import UserMixin
+from app.services.passwords import password_hasher
+from app.services.user_cache import user_cache
 from app.utils.database import get_db
 from psycopg2 import IntegrityError 
 
-bcrypt = Bcrypt()
-
 class User(UserMixin):
     def __init__(self, resident_id, username, hashed_password, role='user'):
         self.id = resident_id
@@ -26,17 +25,30 @@ class User(UserMixin):
         )
         user = cursor.fetchone()
 
-        if user is None:
+        if user is None or not password_hasher.verify(password, user["password_hash"]):
+            cursor.close()
             return None
 
-        if bcrypt.check_password_hash(user["password_hash"], password):
-            return User(
-                user["resident_id"],
-                user["username"],
-                user["password_hash"],
-                user["role"]
+        password_hash = user["password_hash"]
+        if password_hasher.needs_rehash(password_hash):
+            # The work factor changed since this hash was made; the password is
+            # only known at login, so upgrade it now unless it changed meanwhile
+            password_hash = password_hasher.hash(password)
+            cursor.execute(
+                """UPDATE resident
+                   SET password_hash = %s
+                   WHERE resident_id = %s AND password_hash = %s""",
+                (password_hash, user["resident_id"], user["password_hash"]),
             )
-        return None
+            db.commit()
+        cursor.close()
+
+        return User(
+            user["resident_id"],
+            user["username"],
+            password_hash,
+            user["role"]
+        )
 
     @staticmethod
     def get(user_id):
@@ -47,6 +59,7 @@ class User(UserMixin):
             (user_id,),
         )
         user = cursor.fetchone()
+        cursor.close()
 
         if user is None:
             return None
@@ -58,10 +71,22 @@ class User(UserMixin):
             user["role"]
         )
 
+    @staticmethod
+    def load(user_id):
+        """The session user for Flask-Login, from the user cache; no password hash."""
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        principal = user_cache.get(user_id)
+        if principal is None:
+            return None
+        return User(principal["resident_id"], principal["username"], None, principal["role"])
+
     @staticmethod
     def create(username, password, role='user'):
         db = get_db()
-        hashed_password = bcrypt.generate_password_hash(password).decode("utf-8")
+        hashed_password = password_hasher.hash(password)
         try:
             cursor = db.cursor()
             cursor.execute(
@@ -80,7 +105,7 @@ class User(UserMixin):
             raise ValueError("Password cannot be empty")
         db = get_db()
         cursor = db.cursor()
-        hashed_password = bcrypt.generate_password_hash(new_password).decode("utf-8")
+        hashed_password = password_hasher.hash(new_password)
         cursor.execute(
             """UPDATE resident
                SET password_hash = %s
@@ -88,14 +113,16 @@ class User(UserMixin):
             (hashed_password, self.id),
         )
         db.commit()
+        user_cache.invalidate(self.id)
 
     def soft_delete(self):
         db = get_db()
         cursor = db.cursor()
         cursor.execute(
             """UPDATE resident
-               SET is_deleted = 1
+               SET is_deleted = TRUE
                WHERE resident_id = %s""",
             (self.id,),
         )
         db.commit()
+        user_cache.invalidate(self.id)
@@ -1,23 +1,24 @@
-import sqlite3
-import psycopg2
-import psycopg2.extras
-from flask import Blueprint, current_app, flash, g, redirect, render_template, request, url_for
-from flask_bcrypt import Bcrypt
+from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required, login_user, logout_user
 
 from app.models.users import User
+from app.services.passwords import PasswordHasherBusy
+from app.utils.database import get_db
+from app.utils.rate_limit import rate_limited
 
 auth_bp = Blueprint('auth', __name__)
-bcrypt = Bcrypt()
 
+BUSY_MESSAGE = 'We are handling a lot of sign-ins right now. Please try again in a moment.'
 
-def get_db():
-    if "db" not in g:
-        g.db = psycopg2.connect(current_app.config["DATABASE_URL"], cursor_factory=psycopg2.extras.RealDictCursor)
-    return g.db
+
+def _busy(template):
+    """Render ``template`` as a 503 when the password hasher turned the request away."""
+    flash(BUSY_MESSAGE)
+    return render_template(template), 503, {'Retry-After': '2'}
 
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
+@rate_limited('register', 'auth/register.html')
 def register():
     if request.method == 'POST':
         username = request.form['username']
@@ -36,6 +37,8 @@ def register():
                     error = f"User {username} is already registered."
                 else:
                     return redirect(url_for("auth.login"))
+            except PasswordHasherBusy:
+                return _busy('auth/register.html')
             except Exception as e:
                 error = f"An error occurred: {str(e)}"
         else:
@@ -47,12 +50,16 @@ def register():
 
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
+@rate_limited('login', 'auth/login.html')
 def login():
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
         error = None
-        user = User.validate(username, password)
+        try:
+            user = User.validate(username, password)
+        except PasswordHasherBusy:
+            return _busy('auth/login.html')
 
         if user is None:
             error = 'Incorrect username or password.'
@@ -72,9 +79,10 @@ def profile():
     db = get_db()
     cur = db.cursor()
     cur.execute(
-        "SELECT * FROM resident WHERE resident_id = $1", [current_user.resident_id]
+        "SELECT * FROM resident WHERE resident_id = %s", (current_user.id,)
     )
     customer = cur.fetchone()
+    cur.close()
 
     return render_template("auth/profile.html", customer=customer)
 
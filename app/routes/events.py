@@ -1,11 +1,14 @@
 import datetime
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+
+import click
+from flask import Blueprint, abort, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
 from app.models.activity_groups import ActivityGroup
 from app.models.events import Event
 from app.models.locations import Location
 from app.models.prerequisite import Prerequisite
+from app.services.activity_group_catalog import activity_group_catalog
 from app.utils.database import get_db
 from app.utils.decorators import admin_required
 from app.utils.maps_manager import MapsManager
@@ -14,86 +17,53 @@ events_bp = Blueprint("events", __name__)
 maps_manager = MapsManager()
 
 
-
+@events_bp.cli.command("reconcile-counts")
+def reconcile_counts_command():
+    """Repair drift in the denormalized event seat counters."""
+    drifted = Event.reconcile_counts()
+    click.echo(f"Reconciled seat counters for {len(drifted)} events.")
+    for event_id in drifted:
+        click.echo(f"  event {event_id}")
 
 
 @events_bp.route("/events")
 def list_events():
     search_query = request.args.get("q", "").strip()
-    events = Event.get_all(search_query=search_query)
-    print("Events returned from Event.get_all():", events)
+    next_page = None
+    if search_query:
+        events = Event.get_all(search_query=search_query)
+    else:
+        try:
+            events, next_page = Event.get_page(after=request.args.get("after"))
+        except ValueError:
+            abort(400)
 
+    # Seat counts come with the event rows; map embeds are fetched for the whole page at once
+    maps_embeds = maps_manager.get_event_maps([event['id'] for event in events])
     for event in events:
-        db = get_db()
-        cursor = db.cursor()
-        cursor.execute(
-            "SELECT COUNT(*) FROM registrations WHERE event_id = %s AND status = 'registered'",
-            (event['id'],)
-        )
-        result = cursor.fetchone()
-        count = result['count'] if result else 0
-        cursor.close()
-        event['registered_count'] = count
-        # Attach maps embed URL
-        event['maps_embed'] = maps_manager.get_event_map(event['id'])
-    return render_template("events/list.html", events=events, search_query=search_query)
+        event['maps_embed'] = maps_embeds[event['id']]
+    return render_template(
+        "events/list.html", events=events, search_query=search_query, next_page=next_page
+    )
 
 
 @events_bp.route("/events/<int:event_id>")
 def view_event(event_id):
-    event = Event.get(event_id)
+    user_id = current_user.id if current_user.is_authenticated else None
+    event = Event.get_detail(event_id, user_id)
     if not event:
         flash("Event not found", "error")
         return redirect(url_for("events.list_events"))
-    
-    # Get maps embed URL
-    event['maps_embed'] = maps_manager.get_event_map(event_id)
-    
-    is_registered = False
-    is_waitlisted = False
-    
-    if current_user.is_authenticated:
-        db = get_db()
-        cursor = db.cursor()
-        # Check registration status
-        cursor.execute(
-            """
-            SELECT * FROM registrations
-            WHERE event_id = %s AND user_id = %s
-            """,
-            (event_id, current_user.id)
-        )
-        registration = cursor.fetchone()
-        
-        if registration:
-            is_registered = registration['status'] == 'registered'
-        else:
-            # Check waitlist status
-            cursor.execute(
-                """
-                SELECT * FROM waitlist
-                WHERE event_id = %s AND user_id = %s
-                """,
-                (event_id, current_user.id)
-            )
-            waitlist = cursor.fetchone()
-            is_waitlisted = bool(waitlist)
-        
-        cursor.close()
-    
-    # Get prerequisites
-    prerequisites = Prerequisite.get_prerequisites(event_id)
-    
+
     return render_template(
         "events/view.html",
         event=event,
-        prerequisites=prerequisites,
-        is_registered=is_registered,
-        is_waitlisted=is_waitlisted
+        prerequisites=event['prerequisites'],
+        is_registered=event['is_registered'],
+        is_waitlisted=event['is_waitlisted']
     )
 
 
-
 @events_bp.route("/events/create", methods=["GET", "POST"])
 @login_required
 @admin_required
@@ -122,6 +92,7 @@ def create_event():
                     (group_name,)
                 )
                 db.commit()
+                activity_group_catalog.invalidate()
 
             # 3) Insert or get location ID
             address = request.form['address']
@@ -219,10 +190,6 @@ def create_event():
     return render_template("events/create.html", activity_groups=activity_groups)
 
 
-
-
-
-
 @events_bp.route("/events/<int:event_id>/edit", methods=["GET", "POST"])
 @login_required
 @admin_required
@@ -323,32 +290,55 @@ def cancel_registration(event_id):
     return redirect(url_for("events.view_event", event_id=event_id))
 
 
+@events_bp.route("/events/<int:event_id>/registrations/remove", methods=["POST"])
+@login_required
+@admin_required
+def remove_registrations(event_id):
+    user_ids = request.form.getlist("user_id", type=int)
+    if not user_ids:
+        flash("No users selected", "error")
+        return redirect(url_for("main.profile"))
+
+    try:
+        promoted = Event.remove_registrations(event_id, user_ids)
+        message = f"Removed {len(user_ids)} user(s)"
+        if promoted:
+            message += f"; promoted {len(promoted)} from the waitlist"
+        flash(message, "success")
+    except Exception as e:
+        flash(f"Error removing users: {str(e)}", "error")
+
+    return redirect(url_for("main.profile"))
+
+
+@events_bp.route("/events/<int:event_id>/registrants/<any(registered, waitlisted):kind>")
+@login_required
+@admin_required
+def event_registrants(event_id, kind):
+    """Table rows for one page of an event's registrants, for the admin dashboard."""
+    try:
+        users, next_page = Event.get_registrants(event_id, kind, after=request.args.get("after"))
+    except ValueError:
+        abort(400)
+    return render_template(
+        "events/registrants.html",
+        event_id=event_id,
+        kind=kind,
+        users=users,
+        next_page=next_page,
+    )
+
+
 @events_bp.route("/events/<int:event_id>/notify-waitlist", methods=["POST"])
 @login_required
 @admin_required
 def notify_waitlist(event_id):
     try:
-        db = get_db()
-        cursor = db.cursor()
-        cursor.execute(
-            """
-            SELECT w.*, u.email
-            FROM waitlist w
-            JOIN resident u ON w.user_id = u.resident_id
-            WHERE w.event_id = %s
-            ORDER BY w.created_at ASC
-            LIMIT 1
-            """,
-            (event_id,),
-        )
-        waitlisted = cursor.fetchone()
-        cursor.close()
-
-        if waitlisted:
-            # TODO: Send email notification here.
+        result = Event.notify_waitlist(event_id)
+        if result["success"]:
             flash("Notification sent to next person on waitlist", "success")
         else:
-            flash("No one is on the waitlist", "info")
+            flash(result["message"], "info")
 
     except Exception as e:
         flash(f"Error notifying waitlist: {str(e)}", "error")
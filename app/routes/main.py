@@ -1,19 +1,24 @@
 from flask import Blueprint, render_template, request
 from flask_login import current_user
 from app.services.activity_groups import ActivityGroupsService
+from app.services.activity_group_facets import FACETS
 
 main_bp = Blueprint('main', __name__)
 
 
 @main_bp.route('/')
 def index():
-    """Main landing page with optional category search."""
+    """Main landing page with optional search and facet filters."""
     svc = ActivityGroupsService()
     q = (request.args.get("category") or "").strip()
-    if q:
-        activity_groups = svc.search_activity_groups(q)
-    else:
-        activity_groups = svc.get_all_activity_groups()
+    filters = {name: request.args.getlist(name) for name in FACETS if request.args.getlist(name)}
+    activity_groups, facets = svc.filter_activity_groups(q, filters)
+    ratings = svc.get_ratings([group.name for group in activity_groups])
     return render_template(
-        "main/index.html", all_activity_groups=activity_groups, search_category=q
+        "main/index.html",
+        all_activity_groups=activity_groups,
+        facets=facets,
+        ratings=ratings,
+        search_category=q,
+        search_variable=q,
     )
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from app.models.events import Event
 from app.models.prerequisite import Prerequisite
+from app.services.prerequisite_graph import prerequisite_graph
 from app.utils.decorators import admin_required
 
 prerequisites_bp = Blueprint('prerequisites', __name__)
@@ -16,11 +17,20 @@ def list_prerequisites(event_id):
         return redirect(url_for('events.list_events'))
     
     prerequisites = Prerequisite.get_prerequisites(event_id)
-    available_events = Event.get_all(exclude_event_id=event_id)
+    direct_ids = {prereq['prerequisite_event_id'] for prereq in prerequisites}
+    indirect_prerequisites = [
+        e for e in Prerequisite.get_all_prerequisites(event_id) if e['id'] not in direct_ids
+    ]
+    # Events that depend on this one cannot also be its prerequisites
+    dependent_ids = set(prerequisite_graph.dependents_of(event_id))
+    available_events = [
+        e for e in Event.get_all(exclude_event_id=event_id) if e['id'] not in dependent_ids
+    ]
     
     return render_template('events/prerequisites.html',
                          event=event,
                          prerequisites=prerequisites,
+                         indirect_prerequisites=indirect_prerequisites,
                          available_events=available_events)
 
 @prerequisites_bp.route('/events/<int:event_id>/prerequisites/add', methods=['POST'])
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+import click
+from flask import Blueprint, abort, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
 from app.models.reviews import Review
@@ -8,16 +9,30 @@ from app.models.reviews import Review
 reviews_bp = Blueprint("reviews", __name__)
 
 
+@reviews_bp.cli.command("reconcile-stats")
+def reconcile_stats_command():
+    """Repair drift in the per-group review stats."""
+    drifted = Review.reconcile_stats()
+    click.echo(f"Reconciled review stats for {len(drifted)} activity groups.")
+    for name in drifted:
+        click.echo(f"  {name}")
+
+
 @reviews_bp.route("/activity-group/<name>/reviews")
 def list_reviews(name):
     """Display all reviews for an activity group."""
-    reviews = Review.get_by_activity_group(name)
-    avg_rating = Review.get_average_rating(name)
+    try:
+        reviews, next_page = Review.get_by_activity_group(name, after=request.args.get("after"))
+    except ValueError:
+        abort(400)
+    rating = Review.get_ratings([name])[name]
     return render_template(
         "reviews/list.html",
         activity_group_name=name,
         reviews=reviews,
-        avg_rating=avg_rating,
+        avg_rating=rating["average"],
+        rating=rating,
+        next_page=next_page,
     )
 
 
@@ -1,4 +1,4 @@
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask import Blueprint, abort, flash, redirect, render_template, request, url_for
 from flask_login import login_required
 
 from app.models.events import Event
@@ -9,8 +9,11 @@ sessions_bp = Blueprint("sessions", __name__)
 
 @sessions_bp.route("/sessions")
 def list_sessions():
-    sessions = Session.get_all()
-    return render_template("sessions/list.html", sessions=sessions)
+    try:
+        sessions, next_page = Session.get_all(after=request.args.get("after"))
+    except ValueError:
+        abort(400)
+    return render_template("sessions/list.html", sessions=sessions, next_page=next_page)
 
 
 @sessions_bp.route("/sessions/<int:session_id>")
@@ -1,6 +1,13 @@
 from datetime import datetime
 
 from flask import Blueprint, jsonify
+from flask_login import login_required
+
+from app.services.passwords import password_hasher
+from app.services.user_cache import user_cache
+from app.utils.database import pool_stats
+from app.utils.decorators import admin_required
+from app.utils.rate_limit import rate_limiter
 
 status_bp = Blueprint("status", __name__)
 
@@ -15,3 +22,36 @@ def health_check():
             "service": "project-1-online-commerce",
         }
     )
+
+
+@status_bp.route("/db-pool")
+@login_required
+@admin_required
+def db_pool():
+    """Connection pool usage for this worker process"""
+    stats = pool_stats()
+    return jsonify({"pool": stats if stats is not None else "not initialized"})
+
+
+@status_bp.route("/user-cache")
+@login_required
+@admin_required
+def user_cache_stats():
+    """Hit and miss counters of this worker's login user cache"""
+    return jsonify({"user_cache": user_cache.stats()})
+
+
+@status_bp.route("/password-hasher")
+@login_required
+@admin_required
+def password_hasher_stats():
+    """Work factor and completed/rejected jobs of this worker's password hasher"""
+    return jsonify({"password_hasher": password_hasher.stats()})
+
+
+@status_bp.route("/rate-limits")
+@login_required
+@admin_required
+def rate_limit_stats():
+    """Rate limiter decisions made by this worker, per route"""
+    return jsonify({"rate_limits": rate_limiter.stats()})
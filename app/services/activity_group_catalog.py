@@ -0,0 +1,168 @@
+import os
+import select
+import threading
+import time
+
+from app.models.activity_groups import ActivityGroup
+from app.services.activity_group_facets import ActivityGroupFacets
+from app.services.activity_group_index import ActivityGroupIndex
+from app.services.review_stats import NO_RATINGS, rating_summary
+from app.utils import database
+from app.utils.logger import setup_logger
+
+log = setup_logger(__name__)
+
+# NOTIFY channel written by the activity_group trigger (migration 0010)
+CHANNEL = "activity_group_catalog"
+
+
+class ActivityGroupCatalog:
+    """Every activity group and its rating summary, kept in memory by each worker.
+
+    Writes to activity_group and review_stats bump catalog_version and NOTIFY
+    ``CHANNEL``. A daemon thread LISTENs on its own connection and marks the
+    catalog stale, and the next read reloads it, so reads between writes never
+    touch the database.
+    While the listener is disconnected, reads compare the stored version at most
+    once every ``poll_interval`` seconds instead.
+    """
+
+    def __init__(self, poll_interval=None):
+        if poll_interval is None:
+            poll_interval = float(os.environ.get("ACTIVITY_GROUP_CATALOG_POLL_INTERVAL", 5))
+        self.poll_interval = poll_interval
+        self.version = None
+        self.reloads = 0
+        self._groups = None
+        self._ratings = None
+        self._index = None
+        self._facets = None
+        self._stale = True
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._listening = threading.Event()
+        self._stop = threading.Event()
+
+    @property
+    def listening(self):
+        return self._listening.is_set()
+
+    def groups(self):
+        """All activity groups, ordered by name."""
+        self._refresh()
+        return self._groups
+
+    def ratings(self, names):
+        """Rating summaries for the named groups, as ReviewRatings.get_many returns them."""
+        self._refresh()
+        ratings = self._ratings
+        return {name: ratings.get(name, NO_RATINGS) for name in names}
+
+    def search(self, query):
+        """Groups matching ``query``; see ActivityGroupIndex.search."""
+        self._refresh()
+        with self._lock:
+            if self._index is None:
+                self._index = ActivityGroupIndex(self._groups)
+            index = self._index
+        return index.search(query)
+
+    def filter(self, query, filters):
+        """Groups matching ``query`` (all when empty) and facet ``filters``, with the
+        facet counts; see ActivityGroupFacets.select."""
+        self._refresh()
+        matches = self.search(query) if query else None
+        with self._lock:
+            if self._facets is None:
+                self._facets = ActivityGroupFacets(self._groups)
+            facets = self._facets
+        positions, counts = facets.select(filters, within=matches)
+        return [facets.groups[i] for i in positions], counts
+
+    def invalidate(self):
+        """Reload on the next read; for writes made by this process."""
+        self._stale = True
+
+    def close(self):
+        """Stop the listener thread."""
+        self._stop.set()
+
+    def _refresh(self):
+        self._start_listener()
+        if not self._stale and self.listening:
+            return
+        with self._lock:
+            if self._groups is None or self._stale:
+                self._load()
+            elif not self.listening and time.monotonic() - self._checked_at >= self.poll_interval:
+                cursor = database.get_db().cursor()
+                cursor.execute("SELECT version FROM catalog_version WHERE name = 'activity_group'")
+                version = cursor.fetchone()["version"]
+                cursor.close()
+                if version != self.version:
+                    self._load()
+                self._checked_at = time.monotonic()
+
+    def _load(self):
+        # Cleared first: a change committed while loading marks the catalog stale again
+        self._stale = False
+        cursor = database.get_db().cursor()
+        cursor.execute("SELECT version FROM catalog_version WHERE name = 'activity_group'")
+        version = cursor.fetchone()["version"]
+        cursor.execute("SELECT * FROM activity_group ORDER BY name")
+        self._groups = [ActivityGroup.model_validate(row) for row in cursor.fetchall()]
+        cursor.execute("SELECT * FROM review_stats")
+        self._ratings = {row["activity_group_name"]: rating_summary(row) for row in cursor.fetchall()}
+        cursor.close()
+        self._index = None
+        self._facets = None
+        self.version = version
+        self.reloads += 1
+        self._checked_at = time.monotonic()
+
+    def _start_listener(self):
+        # One listener per process; threads do not survive a gunicorn fork
+        if self._pid == os.getpid() or self._stop.is_set():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._listening.clear()
+            threading.Thread(
+                target=self._listen, args=(self._pid,), name="activity-group-catalog", daemon=True
+            ).start()
+        # Give the listener a moment so the first load is not followed by a second one
+        self._listening.wait(1.0)
+
+    def _listen(self, pid):
+        while self._pid == pid and not self._stop.is_set():
+            conn = None
+            try:
+                conn = database.dedicated_connection()
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {CHANNEL}")
+                cursor.close()
+                # Changes committed before LISTEN took effect were never announced
+                if self._groups is not None:
+                    self._stale = True
+                self._listening.set()
+                while self._pid == pid and not self._stop.is_set():
+                    if select.select([conn], [], [], 5.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self._stale = True
+            except Exception as e:
+                log.warning(f"Activity group catalog listener disconnected: {e}")
+            finally:
+                self._listening.clear()
+                if conn is not None:
+                    conn.close()
+            self._stop.wait(max(self.poll_interval, 1.0))
+
+
+activity_group_catalog = ActivityGroupCatalog()
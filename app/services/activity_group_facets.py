@@ -0,0 +1,132 @@
+import numpy as np
+
+from app.models.activity_groups import EventFrequency
+
+# Query-string parameters, one per facet (the search box already uses "category")
+FACETS = ("interest", "fee", "frequency", "age", "public")
+
+# (key, label, lowest, highest) buckets; None means unbounded
+FEE_RANGES = [
+    ("free", "Free", 0, 0),
+    ("under-25", "Under $25", 1, 24),
+    ("25-50", "$25 to $50", 25, 50),
+    ("over-50", "Over $50", 51, None),
+]
+
+AGE_GROUPS = [
+    ("all-ages", "All ages", None, 12),
+    ("13-plus", "13+", 13, 17),
+    ("18-plus", "18+", 18, 20),
+    ("21-plus", "21+", 21, None),
+]
+
+
+def _in_range(values, lowest, highest):
+    mask = np.ones(len(values), dtype=bool)
+    if lowest is not None:
+        mask &= values >= lowest
+    if highest is not None:
+        mask &= values <= highest
+    return mask
+
+
+class ActivityGroupFacets:
+    """Precomputed facet bitmaps over a list of activity groups.
+
+    Each option of each facet (category, fee range, event frequency, minimum age
+    and open to public) is a bitmap over the groups' positions, packed 64 groups
+    to a word. A filter ORs the chosen options within a facet and ANDs facets
+    together; each facet's option counts apply every *other* facet's filter, so
+    they tell how many groups picking that option would leave. At 100k groups a
+    bitmap is 1,563 words and a whole selection stays well under a millisecond.
+    """
+
+    def __init__(self, groups):
+        self.groups = list(groups)
+        self.size = len(self.groups)
+        self._words = max(1, -(-self.size // 64))
+
+        fees = np.array([group.membership_fee for group in self.groups], dtype=np.int64)
+        ages = np.array([group.min_age for group in self.groups], dtype=np.int64)
+        categories = np.array([group.category for group in self.groups], dtype=object)
+        frequencies = np.array([group.event_frequency.value for group in self.groups], dtype=object)
+        public = np.array([group.open_to_public for group in self.groups], dtype=bool)
+
+        # name -> (title, [(key, label)], packed option bitmaps, one row per option)
+        self._facets = {}
+        self._add("interest", "Interest", [
+            (category, category, categories == category) for category in sorted(set(categories))
+        ])
+        self._add("fee", "Cost", [
+            (key, label, _in_range(fees, lowest, highest)) for key, label, lowest, highest in FEE_RANGES
+        ])
+        self._add("frequency", "Frequency", [
+            (frequency.value, frequency.value.capitalize(), frequencies == frequency.value)
+            for frequency in EventFrequency
+        ])
+        self._add("age", "Minimum age", [
+            (key, label, _in_range(ages, lowest, highest)) for key, label, lowest, highest in AGE_GROUPS
+        ])
+        self._add("public", "Open to public", [("yes", "Yes", public), ("no", "No", ~public)])
+        self._all = self._pack(np.ones(self.size, dtype=bool))
+        self._positions = {group.name: i for i, group in enumerate(self.groups)}
+
+    def _pack(self, mask):
+        padded = np.zeros(self._words * 64, dtype=bool)
+        padded[:self.size] = mask
+        return np.packbits(padded, bitorder="little").view(np.uint64)
+
+    def _add(self, name, title, options):
+        bitmaps = np.array([self._pack(mask) for _, _, mask in options], dtype=np.uint64)
+        self._facets[name] = (title, [(key, label) for key, label, _ in options],
+                              bitmaps.reshape(len(options), self._words))
+
+    def select(self, filters, within=None):
+        """Apply ``filters`` ({facet: [option keys]}) to ``within`` groups (default all).
+
+        Returns the positions of the matching groups, in the order of ``within``
+        (ascending by default), and the facets for rendering as ``[{"name",
+        "title", "options": [{"key", "label", "count", "selected"}]}]``.
+        """
+        order = None
+        base = self._all
+        if within is not None:
+            order = np.array(
+                [self._positions[group.name] for group in within if group.name in self._positions],
+                dtype=np.int64,
+            )
+            mask = np.zeros(self.size, dtype=bool)
+            mask[order] = True
+            base = self._pack(mask)
+        chosen = {}
+        masks = {}
+        for name, (_, options, bitmaps) in self._facets.items():
+            keys = set(filters.get(name) or ())
+            rows = [i for i, (key, _) in enumerate(options) if key in keys]
+            chosen[name] = keys
+            if rows:
+                masks[name] = np.bitwise_or.reduce(bitmaps[rows], axis=0)
+
+        facets = []
+        for name, (title, options, bitmaps) in self._facets.items():
+            others = base
+            for other, mask in masks.items():
+                if other != name:
+                    others = others & mask
+            counts = np.bitwise_count(bitmaps & others).sum(axis=1)
+            facets.append({
+                "name": name,
+                "title": title,
+                "options": [
+                    {"key": key, "label": label, "count": int(count), "selected": key in chosen[name]}
+                    for (key, label), count in zip(options, counts)
+                ],
+            })
+
+        matched = base
+        for mask in masks.values():
+            matched = matched & mask
+        bits = np.unpackbits(matched.view(np.uint8), bitorder="little")[:self.size].view(bool)
+        if order is None:
+            return np.flatnonzero(bits), facets
+        return order[bits[order]], facets
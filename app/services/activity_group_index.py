@@ -0,0 +1,84 @@
+import bisect
+import re
+from collections import defaultdict
+
+# Words of names, categories and queries; punctuation only separates words
+_WORD = re.compile(r"[^\W_]+")
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ActivityGroupIndex:
+    """Prefix and substring index over the names and categories of a list of groups.
+
+    Every query word must prefix a word of the name or category, or the whole
+    query must occur inside one of them (three characters or more). Prefixes are
+    found by bisecting a sorted word list and substrings by intersecting trigram
+    postings before confirming the candidates, so a search costs roughly the
+    number of matches, whatever the table size or the text of the query.
+    """
+
+    def __init__(self, groups):
+        # Positions follow name order, so ties in relevance sort by position
+        self.groups = sorted(groups, key=lambda group: group.name.lower())
+        self._names = [group.name.lower() for group in self.groups]
+        self._categories = [group.category.lower() for group in self.groups]
+        self._name_words = [_WORD.findall(name) for name in self._names]
+        postings = defaultdict(set)
+        trigrams = defaultdict(set)
+        for i in range(len(self.groups)):
+            for word in self._name_words[i] + _WORD.findall(self._categories[i]):
+                postings[word].add(i)
+            for gram in _trigrams(self._names[i]) | _trigrams(self._categories[i]):
+                trigrams[gram].add(i)
+        self._words = sorted(postings)
+        self._postings = dict(postings)
+        self._trigrams = dict(trigrams)
+
+    def _with_prefix(self, prefix):
+        found = set()
+        i = bisect.bisect_left(self._words, prefix)
+        while i < len(self._words) and self._words[i].startswith(prefix):
+            found |= self._postings[self._words[i]]
+            i += 1
+        return found
+
+    def _containing(self, phrase):
+        grams = sorted(_trigrams(phrase), key=lambda gram: len(self._trigrams.get(gram, ())))
+        if not grams or grams[0] not in self._trigrams:
+            return set()
+        found = set(self._trigrams[grams[0]])
+        for gram in grams[1:]:
+            found &= self._trigrams.get(gram, set())
+            if not found:
+                break
+        return {i for i in found if phrase in self._names[i] or phrase in self._categories[i]}
+
+    def _score(self, i, phrase, words, prefixed):
+        """Lower is better: the whole name, a name prefix, word prefixes in the
+        name, word prefixes anywhere, then substrings of the name or category."""
+        name = self._names[i]
+        if name == phrase:
+            return 0
+        if name.startswith(phrase):
+            return 1
+        if i in prefixed:
+            return 2 if all(any(w.startswith(word) for w in self._name_words[i]) for word in words) else 3
+        return 4 if phrase in name else 5
+
+    def search(self, query):
+        """Groups matching ``query``, most relevant first, then by name."""
+        phrase = " ".join((query or "").lower().split())
+        words = _WORD.findall(phrase)
+        prefixed = set()
+        if words:
+            prefixed = self._with_prefix(words[0])
+            for word in words[1:]:
+                if not prefixed:
+                    break
+                prefixed &= self._with_prefix(word)
+        matches = prefixed | self._containing(phrase) if len(phrase) >= 3 else prefixed
+        ranked = sorted(matches, key=lambda i: (self._score(i, phrase, words, prefixed), i))
+        return [self.groups[i] for i in ranked]
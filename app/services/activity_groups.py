@@ -1,28 +1,21 @@
-import re
-
 from app.models.activity_groups import ActivityGroup
-from app.utils.database import get_db
+from app.services.activity_group_catalog import activity_group_catalog
 
 
 class ActivityGroupsService:
-    def __init__(self):
-        self.cursor = get_db().cursor()
+    """Landing-page reads, served from this worker's in-memory catalog."""
 
     def get_all_activity_groups(self) -> list[ActivityGroup]:
-        self.cursor.execute("SELECT * FROM activity_group")
-        rows = self.cursor.fetchall()
-        activity_groups: list[ActivityGroup] = [
-            ActivityGroup.model_validate(row) for row in rows
-        ]
-        return activity_groups
+        return activity_group_catalog.groups()
+
+    def search_activity_groups(self, query: str) -> list[ActivityGroup]:
+        """Groups whose name or category matches ``query`` by word prefix or substring."""
+        return activity_group_catalog.search(query)
 
-    def search_activity_groups(self, pattern: str) -> list[ActivityGroup]:
-        self.cursor.execute("SELECT * FROM activity_group")
-        rows = self.cursor.fetchall()
+    def filter_activity_groups(self, query: str, filters: dict) -> tuple[list[ActivityGroup], list[dict]]:
+        """Groups matching ``query`` and the facet ``filters``, plus per-option counts."""
+        return activity_group_catalog.filter(query, filters)
 
-        prog = re.compile(pattern, re.IGNORECASE)
-        matches = []
-        for row in rows:
-            if prog.search(row["name"]) or prog.search(row["category"]):
-                matches.append(ActivityGroup.model_validate(row))
-        return matches
+    def get_ratings(self, names: list[str]) -> dict[str, dict]:
+        """Rating summaries for the named groups, from the same catalog snapshot."""
+        return activity_group_catalog.ratings(names)
@@ -0,0 +1,156 @@
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+from app.utils.logger import setup_logger
+
+log = setup_logger(__name__)
+
+# bcrypt only reads the first 72 bytes; bcrypt>=5 raises instead of truncating,
+# so truncate explicitly to keep verifying hashes made by older versions
+_MAX_PASSWORD_BYTES = 72
+
+
+def _encode(password):
+    return password.encode("utf-8")[:_MAX_PASSWORD_BYTES]
+
+
+def hash_password(password, rounds):
+    """bcrypt hash of ``password`` with work factor ``rounds``, as stored in resident.password_hash."""
+    return bcrypt.hashpw(_encode(password), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def verify_password(password, password_hash):
+    try:
+        return bcrypt.checkpw(_encode(password), password_hash.encode("utf-8"))
+    except ValueError:
+        # Not a bcrypt hash
+        return False
+
+
+def hash_rounds(password_hash):
+    """The work factor a hash was made with, from its ``$2b$<rounds>$`` prefix."""
+    try:
+        return int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasherBusy(Exception):
+    """Raised instead of queueing when the hasher already has ``max_pending`` jobs,
+    and when a job times out or its worker process dies."""
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification on a bounded pool of worker processes.
+
+    A hash is deliberately expensive, so running it on the request thread lets
+    a burst of logins take every web worker. Here at most ``max_pending`` jobs
+    per web worker wait for or run on ``workers`` processes; past that, calls
+    fail fast with PasswordHasherBusy. A job that outlives ``timeout`` keeps its
+    slot until its process finishes it. ``rounds`` is the work factor for new
+    hashes, and ``needs_rehash`` tells login to upgrade hashes made with
+    another one. With ``workers=0`` jobs run on the calling thread, still
+    bounded by ``max_pending``.
+    """
+
+    def __init__(self, workers=None, max_pending=None, rounds=None, timeout=None):
+        if workers is None:
+            workers = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+        if max_pending is None:
+            max_pending = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 4 * max(workers, 1)))
+        if rounds is None:
+            rounds = int(os.environ.get("BCRYPT_LOG_ROUNDS", 12))
+        if timeout is None:
+            timeout = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 10))
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.timeout = timeout
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.rounds)
+
+    def verify(self, password, password_hash):
+        return self._run(verify_password, password, password_hash)
+
+    def needs_rehash(self, password_hash):
+        return hash_rounds(password_hash) != self.rounds
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "rounds": self.rounds,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._pid = None
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+        release = True
+        try:
+            if self.workers <= 0:
+                result = fn(*args)
+            else:
+                future = None
+                try:
+                    future = self._get_executor().submit(fn, *args)
+                    result = future.result(timeout=self.timeout)
+                except concurrent.futures.TimeoutError:
+                    # A job that has started cannot be stopped; it holds its slot
+                    # until it ends, so max_pending still bounds the real work
+                    if not future.cancel():
+                        release = False
+                        future.add_done_callback(lambda _: self._slots.release())
+                    with self._lock:
+                        self.timed_out += 1
+                    raise PasswordHasherBusy("Password hashing timed out") from None
+                except BrokenProcessPool as e:
+                    # A worker died; start a fresh pool for the next call
+                    self.close()
+                    raise PasswordHasherBusy("Password hashing process died") from e
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            if release:
+                self._slots.release()
+
+    def _get_executor(self):
+        # One pool per process; a pool created before a gunicorn fork is unusable after it
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                    self._pid = os.getpid()
+                    log.info(f"Started {self.workers} password hashing processes")
+        return self._executor
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from app.utils.database import get_db
+
+# Serializes writes to the prerequisite table; also taken by the
+# prerequisite_log trigger (migration 0007)
+LOCK_KEY = 7301843
+
+
+class PrerequisiteGraph:
+    """In-memory copy of the prerequisite DAG, kept current from prerequisite_log.
+
+    The first use loads every edge; after that ``refresh`` only applies log rows
+    newer than the last one seen, at most once per ``refresh_interval`` seconds
+    unless forced. Transitive lookups are a breadth-first walk over the cached
+    adjacency maps, so they cost O(result) and no recursive SQL.
+    """
+
+    def __init__(self, refresh_interval=None):
+        if refresh_interval is None:
+            refresh_interval = float(os.environ.get("PREREQ_GRAPH_REFRESH_INTERVAL", 5))
+        self.refresh_interval = refresh_interval
+        # event_id -> {prerequisite_event_id: number of rows}, and the reverse
+        self._prerequisites = defaultdict(dict)
+        self._dependents = defaultdict(dict)
+        self._log_id = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Catch up with changes made by any process."""
+        now = time.monotonic()
+        if not force and self._log_id is not None and now - self._checked_at < self.refresh_interval:
+            return
+        cursor = get_db().cursor()
+        try:
+            with self._lock:
+                if self._log_id is None:
+                    self._load(cursor)
+                else:
+                    cursor.execute(
+                        """
+                        SELECT id, event_id, prerequisite_event_id, delta
+                        FROM prerequisite_log WHERE id > %s ORDER BY id
+                        """,
+                        (self._log_id,),
+                    )
+                    for row in cursor.fetchall():
+                        self._apply(row["event_id"], row["prerequisite_event_id"], row["delta"])
+                        self._log_id = row["id"]
+                self._checked_at = now
+        finally:
+            cursor.close()
+
+    def _load(self, cursor):
+        # A shared lock keeps writers out so the edges and the log position agree.
+        # It is session-level and released right after the two reads: the
+        # transaction-level lock would be held by the pooled connection until
+        # the rest of the request commits, stalling every prerequisite write.
+        cursor.execute("SELECT pg_advisory_lock_shared(%s)", (LOCK_KEY,))
+        try:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) AS log_id FROM prerequisite_log")
+            log_id = cursor.fetchone()["log_id"]
+            cursor.execute("SELECT event_id, prerequisite_event_id FROM prerequisite")
+            rows = cursor.fetchall()
+        except Exception:
+            # The unlock below cannot run in an aborted transaction
+            cursor.connection.rollback()
+            raise
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock_shared(%s)", (LOCK_KEY,))
+        self._prerequisites.clear()
+        self._dependents.clear()
+        for row in rows:
+            self._apply(row["event_id"], row["prerequisite_event_id"], 1)
+        self._log_id = log_id
+
+    def _apply(self, event_id, prerequisite_event_id, delta):
+        for edges, a, b in (
+            (self._prerequisites, event_id, prerequisite_event_id),
+            (self._dependents, prerequisite_event_id, event_id),
+        ):
+            count = edges[a].get(b, 0) + delta
+            if count > 0:
+                edges[a][b] = count
+            else:
+                edges[a].pop(b, None)
+                if not edges[a]:
+                    del edges[a]
+
+    @staticmethod
+    def _walk(edges, start):
+        seen = {start}
+        order = []
+        queue = deque([start])
+        while queue:
+            for neighbour in edges.get(queue.popleft(), ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    order.append(neighbour)
+                    queue.append(neighbour)
+        return order
+
+    def prerequisites_of(self, event_id):
+        """Every event that must be completed before ``event_id``, nearest first."""
+        self.refresh()
+        with self._lock:
+            return self._walk(self._prerequisites, event_id)
+
+    def dependents_of(self, event_id):
+        """Every event that directly or indirectly requires ``event_id``, nearest first."""
+        self.refresh()
+        with self._lock:
+            return self._walk(self._dependents, event_id)
+
+    def would_create_cycle(self, event_id, prerequisite_event_id):
+        """True if making ``prerequisite_event_id`` a prerequisite of ``event_id`` closes a loop."""
+        if event_id == prerequisite_event_id:
+            return True
+        with self._lock:
+            return event_id in self._walk(self._prerequisites, prerequisite_event_id)
+
+
+prerequisite_graph = PrerequisiteGraph()
@@ -0,0 +1,86 @@
+import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils.database import get_db
+
+# Prerequisites of an event with the user's qualification for each; the
+# qualification table is maintained by triggers (migration 0008).
+PREREQUISITE_STATUS_SQL = """
+    SELECT p.id, p.prerequisite_event_id,
+           e.activity_group_name AS event_name, e.date,
+           p.minimum_performance, p.qualification_period, p.is_waiver_allowed,
+           q.qualified_until
+    FROM prerequisite p
+    JOIN event e ON e.id = p.prerequisite_event_id
+    LEFT JOIN qualification q ON q.user_id = %(user_id)s AND q.prerequisite_id = p.id
+    WHERE p.event_id = %(event_id)s
+    ORDER BY p.id
+"""
+
+
+class QualificationCache:
+    """LRU of per-(user, event) prerequisite status in front of the qualification table.
+
+    Entries hold ``qualified_until`` dates rather than a yes/no answer, so
+    qualifications expire on time even while cached. Changes made in other
+    workers are picked up once an entry is older than ``ttl`` seconds.
+    """
+
+    def __init__(self, maxsize=None, ttl=None):
+        if maxsize is None:
+            maxsize = int(os.environ.get("QUALIFICATION_CACHE_SIZE", 10000))
+        if ttl is None:
+            ttl = float(os.environ.get("QUALIFICATION_CACHE_TTL", 30))
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (user_id, event_id) -> (rows, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id, event_id):
+        """Prerequisite rows of ``event_id`` with ``user_id``'s ``qualified_until`` (or None)."""
+        key = (user_id, event_id)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+
+        cursor = get_db().cursor()
+        cursor.execute(PREREQUISITE_STATUS_SQL, {"user_id": user_id, "event_id": event_id})
+        rows = [dict(row) for row in cursor.fetchall()]
+        cursor.close()
+
+        with self._lock:
+            self._entries[key] = (rows, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return rows
+
+    def unmet(self, user_id, event_id, today=None):
+        """The prerequisites ``user_id`` is not currently qualified for."""
+        today = today or datetime.date.today()
+        return [
+            row for row in self.get(user_id, event_id)
+            if row["qualified_until"] is None or row["qualified_until"] < today
+        ]
+
+    def invalidate(self, user_id=None):
+        """Drop one user's entries, or everything."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == user_id]:
+                    del self._entries[key]
+
+
+qualification_cache = QualificationCache()
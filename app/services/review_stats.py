@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+
+from app.utils.database import get_db
+
+# Count a review of %(rating)s stars into its group's aggregates (migration 0012)
+REVIEW_STATS_ADD_SQL = """
+    INSERT INTO review_stats AS s (activity_group_name, review_count, rating_sum,
+                                   stars_1, stars_2, stars_3, stars_4, stars_5)
+    VALUES (%(group)s, 1, %(rating)s,
+            (%(rating)s = 1)::int, (%(rating)s = 2)::int, (%(rating)s = 3)::int,
+            (%(rating)s = 4)::int, (%(rating)s = 5)::int)
+    ON CONFLICT (activity_group_name) DO UPDATE SET
+        review_count = s.review_count + 1,
+        rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+        stars_1 = s.stars_1 + EXCLUDED.stars_1,
+        stars_2 = s.stars_2 + EXCLUDED.stars_2,
+        stars_3 = s.stars_3 + EXCLUDED.stars_3,
+        stars_4 = s.stars_4 + EXCLUDED.stars_4,
+        stars_5 = s.stars_5 + EXCLUDED.stars_5
+"""
+
+# ...and back out; a plain UPDATE, as the CHECKs reject a negative row proposed to an upsert
+REVIEW_STATS_REMOVE_SQL = """
+    UPDATE review_stats SET
+        review_count = review_count - 1,
+        rating_sum = rating_sum - %(rating)s,
+        stars_1 = stars_1 - (%(rating)s = 1)::int,
+        stars_2 = stars_2 - (%(rating)s = 2)::int,
+        stars_3 = stars_3 - (%(rating)s = 3)::int,
+        stars_4 = stars_4 - (%(rating)s = 4)::int,
+        stars_5 = stars_5 - (%(rating)s = 5)::int
+    WHERE activity_group_name = %(group)s
+"""
+
+NO_RATINGS = {"count": 0, "average": 0, "histogram": [0, 0, 0, 0, 0]}
+
+
+def apply_review_delta(cursor, activity_group_name, rating, delta):
+    """Count one review of ``rating`` stars in (delta=1) or out of (delta=-1) its group's stats."""
+    cursor.execute(
+        REVIEW_STATS_ADD_SQL if delta > 0 else REVIEW_STATS_REMOVE_SQL,
+        {"group": activity_group_name, "rating": rating},
+    )
+
+
+class ReviewRatings:
+    """Per-group rating summaries read from review_stats, with a short in-process cache.
+
+    A summary is ``{"count", "average", "histogram": [1-star, ..., 5-star]}``.
+    Reviews written by this process invalidate their group immediately; those
+    written by other workers show up once an entry is older than ``cache_ttl``.
+    """
+
+    def __init__(self, cache_ttl=None):
+        if cache_ttl is None:
+            cache_ttl = float(os.environ.get("REVIEW_STATS_CACHE_TTL", 30))
+        self.cache_ttl = cache_ttl
+        self._cache = {}  # activity_group_name -> (summary, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, activity_group_name):
+        return self.get_many([activity_group_name])[activity_group_name]
+
+    def get_many(self, activity_group_names):
+        """Summaries for several groups, querying only for cache misses."""
+        now = time.monotonic()
+        result = {}
+        missing = []
+        with self._lock:
+            for name in activity_group_names:
+                cached = self._cache.get(name)
+                if cached is not None and cached[1] > now:
+                    result[name] = cached[0]
+                else:
+                    missing.append(name)
+
+        if missing:
+            cursor = get_db().cursor()
+            cursor.execute(
+                "SELECT * FROM review_stats WHERE activity_group_name = ANY(%s)",
+                (missing,)
+            )
+            found = {row["activity_group_name"]: rating_summary(row) for row in cursor.fetchall()}
+            cursor.close()
+
+            expires_at = now + self.cache_ttl
+            with self._lock:
+                for name in missing:
+                    summary = found.get(name, NO_RATINGS)
+                    self._cache[name] = (summary, expires_at)
+                    result[name] = summary
+        return result
+
+    def invalidate(self, activity_group_name=None):
+        with self._lock:
+            if activity_group_name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(activity_group_name, None)
+
+
+def rating_summary(row):
+    """The summary of one review_stats row."""
+    count = row["review_count"]
+    return {
+        "count": count,
+        "average": row["rating_sum"] / count if count else 0,
+        "histogram": [row[f"stars_{stars}"] for stars in range(1, 6)],
+    }
+
+
+review_ratings = ReviewRatings()
@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils.database import get_db
+
+# The principal Flask-Login needs for a session: who the user is and their role
+PRINCIPAL_SQL = """
+    SELECT resident_id, username, role
+    FROM resident
+    WHERE resident_id = %s AND NOT is_deleted
+"""
+
+
+class UserCache:
+    """LRU of login principals (resident_id, username, role) in front of resident.
+
+    The user loader runs on every authenticated request, so a hit spares the
+    request its connection checkout as well as the query. Unknown and deleted
+    users are cached too, as None. User writes in this process invalidate the
+    user's entry; changes made in other workers are picked up once an entry is
+    older than ``ttl`` seconds. Until then those workers keep the old principal:
+    a user demoted or deleted elsewhere keeps their previous role, admin
+    included, for up to ``ttl`` seconds.
+    """
+
+    def __init__(self, maxsize=None, ttl=None):
+        if maxsize is None:
+            maxsize = int(os.environ.get("USER_CACHE_SIZE", 10000))
+        if ttl is None:
+            ttl = float(os.environ.get("USER_CACHE_TTL", 30))
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # resident_id -> (principal or None, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, resident_id):
+        """``{"resident_id", "username", "role"}`` for an active user, else None."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(resident_id)
+            if cached is not None and cached[1] > now:
+                self._entries.move_to_end(resident_id)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+
+        cursor = get_db().cursor()
+        cursor.execute(PRINCIPAL_SQL, (resident_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        principal = dict(row) if row is not None else None
+
+        with self._lock:
+            self._entries[resident_id] = (principal, now + self.ttl)
+            self._entries.move_to_end(resident_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, resident_id=None):
+        """Drop one user's entry, or everything."""
+        with self._lock:
+            if resident_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(resident_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+user_cache = UserCache()
@@ -1,77 +1,158 @@
 import os
+import re
+import threading
+import weakref
+
 import psycopg2
-import click
-from flask import current_app, g
-from flask.cli import with_appcontext
+from flask import g
 from psycopg2.extras import RealDictCursor
 
 from app.utils.logger import setup_logger
+from app.utils.pool import ConnectionPool
 
 log = setup_logger(__name__)
 
+_pool = None
+_pool_lock = threading.Lock()
+
+# Policies applied to every connection handed out by get_db, so that pooling,
+# tracing and timeouts behave the same for every blueprint and model.
+_connect_hooks = []
+_checkout_hooks = []
+
+# Names of the server-side prepared statements each connection already holds
+_prepared = weakref.WeakKeyDictionary()
+
+
+def _env_number(name, default, cast=int):
+    value = os.environ.get(name)
+    return cast(value) if value not in (None, "") else default
+
+
+def on_connect(hook):
+    """Register ``hook(conn)`` to run once on every new physical connection."""
+    _connect_hooks.append(hook)
+    return hook
+
+
+def on_checkout(hook):
+    """Register ``hook(conn)`` to run every time get_db checks a connection out."""
+    _checkout_hooks.append(hook)
+    return hook
+
+
+@on_connect
+def _apply_statement_timeout(conn):
+    timeout_ms = _env_number("DB_STATEMENT_TIMEOUT_MS", 0)
+    if timeout_ms:
+        cur = conn.cursor()
+        cur.execute("SET statement_timeout = %s", (timeout_ms,))
+        cur.close()
+
+
+def _connect():
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable is not set!")
+    conn = psycopg2.connect(database_url, cursor_factory=RealDictCursor)
+    for hook in _connect_hooks:
+        hook(conn)
+    # Session settings made by hooks must survive the pool's rollback on return
+    conn.commit()
+    return conn
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use.
+
+    The pool is rebuilt after a fork so gunicorn workers never share sockets
+    opened by the master process.
+    """
+    global _pool
+    if _pool is None or _pool.pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool.pid != os.getpid():
+                _pool = ConnectionPool(
+                    _connect,
+                    min_size=_env_number("DB_POOL_MIN_SIZE", 1),
+                    max_size=_env_number("DB_POOL_MAX_SIZE", 10),
+                    timeout=_env_number("DB_POOL_TIMEOUT", 10.0, float),
+                    max_uses=_env_number("DB_POOL_MAX_USES", 0),
+                    max_lifetime=_env_number("DB_POOL_MAX_LIFETIME", 1800.0, float),
+                    health_check=os.environ.get("DB_POOL_HEALTH_CHECK", "true").lower()
+                    not in ("0", "false", "no"),
+                )
+    return _pool
+
+
+def pool_stats():
+    """Usage statistics for the connection pool, or None if it was never used."""
+    if _pool is None or _pool.pid != os.getpid():
+        return None
+    return _pool.stats()
+
 
 def get_db():
+    """Return this request's database connection.
+
+    This is the only supported way to reach the database; modules must not
+    call psycopg2.connect themselves.
+    """
     if "db" not in g:
-        database_url = os.environ.get("DATABASE_URL")
-        if not database_url:
-            raise ValueError("DATABASE_URL environment variable is not set!")
-        g.db = psycopg2.connect(database_url, cursor_factory=RealDictCursor)
+        conn = get_pool().getconn()
+        try:
+            for hook in _checkout_hooks:
+                hook(conn)
+        except Exception:
+            get_pool().putconn(conn)
+            raise
+        g.db = conn
     return g.db
 
 
+def dedicated_connection():
+    """Open a connection outside the pool for a long-lived session such as LISTEN.
+
+    The caller owns the connection and must close it; request code uses get_db.
+    """
+    return _connect()
+
+
+class PreparedStatement:
+    """A query PREPAREd once per connection and then run with EXECUTE.
+
+    For hot queries whose planning costs more than their execution. ``sql``
+    uses ``%(name)s`` placeholders, which become ``$1``, ``$2``... in the order
+    of ``params``. Prepared statements outlive transactions and rollbacks.
+    PostgreSQL replans them after schema changes but refuses to change their
+    result columns, so ``sql`` must list its columns rather than use ``*`` over
+    tables that migrations alter.
+    """
+
+    def __init__(self, name, sql, *params):
+        self.name = name
+        self.params = params
+        positional = re.sub(r"%\((\w+)\)s", lambda m: f"${params.index(m.group(1)) + 1}", sql)
+        # PREPARE runs without parameters, so psycopg2 will not undo %% escapes
+        positional = positional.replace("%%", "%")
+        self._prepare = f"PREPARE {name} AS {positional}"
+        self._execute = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})" if params else f"EXECUTE {name}"
+
+    def execute(self, cursor, values):
+        """Run the statement on ``cursor`` with ``values`` ({param: value})."""
+        names = _prepared.setdefault(cursor.connection, set())
+        if self.name not in names:
+            cursor.execute(self._prepare)
+            names.add(self.name)
+        cursor.execute(self._execute, [values[param] for param in self.params] or None)
+
+
 def close_db(e=None):
     db = g.pop("db", None)
-    if db is not None:
+    if db is None:
+        return
+    if _pool is not None and _pool.pid == os.getpid():
+        _pool.putconn(db)
+    else:
         db.close()
 
-
-def check_db_health():
-    """Check if the database is accessible and has the correct schema."""
-    try:
-        db = get_db()
-        cur = db.cursor()
-
-        # Check if essential tables exist
-        cur.execute("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema='public'
-        """)
-        tables = [row["table_name"] for row in cur.fetchall()]
-        required_tables = {"resident", "activity_group", "event", "review"}
-        existing_tables = set(tables)
-
-        missing_tables = required_tables - existing_tables
-        if missing_tables:
-            log.error(f"Missing required tables: {missing_tables}")
-            return False
-
-        # Check if test user exists
-        cur.execute("SELECT resident_id FROM resident WHERE username = 'testuser'")
-        test_user = cur.fetchone()
-        if not test_user:
-            log.warning("Test user not found in database")
-            return False
-
-        return True
-    except Exception as e:
-        log.error(f"Database health check failed: {str(e)}")
-        return False
-
-
-def init_db(app):
-    with app.app_context():
-        db = get_db()
-        cur = db.cursor()
-        with current_app.open_resource('utils/schema.sql') as f:
-            schema_sql = f.read().decode('utf8')
-            cur.execute(schema_sql)
-        db.commit()
-
-
-@click.command('init-db')
-@with_appcontext
-def init_db_command():
-    """Clear the existing data and create new tables."""
-    init_db(current_app)
-    click.echo('Initialized the database.')
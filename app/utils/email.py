@@ -1,17 +1,50 @@
 import smtplib
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
+import click
 from flask import current_app
+from flask.cli import AppGroup
+from psycopg2.extras import execute_values
 
+from app.models.events import waitlist_promoted
+from app.utils.database import get_db
+from app.utils.logger import setup_logger
+
+log = setup_logger(__name__)
+
+
+def enqueue_emails(messages, commit=True):
+    """Queue ``(recipient, subject, body)`` tuples in the outbox with one round trip.
+
+    With ``commit=False`` the rows join the caller's open transaction, so the
+    mail only goes out if the change it announces is committed too.
+    """
+    messages = list(messages)
+    if not messages:
+        return 0
+    db = get_db()
+    cursor = db.cursor()
+    execute_values(
+        cursor,
+        "INSERT INTO notification_outbox (recipient, subject, body) VALUES %s",
+        messages,
+        page_size=1000,
+    )
+    if commit:
+        db.commit()
+    cursor.close()
+    return len(messages)
 
-def send_waitlist_notification(recipient_email, event_name, event_date):
-    """Send notification email to waitlisted user."""
-    msg = MIMEMultipart()
-    msg["From"] = current_app.config["MAIL_DEFAULT_SENDER"]
-    msg["To"] = recipient_email
-    msg["Subject"] = f"Spot Available: {event_name}"
 
+def enqueue_email(recipient, subject, body, commit=True):
+    """Queue a single email in the outbox."""
+    return enqueue_emails([(recipient, subject, body)], commit=commit)
+
+
+def waitlist_notification(event_name, event_date):
+    subject = f"Spot Available: {event_name}"
     body = f"""
     Hello,
 
@@ -21,16 +54,236 @@ def send_waitlist_notification(recipient_email, event_name, event_date):
     Best regards,
     The Events Team
     """
+    return subject, body
+
+
+def send_waitlist_notification(recipient_email, event_name, event_date):
+    """Queue a notification email to a waitlisted user."""
+    subject, body = waitlist_notification(event_name, event_date)
+    enqueue_email(recipient_email, subject, body)
+    return True
+
+
+@waitlist_promoted.connect
+def _notify_promoted_users(event_id, user_ids):
+    """Tell users who were moved off the waitlist that they now have a seat."""
+    cursor = get_db().cursor()
+    cursor.execute(
+        """
+        SELECT u.email, COALESCE(e.name, e.activity_group_name) AS event_name, e.date
+        FROM resident u
+        JOIN event e ON e.id = %s
+        WHERE u.resident_id = ANY(%s) AND u.email IS NOT NULL
+        """,
+        (event_id, list(user_ids)),
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+
+    messages = []
+    for row in rows:
+        subject = f"You're registered: {row['event_name']}"
+        body = f"""
+    Hello,
+
+    A spot opened up for "{row['event_name']}" on {row['date']} and you have been
+    moved from the waitlist to the list of registered participants.
+
+    Best regards,
+    The Events Team
+    """
+        messages.append((row['email'], subject, body))
+    enqueue_emails(messages, commit=False)
+
 
-    msg.attach(MIMEText(body, "plain"))
+class OutboxWorker:
+    """Delivers queued emails in batches over one long-lived SMTP connection.
 
+    Several workers can run at once: rows are claimed with SKIP LOCKED, and rows
+    left in 'sending' by a crashed worker are reclaimed after ``claim_timeout``.
+    Failed deliveries are retried with exponential backoff until ``max_attempts``.
+    """
+
+    def __init__(self, config, batch_size=50, max_attempts=5, backoff=30, claim_timeout=600):
+        self.config = config
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.claim_timeout = claim_timeout
+        self._smtp = None
+
+    def _connection(self):
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.config["MAIL_SERVER"], self.config["MAIL_PORT"], timeout=30)
+            if self.config.get("MAIL_USE_TLS"):
+                smtp.starttls()
+            if self.config.get("MAIL_USERNAME"):
+                smtp.login(self.config["MAIL_USERNAME"], self.config["MAIL_PASSWORD"])
+            self._smtp = smtp
+        return self._smtp
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+
+    def _build_message(self, row):
+        msg = MIMEMultipart()
+        msg["From"] = self.config["MAIL_DEFAULT_SENDER"]
+        msg["To"] = row["recipient"]
+        msg["Subject"] = row["subject"]
+        msg.attach(MIMEText(row["body"], "plain"))
+        return msg
+
+    def _send(self, msg):
+        try:
+            self._connection().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped an idle connection; reconnect once and retry
+            self._smtp = None
+            self._connection().send_message(msg)
+
+    def _claim(self, cursor):
+        # A stale claim counts as an attempt, so one that already used the
+        # last attempt is given up rather than handed out again
+        cursor.execute(
+            """
+            UPDATE notification_outbox
+            SET status = 'failed', last_error = 'Claim expired on the final attempt'
+            WHERE status = 'sending'
+              AND claimed_at < NOW() - %s * INTERVAL '1 second'
+              AND attempts >= %s
+            """,
+            (self.claim_timeout, self.max_attempts),
+        )
+        cursor.execute(
+            """
+            UPDATE notification_outbox
+            SET status = 'sending', attempts = attempts + 1, claimed_at = NOW()
+            WHERE id IN (
+                SELECT id FROM notification_outbox
+                WHERE (status = 'pending' AND next_attempt_at <= NOW())
+                   OR (status = 'sending' AND claimed_at < NOW() - %s * INTERVAL '1 second'
+                       AND attempts < %s)
+                ORDER BY next_attempt_at, id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, recipient, subject, body, attempts
+            """,
+            (self.claim_timeout, self.max_attempts, self.batch_size),
+        )
+        return cursor.fetchall()
+
+    def run_once(self):
+        """Claim and deliver one batch; returns ``(sent, failed)`` counts."""
+        db = get_db()
+        cursor = db.cursor()
+        rows = self._claim(cursor)
+        db.commit()
+        if not rows:
+            cursor.close()
+            return 0, 0
+
+        sent, failed = [], []
+        for row in rows:
+            try:
+                self._send(self._build_message(row))
+                sent.append(row["id"])
+            except Exception as e:
+                # Any error is recorded against this message alone, so one bad
+                # row cannot strand the rest of the batch in 'sending'
+                log.warning(f"Delivery of outbox message {row['id']} failed: {e}")
+                failed.append((row["id"], str(e) or type(e).__name__))
+                # A rejected recipient leaves the session usable; anything else
+                # gets a fresh connection for the next message
+                if not isinstance(e, (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError)):
+                    self.close()
+
+        if sent:
+            cursor.execute(
+                """
+                UPDATE notification_outbox
+                SET status = 'sent', sent_at = NOW(), last_error = NULL
+                WHERE id = ANY(%s)
+                """,
+                (sent,),
+            )
+        if failed:
+            cursor.execute(
+                """
+                UPDATE notification_outbox o
+                SET status = CASE WHEN o.attempts >= %s THEN 'failed' ELSE 'pending' END,
+                    last_error = f.error,
+                    next_attempt_at = NOW() + LEAST(%s * POWER(2, o.attempts - 1), 3600)
+                                      * INTERVAL '1 second'
+                FROM UNNEST(%s::bigint[], %s::text[]) AS f(id, error)
+                WHERE o.id = f.id
+                """,
+                (
+                    self.max_attempts,
+                    self.backoff,
+                    [message_id for message_id, _ in failed],
+                    [error for _, error in failed],
+                ),
+            )
+        db.commit()
+        cursor.close()
+        return len(sent), len(failed)
+
+    def run_forever(self, app, poll_interval=5.0):
+        """Drain the outbox until interrupted, sleeping when it is empty."""
+        try:
+            while True:
+                with app.app_context():
+                    sent, failed = self.run_once()
+                if sent or failed:
+                    log.info(f"Outbox: sent {sent}, failed {failed}")
+                else:
+                    time.sleep(poll_interval)
+        finally:
+            self.close()
+
+
+outbox_cli = AppGroup("outbox", help="Outgoing email queue.")
+
+
+@outbox_cli.command("worker")
+@click.option("--batch-size", default=50, show_default=True)
+@click.option("--poll-interval", default=5.0, show_default=True)
+def worker_command(batch_size, poll_interval):
+    """Deliver queued emails until interrupted."""
+    app = current_app._get_current_object()
+    OutboxWorker(app.config, batch_size=batch_size).run_forever(app, poll_interval)
+
+
+@outbox_cli.command("drain")
+@click.option("--batch-size", default=50, show_default=True)
+def drain_command(batch_size):
+    """Deliver everything that is currently due, then exit."""
+    worker = OutboxWorker(current_app.config, batch_size=batch_size)
+    total_sent = total_failed = 0
     try:
-        server = smtplib.SMTP(current_app.config["MAIL_SERVER"], current_app.config["MAIL_PORT"])
-        server.starttls()
-        server.login(current_app.config["MAIL_USERNAME"], current_app.config["MAIL_PASSWORD"])
-        server.send_message(msg)
-        server.quit()
-        return True
-    except Exception as e:
-        print(f"Failed to send email: {str(e)}")
-        return False
+        while True:
+            sent, failed = worker.run_once()
+            total_sent += sent
+            total_failed += failed
+            if not sent and not failed:
+                break
+    finally:
+        worker.close()
+    click.echo(f"Sent {total_sent} emails ({total_failed} failed).")
+
+
+@outbox_cli.command("reminders")
+@click.option("--day", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Event date to remind about (default: tomorrow).")
+def reminders_command(day):
+    """Queue day-before reminder digests for registered residents."""
+    from app.utils.reminders import send_event_reminders
+
+    events, emails = send_event_reminders(day.date() if day else None)
+    click.echo(f"Queued {emails} reminder emails for {events} events.")
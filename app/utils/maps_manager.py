@@ -1,51 +1,116 @@
 import json
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 
+import click
+from flask.cli import AppGroup
+
+from app.utils.database import get_db
+
+LEGACY_DATA_FILE = Path(__file__).parent.parent / 'data' / 'maps_data.json'
+
+
 class MapsManager:
-    def __init__(self):
-        self.data_file = Path(__file__).parent.parent / 'data' / 'maps_data.json'
-        self._ensure_data_file_exists()
-
-    def _ensure_data_file_exists(self):
-        """Ensure the data file and directory exist."""
-        self.data_file.parent.mkdir(parents=True, exist_ok=True)
-        if not self.data_file.exists():
-            with open(self.data_file, 'w') as f:
-                json.dump({"event_maps": {}}, f)
-
-    def get_maps_data(self):
-        """Read the maps data from the JSON file."""
-        try:
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {"event_maps": {}}
-
-    def save_maps_data(self, data):
-        """Save the maps data to the JSON file."""
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=4)
+    """Google Maps embed URLs per event, stored in the event_map table.
+
+    Reads go through an in-process LRU of at most ``maxsize`` events. Writes
+    made by this process invalidate their entries immediately; entries written
+    by other workers are picked up once they are older than ``cache_ttl`` seconds.
+    """
+
+    def __init__(self, cache_ttl=None, maxsize=None):
+        if cache_ttl is None:
+            cache_ttl = float(os.environ.get("MAPS_CACHE_TTL", 60))
+        if maxsize is None:
+            maxsize = int(os.environ.get("MAPS_CACHE_SIZE", 10000))
+        self.cache_ttl = cache_ttl
+        self.maxsize = maxsize
+        self._cache = OrderedDict()  # event_id -> (embed_url or None, expires_at)
+        # Bumped by invalidate(), so a read that raced a write does not cache the old value.
+        self._generation = 0
+        self._lock = threading.Lock()
 
     def get_event_map(self, event_id):
         """Get the maps embed URL for a specific event."""
-        data = self.get_maps_data()
-        return data["event_maps"].get(str(event_id))
+        return self.get_event_maps([event_id])[event_id]
+
+    def get_event_maps(self, event_ids):
+        """Get the maps embed URLs for several events, querying only for cache misses."""
+        now = time.monotonic()
+        result = {}
+        missing = []
+        with self._lock:
+            for event_id in event_ids:
+                cached = self._cache.get(event_id)
+                if cached is not None and cached[1] > now:
+                    self._cache.move_to_end(event_id)
+                    result[event_id] = cached[0]
+                else:
+                    missing.append(event_id)
+            generation = self._generation
+
+        if missing:
+            db = get_db()
+            cursor = db.cursor()
+            cursor.execute(
+                "SELECT event_id, embed_url FROM event_map WHERE event_id = ANY(%s)",
+                (missing,)
+            )
+            found = {row['event_id']: row['embed_url'] for row in cursor.fetchall()}
+            cursor.close()
+
+            expires_at = now + self.cache_ttl
+            with self._lock:
+                store = generation == self._generation
+                for event_id in missing:
+                    url = found.get(event_id)
+                    result[event_id] = url
+                    if store:
+                        self._cache[event_id] = (url, expires_at)
+                        self._cache.move_to_end(event_id)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        return result
 
     def set_event_map(self, event_id, maps_embed_url):
         """Set the maps embed URL for a specific event, validating the input."""
         url = self.extract_url(maps_embed_url)
-        data = self.get_maps_data()
-        data["event_maps"][str(event_id)] = url
-        self.save_maps_data(data)
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(
+            """
+            INSERT INTO event_map (event_id, embed_url)
+            VALUES (%s, %s)
+            ON CONFLICT (event_id)
+            DO UPDATE SET embed_url = EXCLUDED.embed_url, updated_at = CURRENT_TIMESTAMP
+            """,
+            (event_id, url)
+        )
+        db.commit()
+        cursor.close()
+        self.invalidate(event_id)
 
     def remove_event_map(self, event_id):
         """Remove the maps embed URL for a specific event."""
-        data = self.get_maps_data()
-        if str(event_id) in data["event_maps"]:
-            del data["event_maps"][str(event_id)]
-            self.save_maps_data(data)
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute("DELETE FROM event_map WHERE event_id = %s", (event_id,))
+        db.commit()
+        cursor.close()
+        self.invalidate(event_id)
+
+    def invalidate(self, event_id=None):
+        """Drop one event (or everything) from the read cache."""
+        with self._lock:
+            self._generation += 1
+            if event_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(event_id, None)
 
     @staticmethod
     def extract_url(embed_code):
@@ -59,4 +124,49 @@ class MapsManager:
         match = re.search(r'src=["\"](.*?)["\"]', embed_code)
         if match:
             return match.group(1)
-        return embed_code.strip() 
\ No newline at end of file
+        return embed_code.strip()
+
+
+def import_legacy_maps(path=LEGACY_DATA_FILE):
+    """Copy embeds from the old maps_data.json into event_map.
+
+    Returns ``(imported, skipped)``. Entries for events that no longer exist or
+    that already have a row are skipped, so the import is safe to re-run.
+    """
+    try:
+        with open(path, 'r') as f:
+            event_maps = json.load(f).get("event_maps", {})
+    except (json.JSONDecodeError, FileNotFoundError):
+        return 0, 0
+
+    rows = [(int(event_id), MapsManager.extract_url(url)) for event_id, url in event_maps.items()]
+    if not rows:
+        return 0, 0
+
+    db = get_db()
+    cursor = db.cursor()
+    cursor.execute(
+        """
+        INSERT INTO event_map (event_id, embed_url)
+        SELECT data.event_id, data.embed_url
+        FROM UNNEST(%s::int[], %s::text[]) AS data(event_id, embed_url)
+        JOIN event e ON e.id = data.event_id
+        ON CONFLICT (event_id) DO NOTHING
+        """,
+        ([event_id for event_id, _ in rows], [url for _, url in rows])
+    )
+    imported = cursor.rowcount
+    db.commit()
+    cursor.close()
+    return imported, len(rows) - imported
+
+
+maps_cli = AppGroup("maps", help="Event map embeds.")
+
+
+@maps_cli.command("import-json")
+@click.option("--path", type=click.Path(dir_okay=False), default=str(LEGACY_DATA_FILE))
+def import_json_command(path):
+    """One-time import of app/data/maps_data.json into the event_map table."""
+    imported, skipped = import_legacy_maps(path)
+    click.echo(f"Imported {imported} map embeds ({skipped} skipped).")
@@ -0,0 +1,146 @@
+import re
+from collections import namedtuple
+from pathlib import Path
+
+import click
+import psycopg2
+from flask.cli import AppGroup
+
+from app.utils.database import get_db
+from app.utils.logger import setup_logger
+
+log = setup_logger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+_FILENAME = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+# Arbitrary key for pg_advisory_lock so only one process migrates at a time
+_LOCK_KEY = 7301842
+
+Migration = namedtuple("Migration", ["version", "name", "path"])
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Return the numbered .sql migrations in ``directory``, oldest first."""
+    migrations = []
+    for path in Path(directory).iterdir():
+        match = _FILENAME.match(path.name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    migrations.sort()
+
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration version in {directory}")
+    return migrations
+
+
+def current_version(db):
+    """Highest applied migration, or 0 for a database that was never migrated."""
+    cursor = db.cursor()
+    try:
+        cursor.execute("SELECT COALESCE(MAX(version), 0) AS version FROM schema_version")
+        return cursor.fetchone()["version"]
+    except psycopg2.errors.UndefinedTable:
+        db.rollback()
+        return 0
+    finally:
+        cursor.close()
+
+
+def upgrade(db, target=None, directory=MIGRATIONS_DIR):
+    """Apply every pending migration up to ``target``; each one in its own transaction."""
+    cursor = db.cursor()
+    cursor.execute("SELECT pg_advisory_lock(%s)", (_LOCK_KEY,))
+    try:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        db.commit()
+
+        version = current_version(db)
+        applied = []
+        for migration in discover_migrations(directory):
+            if migration.version <= version:
+                continue
+            if target is not None and migration.version > target:
+                break
+            log.info(f"Applying migration {migration.version:04d}_{migration.name}")
+            try:
+                cursor.execute(migration.path.read_text())
+                cursor.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+                    (migration.version, migration.name),
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            applied.append(migration)
+        return applied
+    finally:
+        db.rollback()
+        cursor.execute("SELECT pg_advisory_unlock(%s)", (_LOCK_KEY,))
+        db.commit()
+        cursor.close()
+
+
+def ensure_admin(db):
+    """Create the default admin account if there is no admin yet."""
+    from app.services.passwords import hash_password, password_hasher
+
+    cursor = db.cursor()
+    cursor.execute("SELECT 1 FROM resident WHERE role = 'admin' LIMIT 1")
+    if cursor.fetchone() is None:
+        cursor.execute(
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            VALUES (%s, %s, %s, %s)
+            """,
+            ('admin', 'admin@example.com', hash_password('admin', password_hasher.rounds), 'admin')
+        )
+        db.commit()
+        log.info("Created default admin account")
+    cursor.close()
+
+
+def check_schema_version(app):
+    """Cheap startup check: warn if the database is behind the migrations on disk."""
+    with app.app_context():
+        version = current_version(get_db())
+    migrations = discover_migrations()
+    latest = migrations[-1].version if migrations else 0
+    app.config["SCHEMA_VERSION"] = version
+    if version < latest:
+        log.warning(
+            f"Database schema is at version {version} but {latest} is available; "
+            "run `flask db upgrade`"
+        )
+    return version
+
+
+db_cli = AppGroup("db", help="Database schema migrations.")
+
+
+@db_cli.command("upgrade")
+@click.option("--target", type=int, default=None, help="Stop after this migration version.")
+def upgrade_command(target):
+    """Apply pending migrations and make sure an admin account exists."""
+    db = get_db()
+    applied = upgrade(db, target=target)
+    ensure_admin(db)
+    for migration in applied:
+        click.echo(f"Applied {migration.version:04d}_{migration.name}")
+    click.echo(f"Database is at version {current_version(db)}.")
+
+
+@db_cli.command("current")
+def current_command():
+    """Show the applied schema version."""
+    click.echo(current_version(get_db()))
@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+from collections import deque
+
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+from app.utils.logger import setup_logger
+
+log = setup_logger(__name__)
+
+
+class PoolTimeout(PoolError):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of database connections shared by a worker process.
+
+    Connections are created with ``connect`` (a zero-argument callable) and are
+    health-checked when borrowed.  A connection is retired once it has been
+    checked out ``max_uses`` times or is older than ``max_lifetime`` seconds.
+    """
+
+    def __init__(
+        self,
+        connect,
+        min_size=1,
+        max_size=10,
+        timeout=10.0,
+        max_uses=0,
+        max_lifetime=0,
+        health_check=True,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool size must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_uses = max_uses
+        self.max_lifetime = max_lifetime
+        self.health_check = health_check
+        self.pid = os.getpid()
+
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._meta = {}  # id(conn) -> [created_at, uses]
+        self._size = 0  # open connections, idle or in use
+        self._closed = False
+
+        self._checkouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+
+        for _ in range(min_size):
+            self._size += 1
+            conn = self._open()
+            with self._cond:
+                self._idle.append(conn)
+
+    def _open(self):
+        """Open a new connection; the caller must already have reserved a slot."""
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._meta[id(conn)] = [time.monotonic(), 0]
+            self._created += 1
+        return conn
+
+    def _discard(self, conn):
+        with self._cond:
+            self._meta.pop(id(conn), None)
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, conn):
+        created_at, uses = self._meta[id(conn)]
+        if self.max_uses and uses >= self.max_uses:
+            return True
+        if self.max_lifetime and time.monotonic() - created_at >= self.max_lifetime:
+            return True
+        return False
+
+    @staticmethod
+    def _is_healthy(conn):
+        if conn.closed:
+            return False
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self):
+        """Check a connection out of the pool, waiting up to ``timeout`` seconds."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolError("connection pool is closed")
+                    if self._idle:
+                        conn = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"no connection available within {self.timeout:.1f}s "
+                            f"({self._size} of {self.max_size} in use)"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+
+            if conn is None:
+                conn = self._open()
+            elif self._is_expired(conn) or (self.health_check and not self._is_healthy(conn)):
+                self._discard(conn)
+                continue
+
+            with self._cond:
+                self._meta[id(conn)][1] += 1
+                self._checkouts += 1
+                if waited:
+                    elapsed = time.monotonic() - started
+                    self._waits += 1
+                    self._wait_time += elapsed
+                    self._max_wait_time = max(self._max_wait_time, elapsed)
+            return conn
+
+    def putconn(self, conn, close=False):
+        """Return a connection to the pool, closing it if it is broken or retired."""
+        if id(conn) not in self._meta:
+            # Not one of ours (e.g. a connection opened before a fork); just close it.
+            try:
+                conn.close()
+            except Exception:
+                pass
+            return
+
+        if close or self._closed or conn.closed:
+            self._discard(conn)
+            return
+
+        try:
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+
+        if self._is_expired(conn):
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Snapshot of pool usage for operators."""
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._size - idle,
+                "idle": idle,
+                "checkouts": self._checkouts,
+                "connections_created": self._created,
+                "connections_discarded": self._discarded,
+                "timeouts": self._timeouts,
+                "waits": self._waits,
+                "total_wait_time": round(self._wait_time, 6),
+                "avg_wait_time": round(self._wait_time / self._waits, 6) if self._waits else 0.0,
+                "max_wait_time": round(self._max_wait_time, 6),
+            }
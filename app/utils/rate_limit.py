@@ -0,0 +1,200 @@
+"""Token-bucket rate limits shared by every worker through the rate_limit_bucket table.
+
+A limit of ``N/S`` allows bursts of N requests and refills at N per S seconds.
+Each limited route has one limit per client IP and one per submitted username,
+configured as RATE_LIMIT_<ROUTE>_PER_IP and RATE_LIMIT_<ROUTE>_PER_USERNAME
+(``0`` disables one). All of a request's buckets are checked in one statement,
+before the view runs, so rejected attempts never reach the password hasher. A
+rejected request costs no tokens, so a locked-out username does not also drain
+its client's IP budget.
+
+Per-IP buckets key on ``request.remote_addr``. Behind reverse proxies that is
+the proxy's address unless TRUSTED_PROXY_HOPS says how many X-Forwarded-For
+entries to trust; see trust_proxies.
+"""
+import math
+import os
+import threading
+from collections import Counter
+from functools import wraps
+
+import click
+import psycopg2
+from flask import flash, render_template, request
+from flask.cli import AppGroup
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from app.utils.database import get_db
+from app.utils.logger import setup_logger
+
+log = setup_logger(__name__)
+
+DEFAULT_LIMITS = {
+    "login": {"ip": "20/60", "username": "5/60"},
+    "register": {"ip": "5/600", "username": "3/600"},
+}
+
+# Refill each bucket for the time since its last update, then take a token if
+# one is left; buckets that had none are not updated and not returned
+TAKE_TOKENS_SQL = """
+    INSERT INTO rate_limit_bucket AS b (key, capacity, refill_per_second, tokens, updated_at)
+    SELECT key, capacity, rate, capacity - 1, clock_timestamp()
+    FROM unnest(%(keys)s::text[], %(capacities)s::float8[], %(rates)s::float8[]) AS t(key, capacity, rate)
+    ON CONFLICT (key) DO UPDATE SET
+        capacity = EXCLUDED.capacity,
+        refill_per_second = EXCLUDED.refill_per_second,
+        tokens = LEAST(EXCLUDED.capacity,
+                       b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * EXCLUDED.refill_per_second) - 1,
+        updated_at = clock_timestamp()
+    WHERE LEAST(EXCLUDED.capacity,
+                b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * EXCLUDED.refill_per_second) >= 1
+    RETURNING key
+"""
+
+# Give back the tokens TAKE_TOKENS_SQL took when another of the request's
+# buckets was empty; the rows are still locked by the same transaction
+REFUND_TOKENS_SQL = """
+    UPDATE rate_limit_bucket
+    SET tokens = LEAST(capacity, tokens + 1)
+    WHERE key = ANY(%(keys)s)
+"""
+
+
+def parse_limit(value):
+    """``(capacity, refill per second)`` for ``"N/S"``, or None for ``"0"``/empty."""
+    if not value or value.strip() == "0":
+        return None
+    count, seconds = value.split("/")
+    count, seconds = float(count), float(seconds)
+    if count < 1 or seconds <= 0:
+        raise ValueError(f"Invalid rate limit {value!r}")
+    return count, count / seconds
+
+
+class RateLimiter:
+    def __init__(self, limits=None):
+        if limits is None:
+            limits = {
+                route: {
+                    scope: parse_limit(os.environ.get(f"RATE_LIMIT_{route.upper()}_PER_{scope.upper()}", default))
+                    for scope, default in scopes.items()
+                }
+                for route, scopes in DEFAULT_LIMITS.items()
+            }
+        self.limits = limits
+        self._decisions = Counter()  # (route, decision) -> count; decision is allowed/ip/username/error
+        self._lock = threading.Lock()
+
+    def take(self, route, ip, username=None):
+        """Take a token from each of the request's buckets.
+
+        Returns None when the request may proceed, otherwise the scope whose
+        bucket was empty ("ip" or "username") and the seconds to wait. Tokens
+        are only taken when every bucket has one.
+        """
+        buckets = {}
+        for scope, value in (("ip", ip), ("username", (username or "").strip().lower())):
+            limit = self.limits.get(route, {}).get(scope)
+            if limit and value:
+                buckets[f"{route}:{scope}:{value}"] = (scope, *limit)
+        if not buckets:
+            return None
+
+        db = get_db()
+        cursor = db.cursor()
+        try:
+            cursor.execute(TAKE_TOKENS_SQL, {
+                "keys": list(buckets),
+                "capacities": [capacity for _, capacity, _ in buckets.values()],
+                "rates": [rate for _, _, rate in buckets.values()],
+            })
+            granted = {row["key"] for row in cursor.fetchall()}
+            if granted and len(granted) < len(buckets):
+                cursor.execute(REFUND_TOKENS_SQL, {"keys": list(granted)})
+            db.commit()
+        except psycopg2.Error as e:
+            # Fail open: a limiter outage should not lock everyone out
+            db.rollback()
+            log.warning(f"Rate limiter unavailable, allowing {route}: {e}")
+            self._count(route, "error")
+            return None
+        finally:
+            cursor.close()
+
+        for key, (scope, _, rate) in buckets.items():
+            if key not in granted:
+                self._count(route, scope)
+                # Under one token is left, so one token's refill time is enough
+                return scope, math.ceil(1 / rate)
+        self._count(route, "allowed")
+        return None
+
+    def stats(self):
+        """Decision counts per route: allowed, rejected per ip/username, and errors."""
+        with self._lock:
+            stats = {}
+            for (route, decision), count in sorted(self._decisions.items()):
+                stats.setdefault(route, {})[decision] = count
+            return stats
+
+    def prune(self):
+        """Delete buckets that have refilled completely; they carry no state."""
+        db = get_db()
+        cursor = db.cursor()
+        cursor.execute(
+            """
+            DELETE FROM rate_limit_bucket
+            WHERE tokens + EXTRACT(EPOCH FROM clock_timestamp() - updated_at) * refill_per_second >= capacity
+            """
+        )
+        deleted = cursor.rowcount
+        db.commit()
+        cursor.close()
+        return deleted
+
+    def _count(self, route, decision):
+        with self._lock:
+            self._decisions[(route, decision)] += 1
+
+
+rate_limiter = RateLimiter()
+
+
+def rate_limited(route, template):
+    """Apply ``route``'s limits to POSTs, answering 429 with ``template`` when a bucket is empty."""
+
+    def decorator(view):
+        @wraps(view)
+        def decorated_function(*args, **kwargs):
+            if request.method == "POST":
+                rejected = rate_limiter.take(route, request.remote_addr, request.form.get("username"))
+                if rejected is not None:
+                    _, retry_after = rejected
+                    flash("Too many attempts. Please wait a little and try again.")
+                    return render_template(template), 429, {"Retry-After": str(retry_after)}
+            return view(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def trust_proxies(app, hops=None):
+    """Take the client address from the last ``hops`` X-Forwarded-For entries.
+
+    Only set TRUSTED_PROXY_HOPS to the number of proxies that really sit in
+    front of the app: each trusted hop is a header a client could otherwise
+    forge to pick its own rate limit bucket.
+    """
+    if hops is None:
+        hops = int(os.environ.get("TRUSTED_PROXY_HOPS", 0))
+    if hops > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+    return hops
+
+
+ratelimit_cli = AppGroup("ratelimit", help="Login and registration rate limits.")
+
+
+@ratelimit_cli.command("prune")
+def prune_command():
+    """Delete idle, fully refilled buckets; safe to run from cron."""
+    click.echo(f"Pruned {rate_limiter.prune()} rate limit buckets.")
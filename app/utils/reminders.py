@@ -0,0 +1,107 @@
+import datetime
+from itertools import groupby
+from operator import itemgetter
+
+from app.utils.database import get_db
+from app.utils.email import enqueue_emails
+from app.utils.logger import setup_logger
+
+log = setup_logger(__name__)
+
+DIGEST_HEADER = """
+    Hello {username},
+
+    This is a reminder about your upcoming events:
+"""
+
+DIGEST_FOOTER = """
+    Best regards,
+    The Events Team
+    """
+
+
+def _render_event(event):
+    """The part of a digest describing one event; rendered once and shared by every registrant."""
+    where = f"{event['address']}, {event['city']}" if event["address"] else "location to be announced"
+    return f"""
+    - {event['event_name']} on {event['date']} ({where})
+"""
+
+
+def send_event_reminders(day=None, batch_size=2000):
+    """Queue one digest email per resident registered for events on ``day`` (default: tomorrow).
+
+    Events are claimed with FOR UPDATE SKIP LOCKED and stamped with
+    ``reminders_sent_at`` in the same transaction as the queued mail, so the job
+    can be re-run or run concurrently without sending anything twice. The
+    registrants are streamed through a server-side cursor ordered by resident,
+    so memory use is bounded by ``batch_size`` whatever the number of rows.
+
+    Returns ``(events, emails)``.
+    """
+    if day is None:
+        day = datetime.date.today() + datetime.timedelta(days=1)
+
+    db = get_db()
+    cursor = db.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT e.id, COALESCE(e.name, e.activity_group_name) AS event_name, e.date,
+                   l.address, l.city
+            FROM event e
+            LEFT JOIN location l ON l.id = e.location_id
+            WHERE e.date = %s AND e.reminders_sent_at IS NULL
+            ORDER BY e.id
+            FOR UPDATE OF e SKIP LOCKED
+            """,
+            (day,),
+        )
+        blocks = {event["id"]: _render_event(event) for event in cursor.fetchall()}
+        if not blocks:
+            db.rollback()
+            return 0, 0
+
+        stream = db.cursor(name="event_reminders")
+        stream.itersize = batch_size
+        stream.execute(
+            """
+            SELECT u.resident_id, u.username, u.email, r.event_id
+            FROM registrations r
+            JOIN resident u ON u.resident_id = r.user_id
+            WHERE r.event_id = ANY(%s) AND r.status = 'registered' AND u.email IS NOT NULL
+            ORDER BY u.resident_id, r.event_id
+            """,
+            (list(blocks),),
+        )
+
+        subject = f"Reminder: your events on {day}"
+        pending = []
+        queued = 0
+        for _, rows in groupby(stream, key=itemgetter("resident_id")):
+            rows = list(rows)
+            body = (
+                DIGEST_HEADER.format(username=rows[0]["username"])
+                + "".join(blocks[row["event_id"]] for row in rows)
+                + DIGEST_FOOTER
+            )
+            pending.append((rows[0]["email"], subject, body))
+            if len(pending) >= batch_size:
+                queued += enqueue_emails(pending, commit=False)
+                pending = []
+        queued += enqueue_emails(pending, commit=False)
+        stream.close()
+
+        cursor.execute(
+            "UPDATE event SET reminders_sent_at = NOW() WHERE id = ANY(%s)",
+            (list(blocks),),
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    log.info(f"Queued {queued} reminder emails for {len(blocks)} events on {day}")
+    return len(blocks), queued
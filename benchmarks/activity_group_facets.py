@@ -0,0 +1,61 @@
+"""Landing-page facet selection at 100k groups, in memory.
+
+    python -m benchmarks.activity_group_facets
+
+Times ActivityGroupFacets.select, which computes the matching positions and
+every facet's option counts, for a few filter combinations. Turning positions
+into the rendered group list is proportional to the result and not included.
+"""
+import random
+import time
+
+from app.models.activity_groups import ActivityGroup, EventFrequency
+from app.services.activity_group_facets import ActivityGroupFacets
+from benchmarks.common import measure, report
+
+GROUPS = 100_000
+CATEGORIES = [f"Category {i}" for i in range(40)]
+FILTERS = {
+    "none": {},
+    "one facet": {"fee": ["free"]},
+    "three facets": {"interest": CATEGORIES[:5], "frequency": ["weekly"], "age": ["18-plus", "21-plus"]},
+    "all facets": {
+        "interest": CATEGORIES[::3],
+        "fee": ["free", "under-25"],
+        "frequency": ["weekly", "monthly"],
+        "age": ["all-ages"],
+        "public": ["yes"],
+    },
+}
+
+
+def main():
+    rng = random.Random(7)
+    groups = [
+        ActivityGroup(
+            name=f"Group {i}", category=rng.choice(CATEGORIES), description="", founding_date=None,
+            website="", email=None, phone_number="", social_media_links="{}", is_active=True,
+            total_members=0, event_frequency=rng.choice(list(EventFrequency)),
+            membership_fee=rng.choice([0, 0, 10, 30, 75]), open_to_public=rng.random() < 0.7,
+            min_age=rng.choice([0, 13, 18, 21]),
+        )
+        for i in range(GROUPS)
+    ]
+    started = time.perf_counter()
+    facets = ActivityGroupFacets(groups)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    rows = []
+    for label, filters in FILTERS.items():
+        timing = measure(lambda: facets.select(filters), repeat=200, warmup=20)
+        rows.append({
+            "filters": label,
+            "median_ms": timing["median_ms"],
+            "p95_ms": timing["p95_ms"],
+            "matches": len(facets.select(filters)[0]),
+        })
+    report(f"Facet selection and counts over {GROUPS:,} groups (build {build_ms:.0f} ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
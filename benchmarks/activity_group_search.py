@@ -0,0 +1,71 @@
+"""Landing-page group search at 100k groups: Python regex over the table vs. the in-memory index.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.activity_group_search
+
+"regex" is the previous search_activity_groups: fetch every row and regex-match
+name and category. "index" searches an already-built ActivityGroupIndex, which
+is what requests see between catalog reloads; the build cost is reported separately.
+"""
+import re
+import time
+
+from app.models.activity_groups import ActivityGroup
+from app.services.activity_group_index import ActivityGroupIndex
+from app.utils.database import get_db
+from benchmarks.common import execute, measure, report, scratch_app
+
+GROUPS = 100_000
+QUERIES = ["rowing", "row", "club bo", "ches", "oir of dor", "zzzz", "(a+)+$"]
+
+
+def regex_search(pattern):
+    cursor = get_db().cursor()
+    cursor.execute("SELECT * FROM activity_group")
+    rows = cursor.fetchall()
+    cursor.close()
+    prog = re.compile(pattern, re.IGNORECASE)
+    return [
+        ActivityGroup.model_validate(row) for row in rows
+        if prog.search(row["name"]) or prog.search(row["category"])
+    ]
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO activity_group (name, category, description, website, email, phone_number,
+                                        social_media_links, event_frequency)
+            SELECT (ARRAY['Boston Rowing', 'Chess Club', 'Choir of Dorchester', 'Book Club', 'Yoga'])[1 + i %% 5]
+                   || ' ' || i,
+                   (ARRAY['Sports', 'Games', 'Music', 'Reading'])[1 + i %% 4],
+                   'Benchmark group', '', 'bench@example.com', '', '{}', 'weekly'
+            FROM generate_series(1, %(groups)s) AS i
+            """,
+            {"groups": GROUPS},
+        )
+        rows = []
+        with app.app_context():
+            cursor = get_db().cursor()
+            cursor.execute("SELECT * FROM activity_group")
+            groups = [ActivityGroup.model_validate(row) for row in cursor.fetchall()]
+            cursor.close()
+            started = time.perf_counter()
+            index = ActivityGroupIndex(groups)
+            build_ms = (time.perf_counter() - started) * 1000
+            for query in QUERIES:
+                before = measure(lambda: regex_search(query), repeat=5, warmup=1)
+                after = measure(lambda: index.search(query))
+                rows.append({
+                    "query": query,
+                    "regex_median_ms": before["median_ms"],
+                    "index_median_ms": after["median_ms"],
+                    "index_p95_ms": after["p95_ms"],
+                    "hits": len(index.search(query)),
+                })
+        report(f"search_activity_groups on {GROUPS:,} groups (index build {build_ms:.0f} ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
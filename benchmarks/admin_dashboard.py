@@ -0,0 +1,96 @@
+"""Admin dashboard data for organizers with thousands of events: per-event lookups vs. paged loading.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.admin_dashboard
+
+Every event has 20 registrations and 5 waitlisted users. The "before" side
+replays what the profile route used to run: the organizer's events, then the
+registered and waitlisted users of each one. The "after" side is a dashboard
+load (the first page of events) and, separately, expanding one event.
+"""
+from app.models.events import Event
+from app.utils.database import get_db
+from benchmarks.common import execute, measure, report, scratch_app
+
+ORGANIZERS = (100, 1000, 5000)  # events created by each benchmark organizer
+
+
+def per_event_lookups(user_id):
+    cursor = get_db().cursor()
+    cursor.execute(
+        """SELECT e.id, e.activity_group_name, e.date, e.registered_count, e.waitlist_count
+           FROM event e WHERE e.created_by = %s""",
+        (user_id,)
+    )
+    created_events = cursor.fetchall()
+    event_user_info = {}
+    for event in created_events:
+        cursor.execute(
+            """SELECT u.resident_id, u.username, u.email, r.created_at, r.status
+               FROM registrations r JOIN resident u ON r.user_id = u.resident_id
+               WHERE r.event_id = %s AND r.status = 'registered'""",
+            (event['id'],)
+        )
+        registered = cursor.fetchall()
+        cursor.execute(
+            """SELECT u.resident_id, u.username, u.email, w.created_at
+               FROM waitlist w JOIN resident u ON w.user_id = u.resident_id
+               WHERE w.event_id = %s""",
+            (event['id'],)
+        )
+        event_user_info[event['id']] = {'registered': registered, 'waitlisted': cursor.fetchall()}
+    cursor.close()
+    return created_events, event_user_info
+
+
+def expand(event_id):
+    return Event.get_registrants(event_id, "registered"), Event.get_registrants(event_id, "waitlisted")
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, 'bench' || i || '@example.com', 'x', 'admin'
+            FROM generate_series(1, 2000) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Bench Group', 'Bench', 'Benchmark events', 'bench@example.com', 'weekly');
+
+            INSERT INTO event (activity_group_name, date, max_participants, created_by)
+            SELECT 'Bench Group', CURRENT_DATE + i %% 730 - 365, 20, o.organizer
+            FROM (VALUES (1, %s), (2, %s), (3, %s)) AS o(organizer, events),
+                 generate_series(1, o.events) AS i;
+
+            INSERT INTO registrations (event_id, user_id, status)
+            SELECT e.id, 1 + (e.id * 7 + u) %% 2000, 'registered'
+            FROM event e, generate_series(1, 20) AS u;
+
+            INSERT INTO waitlist (event_id, user_id)
+            SELECT e.id, 1 + (e.id * 7 + 20 + u) %% 2000
+            FROM event e, generate_series(1, 5) AS u;
+
+            UPDATE event SET registered_count = 20, waitlist_count = 5;
+            """,
+            ORGANIZERS,
+        )
+        rows = []
+        with app.app_context():
+            for organizer, events in enumerate(ORGANIZERS, start=1):
+                page, _ = Event.get_created_by(organizer)
+                before = measure(lambda: per_event_lookups(organizer), repeat=5, warmup=1)
+                after = measure(lambda: Event.get_created_by(organizer))
+                expanded = measure(lambda: expand(page[0]["id"]))
+                rows.append({
+                    "events": events,
+                    "before_queries": 1 + 2 * events,
+                    "before_median_ms": before["median_ms"],
+                    "dashboard_median_ms": after["median_ms"],
+                    "expand_event_median_ms": expanded["median_ms"],
+                })
+        report("Organizer dashboard, 20 registered + 5 waitlisted per event", rows)
+
+
+if __name__ == "__main__":
+    main()
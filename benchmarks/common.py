@@ -0,0 +1,97 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a scratch PostgreSQL database given by BENCH_DATABASE_URL.
+Each run migrates a private schema, points the app's connection pool at it and
+drops it afterwards, so they are safe to run next to real data.
+"""
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from app.utils import database
+from app.utils.migrations import upgrade
+
+
+@contextmanager
+def scratch_app():
+    """Yield ``(app, conn)`` for a freshly migrated schema; ``conn`` is a direct connection."""
+    url = os.environ.get("BENCH_DATABASE_URL")
+    if not url:
+        sys.exit("Set BENCH_DATABASE_URL to a scratch PostgreSQL database")
+    os.environ["DATABASE_URL"] = url
+
+    schema = f"bench_{os.getpid()}"
+    conn = psycopg2.connect(url, cursor_factory=RealDictCursor)
+    cur = conn.cursor()
+    cur.execute(f"CREATE SCHEMA {schema}")
+    cur.execute(f"SET search_path TO {schema}, public")
+    conn.commit()
+
+    @database.on_connect
+    def _use_scratch_schema(app_conn):
+        app_cur = app_conn.cursor()
+        app_cur.execute(f"SET search_path TO {schema}, public")
+        app_cur.close()
+
+    try:
+        upgrade(conn)
+        from app import create_app
+
+        yield create_app(), conn
+    finally:
+        database._connect_hooks.remove(_use_scratch_schema)
+        pool = database.get_pool()
+        pool.closeall()
+        database._pool = None
+        conn.rollback()
+        cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.commit()
+        conn.close()
+
+
+def execute(conn, sql, params=None):
+    """Run ``sql`` on ``conn``, commit, and refresh planner statistics."""
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    conn.commit()
+    conn.autocommit = True
+    cur.execute("ANALYZE")
+    conn.autocommit = False
+    cur.close()
+
+
+def measure(fn, repeat=20, warmup=3):
+    """Call ``fn`` repeatedly and return latency percentiles in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def report(title, rows):
+    """Print ``rows`` (a list of dicts with identical keys) as an aligned table."""
+    print(f"\n{title}")
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(_fmt(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.rjust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(_fmt(row[c]).rjust(widths[c]) for c in columns))
+
+
+def _fmt(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
@@ -0,0 +1,103 @@
+"""Data for GET /events/<id>: the old per-part lookups vs. Event.get_detail.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.event_detail
+
+The "before" side replays the lookups view_event used to make: the event and
+location, the map embed (cache cleared, as on a worker's first view), and for
+logged-in viewers their registration, then their waitlist entry, followed by
+the prerequisites. Over a local socket a round trip is tens of microseconds;
+across a network each one adds its own latency on top of these numbers.
+"""
+from app.models.events import Event
+from app.models.prerequisite import Prerequisite
+from app.utils.database import get_db
+from app.utils.maps_manager import MapsManager
+from benchmarks.common import execute, measure, report, scratch_app
+
+EVENTS = 20_000
+EVENT_ID = 4242
+VIEWER = 77
+
+maps_manager = MapsManager()
+
+
+def separate_lookups(event_id, user_id):
+    event = Event.get(event_id)
+    maps_manager.invalidate(event_id)
+    event['maps_embed'] = maps_manager.get_event_map(event_id)
+    is_registered = is_waitlisted = False
+    if user_id is not None:
+        cursor = get_db().cursor()
+        cursor.execute(
+            "SELECT * FROM registrations WHERE event_id = %s AND user_id = %s", (event_id, user_id)
+        )
+        registration = cursor.fetchone()
+        if registration:
+            is_registered = registration['status'] == 'registered'
+        else:
+            cursor.execute(
+                "SELECT * FROM waitlist WHERE event_id = %s AND user_id = %s", (event_id, user_id)
+            )
+            is_waitlisted = bool(cursor.fetchone())
+        cursor.close()
+    return event, Prerequisite.get_prerequisites(event_id), is_registered, is_waitlisted
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, NULL, 'x', 'user' FROM generate_series(1, 2000) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Bench Group', 'Bench', 'Benchmark events', 'bench@example.com', 'weekly');
+
+            INSERT INTO location (address, city, state, zip_code)
+            VALUES ('1 Bench St', 'Boston', 'MA', '02110');
+
+            INSERT INTO event (activity_group_name, date, max_participants, location_id)
+            SELECT 'Bench Group', CURRENT_DATE + i %% 365, 50, 1
+            FROM generate_series(1, %(events)s) AS i;
+
+            INSERT INTO registrations (event_id, user_id, status)
+            SELECT 1 + i %% %(events)s, 1 + (i / %(events)s) * 97 %% 2000, 'registered'
+            FROM generate_series(0, 199999) AS i
+            ON CONFLICT DO NOTHING;
+
+            INSERT INTO waitlist (event_id, user_id)
+            VALUES (%(event)s, %(viewer)s);
+
+            INSERT INTO prerequisite (event_id, prerequisite_event_id, minimum_performance, qualification_period)
+            SELECT %(event)s, %(event)s + i, i, 365 FROM generate_series(1, 3) AS i;
+
+            INSERT INTO event_map (event_id, embed_url)
+            VALUES (%(event)s, 'https://maps.example.com/bench');
+            """,
+            {"events": EVENTS, "event": EVENT_ID, "viewer": VIEWER},
+        )
+        rows = []
+        with app.app_context():
+            for viewer, label in ((None, "anonymous"), (VIEWER, "logged in")):
+                event, prerequisites, is_registered, is_waitlisted = separate_lookups(EVENT_ID, viewer)
+                detail = Event.get_detail(EVENT_ID, viewer)
+                assert detail['maps_embed'] == event['maps_embed']
+                assert (detail['is_registered'], detail['is_waitlisted']) == (is_registered, is_waitlisted)
+                assert len(detail['prerequisites']) == len(prerequisites)
+
+                before = measure(lambda: separate_lookups(EVENT_ID, viewer), repeat=200, warmup=20)
+                after = measure(lambda: Event.get_detail(EVENT_ID, viewer), repeat=200, warmup=20)
+                rows.append({
+                    "viewer": label,
+                    "before_queries": 5 if viewer else 3,
+                    "before_median_ms": before["median_ms"],
+                    "before_p95_ms": before["p95_ms"],
+                    "after_median_ms": after["median_ms"],
+                    "after_p95_ms": after["p95_ms"],
+                })
+        report(f"Event detail data, {EVENTS:,} events", rows)
+
+
+if __name__ == "__main__":
+    main()
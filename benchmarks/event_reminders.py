@@ -0,0 +1,105 @@
+"""Day-before reminders: streamed per-resident digests vs. fetching every registration.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.event_reminders
+
+Peak memory is the Python-side allocation peak (tracemalloc) while the job runs;
+the streamed job should stay flat as registrations grow. The fetchall column only
+reads the rows; the streamed column also writes every digest to the outbox.
+"""
+import datetime
+import time
+import tracemalloc
+
+from app.utils.database import get_db
+from app.utils.reminders import send_event_reminders
+from benchmarks.common import execute, report, scratch_app
+
+DAY = datetime.date.today() + datetime.timedelta(days=1)
+RESIDENTS = 50_000
+EVENTS = 200
+REGISTRATIONS = (10_000, 50_000, 100_000)
+
+LEGACY_SQL = """
+    SELECT e.id, e.activity_group_name, e.date, u.email
+    FROM event e
+    JOIN registrations r ON r.event_id = e.id
+    JOIN resident u ON r.user_id = u.resident_id
+    WHERE e.date = %s
+"""
+
+
+def legacy():
+    cursor = get_db().cursor()
+    cursor.execute(LEGACY_SQL, (DAY,))
+    rows = cursor.fetchall()
+    cursor.close()
+    get_db().rollback()
+    return len(rows)
+
+
+def streamed(conn):
+    execute(conn, "DELETE FROM notification_outbox; UPDATE event SET reminders_sent_at = NULL")
+    return send_event_reminders(DAY)[1]
+
+
+def run(fn):
+    """Return ``(result, ms, peak_mb)``; timing and memory come from separate runs."""
+    started = time.perf_counter()
+    result = fn()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed_ms, peak / 2**20
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, 'bench' || i || '@example.com', 'x', 'user'
+            FROM generate_series(1, %(residents)s) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Bench Group', 'Bench', 'Benchmark events', 'bench@example.com', 'weekly');
+
+            INSERT INTO event (activity_group_name, name, date)
+            SELECT 'Bench Group', 'Bench event ' || i, %(day)s
+            FROM generate_series(1, %(events)s) AS i;
+            """,
+            {"residents": RESIDENTS, "events": EVENTS, "day": DAY},
+        )
+        rows = []
+        for registrations in REGISTRATIONS:
+            # Each resident ends up registered for one or two of the events
+            execute(
+                conn,
+                """
+                TRUNCATE registrations;
+                INSERT INTO registrations (event_id, user_id, status)
+                SELECT (SELECT MIN(id) FROM event) + (i %% %(events)s + i / %(residents)s) %% %(events)s,
+                       (SELECT MIN(resident_id) FROM resident) + i %% %(residents)s,
+                       'registered'
+                FROM generate_series(0, %(n)s - 1) AS i;
+                """,
+                {"events": EVENTS, "residents": RESIDENTS, "n": registrations},
+            )
+            with app.app_context():
+                fetched, legacy_ms, legacy_mb = run(legacy)
+                emails, streamed_ms, streamed_mb = run(lambda: streamed(conn))
+            rows.append({
+                "registrations": registrations,
+                "fetchall_ms": legacy_ms,
+                "fetchall_peak_mb": legacy_mb,
+                "digests": emails,
+                "streamed_ms": streamed_ms,
+                "streamed_peak_mb": streamed_mb,
+            })
+        report(f"Reminders for {EVENTS} events on one day", rows)
+
+
+if __name__ == "__main__":
+    main()
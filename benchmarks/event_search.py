@@ -0,0 +1,87 @@
+"""Event search at 1M events: ILIKE over event JOIN location vs. the tsvector/GIN search.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.event_search
+
+Both sides return the first 50 rows. Substring matching through pg_trgm is only
+exercised where the server has the extension installed.
+"""
+from app.models.events import Event
+from app.utils.database import get_db
+from benchmarks.common import measure, report, scratch_app
+
+EVENTS = 1_000_000
+GROUPS = 2_000
+LOCATIONS = 500
+CITIES = ["Boston", "Cambridge", "Somerville", "Brookline", "Quincy", "Newton", "Medford", "Malden"]
+QUERIES = ["rowing 1235", "somerville", "brook", "chess club", "zzzz"]
+
+LEGACY_SQL = """
+    SELECT e.*, l.address, l.city, l.state, l.zip_code
+    FROM event e
+    LEFT JOIN location l ON e.location_id = l.id
+    WHERE e.activity_group_name ILIKE %s OR l.address ILIKE %s OR l.city ILIKE %s
+    ORDER BY e.date DESC
+    LIMIT 50
+"""
+
+
+def legacy_search(term):
+    cursor = get_db().cursor()
+    pattern = f"%{term}%"
+    cursor.execute(LEGACY_SQL, (pattern, pattern, pattern))
+    events = cursor.fetchall()
+    cursor.close()
+    return events
+
+
+def main():
+    with scratch_app() as (app, conn):
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            SELECT (ARRAY['Rowing', 'Chess Club', 'Yoga', 'Book Club', 'Running'])[1 + i %% 5] || ' ' || i,
+                   'Category', 'Benchmark group', 'bench@example.com', 'weekly'
+            FROM generate_series(1, %(groups)s) AS i;
+
+            INSERT INTO location (address, city, state, zip_code)
+            SELECT i || ' Main St', (%(cities)s::text[])[1 + i %% %(ncities)s], 'MA', '02' || (100 + i)
+            FROM generate_series(1, %(locations)s) AS i;
+
+            INSERT INTO event (activity_group_name, name, date, location_id)
+            SELECT g.name, g.name, CURRENT_DATE + (i %% 730 - 365), 1 + i %% %(locations)s
+            FROM generate_series(1, %(events)s) AS i,
+                 LATERAL (
+                     SELECT (ARRAY['Rowing', 'Chess Club', 'Yoga', 'Book Club', 'Running'])[1 + n %% 5]
+                            || ' ' || n AS name
+                     FROM (SELECT 1 + i %% %(groups)s AS n) AS k
+                 ) AS g;
+            """,
+            {"groups": GROUPS, "locations": LOCATIONS, "events": EVENTS,
+             "cities": CITIES, "ncities": len(CITIES)},
+        )
+        conn.commit()
+        conn.autocommit = True
+        cur.execute("VACUUM ANALYZE")
+        cur.execute("SELECT to_regclass('event_search_text_trgm_idx') IS NOT NULL AS trgm")
+        trigram = cur.fetchone()["trgm"]
+        conn.autocommit = False
+        cur.close()
+
+        rows = []
+        with app.app_context():
+            for term in QUERIES:
+                before = measure(lambda: legacy_search(term), repeat=5, warmup=1)
+                after = measure(lambda: Event.search(term), repeat=20)
+                rows.append({
+                    "query": term,
+                    "ilike_median_ms": before["median_ms"],
+                    "fts_median_ms": after["median_ms"],
+                    "fts_p95_ms": after["p95_ms"],
+                    "hits": len(Event.search(term)),
+                })
+        report(f"/events?q= on {EVENTS:,} events (pg_trgm {'on' if trigram else 'off'})", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Latency of GET /events as the number of events grows.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.events_list
+"""
+from benchmarks.common import execute, measure, report, scratch_app
+
+SIZES = (100, 500, 1000, 2000, 5000)
+
+
+def seed(conn, start, stop):
+    execute(
+        conn,
+        """
+        INSERT INTO event (activity_group_name, date, max_participants, created_by)
+        SELECT 'Bench Group', CURRENT_DATE + i %% 365, 25, 1
+        FROM generate_series(%s, %s) AS i;
+
+        INSERT INTO registrations (event_id, user_id, status)
+        SELECT e.id, u.resident_id, 'registered'
+        FROM event e
+        CROSS JOIN (SELECT resident_id FROM resident ORDER BY resident_id LIMIT 10) u
+        WHERE e.id > %s;
+        """,
+        (start + 1, stop, start),
+    )
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, 'bench' || i || '@example.com', 'x', 'user'
+            FROM generate_series(1, 10) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Bench Group', 'Bench', 'Benchmark events', 'bench@example.com', 'weekly');
+            """,
+        )
+        client = app.test_client()
+        rows = []
+        seeded = 0
+        for size in SIZES:
+            seed(conn, seeded, size)
+            seeded = size
+            timings = measure(lambda: client.get("/events"), repeat=10)
+            rows.append({"events": size, **timings, "us_per_event": timings["median_ms"] * 1000 / size})
+        report("GET /events", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Login throughput and page latency during a login burst: inline bcrypt vs. the process pool.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.login_throughput
+
+CLIENTS threads log in back to back for DURATION seconds, as a burst of
+sign-ins would, while one more thread keeps loading a page of events and
+records how long each load takes. "inline" hashes on the request threads with
+no queue limit, as User.validate used to; "pool" uses PASSWORD_HASH_WORKERS
+processes (default: one per CPU) and fails fast past PASSWORD_HASH_MAX_PENDING.
+Results depend heavily on the number of CPUs; the machine's count is printed.
+"""
+import os
+import statistics
+import threading
+import time
+
+from app.models.events import Event
+from app.models.users import User
+from app.services import passwords
+from app.services.passwords import PasswordHasher, PasswordHasherBusy, hash_password
+from benchmarks.common import execute, report, scratch_app
+
+ROUNDS = 10
+USERS = 200
+CLIENTS = 16
+DURATION = 5.0
+BACKOFF = 0.25
+
+
+def _percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else 0.0
+
+
+def burst(app, hasher):
+    passwords.password_hasher = hasher
+    # User.validate looks the hasher up in its own module namespace
+    import app.models.users as users_module
+    users_module.password_hasher = hasher
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    logins, rejected, page_loads = [], [0], []
+
+    def client(n):
+        i = n
+        while not stop.is_set():
+            started = time.perf_counter()
+            with app.app_context():
+                try:
+                    assert User.validate(f"bench{1 + i % USERS}", "bench-password") is not None
+                except PasswordHasherBusy:
+                    with lock:
+                        rejected[0] += 1
+                    # A client turned away backs off, as the Retry-After header asks
+                    time.sleep(BACKOFF)
+                    continue
+            with lock:
+                logins.append((time.perf_counter() - started) * 1000)
+            i += CLIENTS
+
+    def browser():
+        while not stop.is_set():
+            started = time.perf_counter()
+            with app.app_context():
+                Event.get_page()
+            page_loads.append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(CLIENTS)]
+    threads.append(threading.Thread(target=browser))
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        "logins_per_s": len(logins) / DURATION,
+        "rejected_per_s": rejected[0] / DURATION,
+        "login_p50_ms": statistics.median(logins) if logins else 0.0,
+        "login_p95_ms": _percentile(logins, 0.95),
+        "page_p50_ms": statistics.median(page_loads) if page_loads else 0.0,
+        "page_p95_ms": _percentile(page_loads, 0.95),
+    }
+
+
+def main():
+    # Every client thread holds a connection while it logs in
+    os.environ["DB_POOL_MAX_SIZE"] = str(CLIENTS + 4)
+    workers = int(os.environ.get("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+    max_pending = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 2 * workers))
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, NULL, %s, 'user' FROM generate_series(1, %s) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Bench Group', 'Bench', 'Benchmark events', 'bench@example.com', 'weekly');
+
+            INSERT INTO event (activity_group_name, date, max_participants)
+            SELECT 'Bench Group', CURRENT_DATE + i %% 365, 25 FROM generate_series(1, 2000) AS i;
+            """,
+            (hash_password("bench-password", ROUNDS), USERS),
+        )
+        pool = PasswordHasher(workers=workers, max_pending=max_pending, rounds=ROUNDS)
+        pool.verify("warm", hash_password("up", 4))
+        rows = [
+            {"hasher": "inline", **burst(app, PasswordHasher(workers=0, max_pending=10_000, rounds=ROUNDS))},
+            {"hasher": f"pool ({workers} procs, {max_pending} pending)", **burst(app, pool)},
+        ]
+        pool.close()
+    report(f"{CLIENTS} clients logging in for {DURATION:.0f}s, bcrypt cost {ROUNDS}, {os.cpu_count()} CPUs", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Prerequisite check: one query per prerequisite vs. the single set-based query.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.prerequisite_check
+"""
+from app.models.prerequisite import Prerequisite
+from app.utils.database import get_db
+from benchmarks.common import execute, measure, report, scratch_app
+
+RESIDENTS = 20_000
+EVENTS = 2_000
+HISTORY = 25  # completed registrations per resident
+PREREQUISITE_COUNTS = (1, 10, 50, 200)
+
+
+def legacy_check(user_id, event_id):
+    """The previous implementation: fetch the prerequisites, then query each one."""
+    cursor = get_db().cursor()
+    cursor.execute(
+        """
+        SELECT p.*, e.activity_group_name, e.date
+        FROM prerequisite p
+        JOIN event e ON p.prerequisite_event_id = e.id
+        WHERE p.event_id = %s
+        """,
+        (event_id,),
+    )
+    unmet = []
+    for prereq in cursor.fetchall():
+        cursor.execute(
+            """
+            SELECT r.*, s.attendance
+            FROM registrations r
+            JOIN session s ON r.event_id = s.event_id
+            WHERE r.user_id = %s AND r.event_id = %s
+            AND r.status = 'completed'
+            AND s.attendance >= %s
+            AND s.date >= CURRENT_DATE - INTERVAL '%s days'
+            """,
+            (user_id, prereq["prerequisite_event_id"], prereq["minimum_performance"],
+             prereq["qualification_period"]),
+        )
+        if not cursor.fetchone():
+            unmet.append(prereq)
+    cursor.close()
+    return not unmet, unmet
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, NULL, 'x', 'user' FROM generate_series(1, %(residents)s) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Bench Group', 'Bench', 'Benchmark events', 'bench@example.com', 'weekly');
+
+            INSERT INTO event (activity_group_name, date)
+            SELECT 'Bench Group', CURRENT_DATE - (i %% 365) FROM generate_series(1, %(events)s) AS i;
+
+            INSERT INTO session (activity_group_name, event_id, date, attendance)
+            SELECT 'Bench Group', id, date, 1 + id %% 10 FROM event;
+
+            INSERT INTO registrations (event_id, user_id, status)
+            SELECT (u * 7 + j * 80) %% %(events)s + 1, u, 'completed'
+            FROM generate_series(1, %(residents)s) AS u, generate_series(0, %(history)s - 1) AS j;
+            """,
+            {"residents": RESIDENTS, "events": EVENTS, "history": HISTORY},
+        )
+        rows = []
+        user_id = 4242
+        for count in PREREQUISITE_COUNTS:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO event (activity_group_name, date)
+                VALUES ('Bench Group', CURRENT_DATE + 30) RETURNING id
+                """
+            )
+            target = cur.fetchone()["id"]
+            conn.commit()
+            # Half of the prerequisites come from the user's own history
+            execute(
+                conn,
+                """
+                INSERT INTO prerequisite (event_id, prerequisite_event_id, minimum_performance,
+                                          qualification_period, is_waiver_allowed)
+                SELECT %(target)s, id, 3, 180, FALSE FROM (
+                    (SELECT event_id AS id FROM registrations WHERE user_id = %(user)s
+                     ORDER BY event_id LIMIT %(mine)s)
+                    UNION
+                    (SELECT id FROM event WHERE id < %(target)s ORDER BY id DESC LIMIT %(others)s)
+                ) AS chosen
+                """,
+                {"target": target, "user": user_id, "mine": (count + 1) // 2, "others": count // 2},
+            )
+            with app.app_context():
+                assert legacy_check(user_id, target)[0] == Prerequisite.check_prerequisites(user_id, target)[0]
+                before = measure(lambda: legacy_check(user_id, target))
+                after = measure(lambda: Prerequisite.check_prerequisites(user_id, target))
+            rows.append({
+                "prerequisites": count,
+                "per_prereq_median_ms": before["median_ms"],
+                "per_prereq_p95_ms": before["p95_ms"],
+                "set_based_median_ms": after["median_ms"],
+                "set_based_p95_ms": after["p95_ms"],
+            })
+        report(f"check_prerequisites, {RESIDENTS * HISTORY:,} historical registrations", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Prerequisite check on 1M historical registrations: scanning history vs. qualification lookups.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.qualification_check
+
+"history scan" is the set-based query that joins registrations and sessions on
+every check; "table lookup" reads the qualification table (LRU disabled) and
+"cached" is the in-process LRU hit path that check_prerequisites normally takes.
+"""
+from app.services.qualifications import QualificationCache
+from app.utils.database import get_db
+from benchmarks.common import execute, measure, report, scratch_app
+
+RESIDENTS = 40_000
+EVENTS = 4_000
+HISTORY = 25  # completed registrations per resident
+PREREQUISITE_COUNTS = (1, 10, 50, 200)
+
+HISTORY_SCAN_SQL = """
+    SELECT p.id, p.prerequisite_event_id,
+           e.activity_group_name AS event_name, e.date,
+           p.minimum_performance, p.qualification_period, p.is_waiver_allowed
+    FROM prerequisite p
+    JOIN event e ON e.id = p.prerequisite_event_id
+    WHERE p.event_id = %(event_id)s
+      AND NOT EXISTS (
+          SELECT 1
+          FROM registrations r
+          JOIN session s ON s.event_id = r.event_id
+          WHERE r.user_id = %(user_id)s
+            AND r.event_id = p.prerequisite_event_id
+            AND r.status = 'completed'
+            AND s.attendance >= p.minimum_performance
+            AND s.date >= CURRENT_DATE - p.qualification_period
+      )
+    ORDER BY p.id
+"""
+
+
+def history_scan(user_id, event_id):
+    cursor = get_db().cursor()
+    cursor.execute(HISTORY_SCAN_SQL, {"user_id": user_id, "event_id": event_id})
+    unmet = [dict(row) for row in cursor.fetchall()]
+    cursor.close()
+    return unmet
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, NULL, 'x', 'user' FROM generate_series(1, %(residents)s) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Bench Group', 'Bench', 'Benchmark events', 'bench@example.com', 'weekly');
+
+            INSERT INTO event (activity_group_name, date)
+            SELECT 'Bench Group', CURRENT_DATE - (i %% 365) FROM generate_series(1, %(events)s) AS i;
+
+            INSERT INTO session (activity_group_name, event_id, date, attendance)
+            SELECT 'Bench Group', id, date, 1 + id %% 10 FROM event;
+
+            INSERT INTO registrations (event_id, user_id, status)
+            SELECT (u * 7 + j * 160) %% %(events)s + 1, u, 'completed'
+            FROM generate_series(1, %(residents)s) AS u, generate_series(0, %(history)s - 1) AS j;
+            """,
+            {"residents": RESIDENTS, "events": EVENTS, "history": HISTORY},
+        )
+        rows = []
+        user_id = 4242
+        uncached = QualificationCache(ttl=0)
+        cached = QualificationCache(ttl=3600)
+        for count in PREREQUISITE_COUNTS:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO event (activity_group_name, date)
+                VALUES ('Bench Group', CURRENT_DATE + 30) RETURNING id
+                """
+            )
+            target = cur.fetchone()["id"]
+            conn.commit()
+            # Half of the prerequisites come from the user's own history; the
+            # triggers materialize qualifications for every resident who completed them
+            execute(
+                conn,
+                """
+                INSERT INTO prerequisite (event_id, prerequisite_event_id, minimum_performance,
+                                          qualification_period, is_waiver_allowed)
+                SELECT %(target)s, id, 3, 180, FALSE FROM (
+                    (SELECT event_id AS id FROM registrations WHERE user_id = %(user)s
+                     ORDER BY event_id LIMIT %(mine)s)
+                    UNION
+                    (SELECT id FROM event WHERE id < %(target)s ORDER BY id DESC LIMIT %(others)s)
+                ) AS chosen
+                """,
+                {"target": target, "user": user_id, "mine": (count + 1) // 2, "others": count // 2},
+            )
+            with app.app_context():
+                assert len(history_scan(user_id, target)) == len(uncached.unmet(user_id, target))
+                scan = measure(lambda: history_scan(user_id, target))
+                lookup = measure(lambda: uncached.unmet(user_id, target))
+                hit = measure(lambda: cached.unmet(user_id, target), repeat=1000)
+            rows.append({
+                "prerequisites": count,
+                "history_scan_ms": scan["median_ms"],
+                "table_lookup_ms": lookup["median_ms"],
+                "cached_ms": hit["median_ms"],
+            })
+
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) AS n FROM qualification")
+        qualifications = cur.fetchone()["n"]
+        conn.commit()
+        report(
+            f"check_prerequisites, {RESIDENTS * HISTORY:,} registrations, "
+            f"{qualifications:,} qualification rows (median)",
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
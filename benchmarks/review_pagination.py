@@ -0,0 +1,73 @@
+"""Paging through 500k reviews of one group: LIMIT/OFFSET vs. keyset tokens.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.review_pagination
+
+Both sides read 10 reviews per page. The keyset side starts from the token of
+the page before, as a user following "Older reviews" links would.
+"""
+from app.models.reviews import Review
+from app.utils.database import get_db
+from app.utils.pagination import encode_cursor
+from benchmarks.common import execute, measure, report, scratch_app
+
+REVIEWS = 500_000
+PER_PAGE = 10
+PAGES = (1, 100, 10_000, 49_000)
+
+OFFSET_SQL = """
+    SELECT r.*, u.username AS resident_name
+    FROM review r
+    JOIN resident u ON r.resident_id = u.resident_id
+    WHERE r.activity_group_name = %s
+    ORDER BY r.review_date DESC, r.review_id DESC
+    LIMIT %s OFFSET %s
+"""
+
+
+def offset_page(page):
+    cursor = get_db().cursor()
+    cursor.execute(OFFSET_SQL, ("Bench Group", PER_PAGE, (page - 1) * PER_PAGE))
+    reviews = [dict(review) for review in cursor.fetchall()]
+    cursor.close()
+    return reviews
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, NULL, 'x', 'user' FROM generate_series(1, 10000) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Bench Group', 'Bench', 'Benchmark group', 'bench@example.com', 'weekly');
+
+            INSERT INTO review (resident_id, activity_group_name, content, star_rating, review_date)
+            SELECT 1 + i %% 10000, 'Bench Group', 'Review ' || i, 1 + i %% 5, CURRENT_DATE - i %% 3650
+            FROM generate_series(1, %(reviews)s) AS i;
+            """,
+            {"reviews": REVIEWS},
+        )
+        rows = []
+        with app.app_context():
+            for page in PAGES:
+                # The token the previous page would have handed out
+                after = None
+                if page > 1:
+                    last = offset_page(page - 1)[-1]
+                    after = encode_cursor(last["review_date"], last["review_id"])
+                    assert Review.get_by_activity_group("Bench Group", after, PER_PAGE)[0] == offset_page(page)
+                offset = measure(lambda: offset_page(page), repeat=10, warmup=1)
+                keyset = measure(lambda: Review.get_by_activity_group("Bench Group", after, PER_PAGE))
+                rows.append({
+                    "page": page,
+                    "offset_median_ms": offset["median_ms"],
+                    "keyset_median_ms": keyset["median_ms"],
+                    "keyset_p95_ms": keyset["p95_ms"],
+                })
+        report(f"Group reviews, {REVIEWS:,} reviews, {PER_PAGE} per page", rows)
+
+
+if __name__ == "__main__":
+    main()
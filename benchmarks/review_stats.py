@@ -0,0 +1,80 @@
+"""Landing-page ratings for 2,000 groups over 1M reviews: AVG per group vs. review_stats.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.review_stats
+
+The per-group side is what the reviews page used to run for one group, repeated
+for each card; the bulk side reads every card's stats row in one query, then
+again from the in-process cache. The write side times a review create, which
+now also upserts its group's stats row.
+"""
+import datetime
+
+from app.models.reviews import Review
+from app.services.review_stats import review_ratings
+from app.utils.database import get_db
+from benchmarks.common import execute, measure, report, scratch_app
+
+GROUPS = 2_000
+REVIEWS = 1_000_000
+CARDS = 200
+
+AVG_SQL = "SELECT AVG(star_rating) AS avg_rating FROM review WHERE activity_group_name = %s"
+
+
+def average_per_group(names):
+    cursor = get_db().cursor()
+    averages = {}
+    for name in names:
+        cursor.execute(AVG_SQL, (name,))
+        averages[name] = cursor.fetchone()["avg_rating"]
+    cursor.close()
+    return averages
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, NULL, 'x', 'user' FROM generate_series(1, 10000) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            SELECT 'Group ' || i, 'Bench', 'Benchmark group', 'bench@example.com', 'weekly'
+            FROM generate_series(1, %(groups)s) AS i;
+
+            INSERT INTO review (resident_id, activity_group_name, content, star_rating, review_date)
+            SELECT 1 + i %% 10000, 'Group ' || (1 + i %% %(groups)s), 'Review ' || i, 1 + i %% 5,
+                   CURRENT_DATE - i %% 3650
+            FROM generate_series(1, %(reviews)s) AS i;
+            """,
+            {"groups": GROUPS, "reviews": REVIEWS},
+        )
+        names = [f"Group {i}" for i in range(1, CARDS + 1)]
+        with app.app_context():
+            # The reviews were bulk-loaded around the model, so build their stats rows
+            Review.reconcile_stats()
+            expected = average_per_group(names)
+            ratings = Review.get_ratings(names)
+            assert all(abs(float(expected[n]) - ratings[n]["average"]) < 1e-9 for n in names)
+
+            per_group = measure(lambda: average_per_group(names), repeat=10, warmup=1)
+
+            def bulk():
+                review_ratings.invalidate()
+                return Review.get_ratings(names)
+
+            stats = measure(bulk)
+            cached = measure(lambda: Review.get_ratings(names))
+            today = datetime.date.today()
+            create = measure(lambda: Review.create(1, "Group 1", "Bench", 4, today))
+        report(f"Ratings for {CARDS} group cards, {REVIEWS:,} reviews over {GROUPS:,} groups", [
+            {"method": "AVG per group", **per_group},
+            {"method": "review_stats, one query", **stats},
+            {"method": "review_stats, cached", **cached},
+            {"method": "Review.create (with stats upsert)", **create},
+        ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Time to promote from a 10k-long waitlist as the number of freed seats grows.
+
+    BENCH_DATABASE_URL=postgresql://localhost/scratch python -m benchmarks.waitlist_promotion
+"""
+import time
+
+from app.models.events import Event
+from benchmarks.common import execute, report, scratch_app
+
+WAITLIST = 10_000
+FREED_SEATS = (1, 10, 100, 1000, 10_000)
+
+
+def make_full_event(conn, capacity):
+    """An event with ``capacity`` registrations and WAITLIST users queued behind them."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO event (activity_group_name, date, max_participants, registered_count, waitlist_count)
+        VALUES ('Bench Group', CURRENT_DATE + 30, %s, %s, %s) RETURNING id
+        """,
+        (capacity, capacity, WAITLIST),
+    )
+    event_id = cur.fetchone()["id"]
+    conn.commit()
+    execute(
+        conn,
+        """
+        INSERT INTO registrations (event_id, user_id, status)
+        SELECT %(event_id)s, resident_id, 'registered'
+        FROM resident ORDER BY resident_id LIMIT %(capacity)s;
+
+        INSERT INTO waitlist (event_id, user_id, created_at)
+        SELECT %(event_id)s, resident_id, NOW() + resident_id * INTERVAL '1 millisecond'
+        FROM resident ORDER BY resident_id OFFSET %(capacity)s LIMIT %(waitlist)s;
+        """,
+        {"event_id": event_id, "capacity": capacity, "waitlist": WAITLIST},
+    )
+    return event_id
+
+
+def main():
+    with scratch_app() as (app, conn):
+        execute(
+            conn,
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'bench' || i, NULL, 'x', 'user' FROM generate_series(1, %s) AS i;
+
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Bench Group', 'Bench', 'Benchmark events', 'bench@example.com', 'weekly');
+            """,
+            (WAITLIST + 100,),
+        )
+        rows = []
+        for freed in FREED_SEATS:
+            event_id = make_full_event(conn, 100)
+            with app.app_context():
+                started = time.perf_counter()
+                Event.update(event_id, max_participants=100 + freed)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            rows.append({"waitlist": WAITLIST, "freed_seats": freed, "ms": elapsed_ms})
+        report("Capacity increase -> waitlist promotion (one transaction)", rows)
+
+
+if __name__ == "__main__":
+    main()
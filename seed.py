@@ -1,60 +1,36 @@
-import os
-import sqlite3
+"""Load demo data into a database that `flask db upgrade` has already migrated.
+
+Safe to run more than once: existing rows are updated or left alone.
+"""
 import logging
-from flask_bcrypt import Bcrypt
-from datetime import datetime
+
+from app import create_app
+from app.services.passwords import hash_password, password_hasher
+from app.services.review_stats import apply_review_delta
+from app.utils.database import get_db
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
-DB_PATH = os.path.join(os.path.dirname(__file__), "instance", "activity.sqlite")
-SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "app", "utils", "schema.sql")
-bcrypt = Bcrypt()
-
-def init_db():
-    """Initialize the database schema"""
-    # Ensure instance directory exists
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    
-    with open(SCHEMA_PATH, 'r') as f:
-        schema = f.read()
-    
-    conn = sqlite3.connect(DB_PATH)
-    conn.executescript(schema)
-    conn.commit()
-    log.info("Database schema initialized")
 
-def create_or_update_user(username, email, password, role):
+def create_or_update_user(cursor, username, email, password, role):
     """Create a new user or update an existing one"""
-    password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
-    log.debug(f"Using hashed password for {username}: {password_hash}")
-    
-    # Check if user exists
-    c.execute("SELECT resident_id FROM resident WHERE email = ?", (email,))
-    existing_user = c.fetchone()
-    
-    if existing_user:
-        # Update existing user
-        c.execute(
-            """
-            UPDATE resident 
-            SET username = ?, password_hash = ?, role = ?
-            WHERE email = ?
-            """,
-            (username, password_hash, role, email)
-        )
-    else:
-        # Create new user
-        c.execute(
-            """
-            INSERT INTO resident (username, email, password_hash, role)
-            VALUES (?, ?, ?, ?)
-            """,
-            (username, email, password_hash, role)
-        )
+    password_hash = hash_password(password, password_hasher.rounds)
+    cursor.execute(
+        """
+        INSERT INTO resident (username, email, password_hash, role)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (username) DO UPDATE
+            SET email = EXCLUDED.email,
+                password_hash = EXCLUDED.password_hash,
+                role = EXCLUDED.role,
+                is_deleted = FALSE
+        """,
+        (username, email, password_hash, role)
+    )
 
-def create_test_activity_groups():
+def create_test_activity_groups(cursor):
     """Create test activity groups"""
     test_groups = [
         {
@@ -156,25 +132,35 @@ def create_test_activity_groups():
     ]
     
     for group in test_groups:
-        c.execute(
+        cursor.execute(
             """
-            INSERT OR REPLACE INTO activity_group 
-            (name, category, description, founding_date, website, email, phone_number, 
-             social_media_links, is_active, total_members, event_frequency, 
+            INSERT INTO activity_group
+            (name, category, description, founding_date, website, email, phone_number,
+             social_media_links, is_active, total_members, event_frequency,
              membership_fee, open_to_public, min_age)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (%(name)s, %(category)s, %(description)s, %(founding_date)s, %(website)s,
+                    %(email)s, %(phone_number)s, %(social_media_links)s, %(is_active)s,
+                    %(total_members)s, %(event_frequency)s, %(membership_fee)s,
+                    %(open_to_public)s, %(min_age)s)
+            ON CONFLICT (name) DO UPDATE
+                SET category = EXCLUDED.category,
+                    description = EXCLUDED.description,
+                    founding_date = EXCLUDED.founding_date,
+                    website = EXCLUDED.website,
+                    email = EXCLUDED.email,
+                    phone_number = EXCLUDED.phone_number,
+                    social_media_links = EXCLUDED.social_media_links,
+                    is_active = EXCLUDED.is_active,
+                    total_members = EXCLUDED.total_members,
+                    event_frequency = EXCLUDED.event_frequency,
+                    membership_fee = EXCLUDED.membership_fee,
+                    open_to_public = EXCLUDED.open_to_public,
+                    min_age = EXCLUDED.min_age
             """,
-            (
-                group['name'], group['category'], group['description'],
-                group['founding_date'], group['website'], group['email'],
-                group['phone_number'], group['social_media_links'],
-                group['is_active'], group['total_members'],
-                group['event_frequency'], group['membership_fee'],
-                group['open_to_public'], group['min_age']
-            )
+            group
         )
 
-def create_test_locations():
+def create_test_locations(cursor):
     """Create test locations"""
     boston_college_locations = [
         ("123 Main St", "Boston", "MA", "02118"),
@@ -200,105 +186,136 @@ def create_test_locations():
     ]
     
     for address, city, state, zip_code in boston_college_locations:
-        c.execute(
+        cursor.execute(
             """
-            INSERT OR IGNORE INTO location (address, city, state, zip_code)
-            VALUES (?, ?, ?, ?)
+            INSERT INTO location (address, city, state, zip_code)
+            SELECT %(address)s, %(city)s, %(state)s, %(zip_code)s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM location WHERE address = %(address)s AND city = %(city)s
+            )
             """,
-            (address, city, state, zip_code)
+            {'address': address, 'city': city, 'state': state, 'zip_code': zip_code}
         )
 
-def create_test_events():
+def create_test_events(cursor):
     """Create test events"""
     events = [
-        ('Kpop Dance', '2025-06-01', 1, 50, 0, 1, '2025-05-25'),
-        ('Boston Book Club', '2025-07-15', 2, 30, 10, 1, '2025-07-10'),
-        ('Boston Runners', '2025-08-20', 3, 100, 0, 1, '2025-08-15')
+        ('Kpop Dance', '2025-06-01', '123 Main St', 50, 0, True, '2025-05-25'),
+        ('Boston Book Club', '2025-07-15', 'Gasson Hall', 30, 10, True, '2025-07-10'),
+        ('Boston Runners', '2025-08-20', 'Devlin Hall', 100, 0, True, '2025-08-15')
     ]
-    
-    for activity_group, date, location_id, max_participants, cost, reg_required, reg_deadline in events:
-        c.execute(
+
+    for activity_group, date, address, max_participants, cost, reg_required, reg_deadline in events:
+        cursor.execute(
             """
-            INSERT OR IGNORE INTO event 
-            (activity_group_name, date, location_id, max_participants, cost, 
+            INSERT INTO event
+            (activity_group_name, date, location_id, max_participants, cost,
              registration_required, registration_deadline)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            SELECT %(group)s, %(date)s, (SELECT MIN(id) FROM location WHERE address = %(address)s),
+                   %(max_participants)s, %(cost)s, %(reg_required)s, %(reg_deadline)s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM event WHERE activity_group_name = %(group)s AND date = %(date)s
+            )
             """,
-            (activity_group, date, location_id, max_participants, cost, reg_required, reg_deadline)
+            {
+                'group': activity_group, 'date': date, 'address': address,
+                'max_participants': max_participants, 'cost': cost,
+                'reg_required': reg_required, 'reg_deadline': reg_deadline,
+            }
         )
 
-def create_test_prerequisites():
+def create_test_prerequisites(cursor):
     """Create test prerequisites"""
+    # (event, prerequisite event, minimum performance, qualification period, waiver allowed),
+    # with events named by their activity group
     prerequisites = [
-        (2, 1, 80, 30, 1),
-        (3, 2, 90, 60, 0)
+        ('Boston Book Club', 'Kpop Dance', 80, 30, True),
+        ('Boston Runners', 'Boston Book Club', 90, 60, False)
     ]
-    
-    for event_id, prereq_id, min_perf, qual_period, waiver in prerequisites:
-        c.execute(
+
+    for event_group, prereq_group, min_perf, qual_period, waiver in prerequisites:
+        cursor.execute(
             """
-            INSERT OR IGNORE INTO prerequisite 
-            (event_id, prerequisite_event_id, minimum_performance, 
+            INSERT INTO prerequisite
+            (event_id, prerequisite_event_id, minimum_performance,
              qualification_period, is_waiver_allowed)
-            VALUES (?, ?, ?, ?, ?)
+            SELECT e.id, p.id, %s, %s, %s
+            FROM (SELECT MIN(id) AS id FROM event WHERE activity_group_name = %s) e,
+                 (SELECT MIN(id) AS id FROM event WHERE activity_group_name = %s) p
+            WHERE NOT EXISTS (
+                SELECT 1 FROM prerequisite
+                WHERE event_id = e.id AND prerequisite_event_id = p.id
+            )
             """,
-            (event_id, prereq_id, min_perf, qual_period, waiver)
+            (min_perf, qual_period, waiver, event_group, prereq_group)
         )
 
-def create_test_reviews():
+def create_test_reviews(cursor):
     """Create test reviews"""
     reviews = [
-        (1, 'Kpop Dance', 'Great dance class! The instructor was amazing.', 5, '2024-03-15', 1),
-        (1, 'Boston Book Club', 'Interesting discussion about the latest book.', 4, '2024-03-14', 1),
-        (2, 'Boston Runners', 'Perfect running route and great company!', 5, '2024-03-13', 1),
-        (2, 'Boston Chess Masters', 'Challenging games and friendly atmosphere.', 4, '2024-03-12', 1),
-        (3, 'Boston Foodies', 'Delicious food and great recommendations.', 5, '2024-03-11', 1),
-        (3, 'Boston Coders', 'Very informative coding workshop.', 4, '2024-03-10', 1)
+        ('admin', 'Kpop Dance', 'Great dance class! The instructor was amazing.', 5, '2024-03-15', True),
+        ('admin', 'Boston Book Club', 'Interesting discussion about the latest book.', 4, '2024-03-14', True),
+        ('testuser', 'Boston Runners', 'Perfect running route and great company!', 5, '2024-03-13', True),
+        ('testuser', 'Boston Chess Masters', 'Challenging games and friendly atmosphere.', 4, '2024-03-12', True),
+        ('testuser2', 'Boston Foodies', 'Delicious food and great recommendations.', 5, '2024-03-11', True),
+        ('testuser2', 'Boston Coders', 'Very informative coding workshop.', 4, '2024-03-10', True)
     ]
-    
-    for resident_id, activity_group_name, content, star_rating, review_date, is_verified in reviews:
-        c.execute(
+
+    for username, activity_group_name, content, star_rating, review_date, is_verified in reviews:
+        cursor.execute(
             """
-            INSERT OR IGNORE INTO review 
+            INSERT INTO review
             (resident_id, activity_group_name, content, star_rating, review_date, is_verified)
-            VALUES (?, ?, ?, ?, ?, ?)
+            SELECT r.resident_id, %(group)s, %(content)s, %(rating)s, %(date)s, %(verified)s
+            FROM resident r
+            WHERE r.username = %(username)s
+              AND NOT EXISTS (
+                  SELECT 1 FROM review
+                  WHERE resident_id = r.resident_id AND activity_group_name = %(group)s
+              )
+            RETURNING review_id
             """,
-            (resident_id, activity_group_name, content, star_rating, review_date, is_verified)
+            {
+                'username': username, 'group': activity_group_name, 'content': content,
+                'rating': star_rating, 'date': review_date, 'verified': is_verified,
+            }
         )
+        # Keep the ratings summary in step, as Review.create does
+        if cursor.fetchone():
+            apply_review_delta(cursor, activity_group_name, star_rating, 1)
 
 if __name__ == '__main__':
-    # Initialize database
-    init_db()
-    
-    # Connect to database
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    try:
-        # Create test users
-        create_or_update_user('admin', 'admin@example.com', 'admin123', 'admin')
-        create_or_update_user('testuser', 'user@example.com', 'user123', 'user')
-        create_or_update_user('testuser2', 'user2@example.com', 'user123', 'user')
-        create_or_update_user('testuser3', 'user3@example.com', 'user123', 'user')
-        
-        # Create test data
-        create_test_activity_groups()
-        create_test_locations()
-        create_test_events()
-        create_test_prerequisites()
-        create_test_reviews()
-        
-        # Commit changes
-        conn.commit()
-        print("Test data created successfully!")
-        print("\nTest accounts created:")
-        print("Admin - Username: admin, Password: admin123")
-        print("User - Username: testuser, Password: user123")
-        print("User - Username: testuser2, Password: user123")
-        print("User - Username: testuser3, Password: user123")
-        
-    except Exception as e:
-        print(f"Error creating test data: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
+    app = create_app()
+
+    with app.app_context():
+        db = get_db()
+        c = db.cursor()
+
+        try:
+            # Create test users
+            create_or_update_user(c, 'admin', 'admin@example.com', 'admin123', 'admin')
+            create_or_update_user(c, 'testuser', 'user@example.com', 'user123', 'user')
+            create_or_update_user(c, 'testuser2', 'user2@example.com', 'user123', 'user')
+            create_or_update_user(c, 'testuser3', 'user3@example.com', 'user123', 'user')
+
+            # Create test data
+            create_test_activity_groups(c)
+            create_test_locations(c)
+            create_test_events(c)
+            create_test_prerequisites(c)
+            create_test_reviews(c)
+
+            # Commit changes
+            db.commit()
+            print("Test data created successfully!")
+            print("\nTest accounts created:")
+            print("Admin - Username: admin, Password: admin123")
+            print("User - Username: testuser, Password: user123")
+            print("User - Username: testuser2, Password: user123")
+            print("User - Username: testuser3, Password: user123")
+
+        except Exception as e:
+            print(f"Error creating test data: {e}")
+            db.rollback()
+        finally:
+            c.close()
@@ -82,12 +82,3 @@ def login_user(client, mock_user):
         with patch("flask_login.utils._get_user", return_value=mock_user):
             client.post("/login", data={"username": "testuser", "password": "password"})
             yield mock_user
-
-
-@pytest.fixture
-def mock_bcrypt():
-    """Mock the bcrypt password hashing functionality."""
-    with patch("app.models.user.bcrypt") as mock:
-        mock.check_password_hash.return_value = True
-        mock.generate_password_hash.return_value = "hashed_password"
-        yield mock
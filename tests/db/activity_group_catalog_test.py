@@ -0,0 +1,120 @@
+import datetime
+import time
+
+from app.models.reviews import Review
+from app.services.activity_group_catalog import ActivityGroupCatalog
+from app.utils import database
+
+
+def _add_group(pg, name, category):
+    cur = pg.cursor()
+    cur.execute(
+        """
+        INSERT INTO activity_group (name, category, description, website, email,
+                                    phone_number, social_media_links, event_frequency)
+        VALUES (%s, %s, 'desc', '', 'x@y.com', '', '{}', 'weekly')
+        """,
+        (name, category),
+    )
+    pg.commit()
+    cur.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_reads_between_writes_do_not_touch_the_database(pg, pg_app):
+    _add_group(pg, "Catalog Kayaking", "Sports")
+    catalog = ActivityGroupCatalog()
+    try:
+        with pg_app.app_context():
+            assert "Catalog Kayaking" in [g.name for g in catalog.groups()]
+        assert catalog.listening and catalog.reloads == 1
+
+        checkouts = database.pool_stats()["checkouts"]
+        for _ in range(5):
+            with pg_app.app_context():
+                catalog.groups()
+                assert [g.name for g in catalog.search("kayak")] == ["Catalog Kayaking"]
+        assert database.pool_stats()["checkouts"] == checkouts
+        assert catalog.reloads == 1
+    finally:
+        catalog.close()
+
+
+def test_writes_from_other_connections_are_announced(pg, pg_app):
+    catalog = ActivityGroupCatalog()
+    try:
+        with pg_app.app_context():
+            catalog.groups()
+        version = catalog.version
+
+        # pg stands in for another worker writing the table
+        _add_group(pg, "Catalog Curling", "Sports")
+
+        def seen():
+            with pg_app.app_context():
+                return "Catalog Curling" in [g.name for g in catalog.search("curl")]
+
+        _wait_for(seen)
+        assert catalog.version > version
+    finally:
+        catalog.close()
+
+
+def test_without_a_listener_reads_poll_the_version(pg, pg_app, monkeypatch):
+    monkeypatch.setattr(database, "dedicated_connection", lambda: 1 / 0)
+    catalog = ActivityGroupCatalog(poll_interval=0)
+    try:
+        with pg_app.app_context():
+            catalog.groups()
+            assert not catalog.listening
+            catalog.groups()
+            assert catalog.reloads == 1
+
+            _add_group(pg, "Catalog Fencing", "Sports")
+            assert "Catalog Fencing" in [g.name for g in catalog.groups()]
+            assert catalog.reloads == 2
+    finally:
+        catalog.close()
+
+
+def test_ratings_are_part_of_the_snapshot(pg, pg_app):
+    _add_group(pg, "Catalog Climbing", "Sports")
+    cur = pg.cursor()
+    cur.execute(
+        """
+        INSERT INTO resident (username, password_hash, role)
+        VALUES ('catalog_reviewer', 'x', 'user') RETURNING resident_id
+        """
+    )
+    resident = cur.fetchone()["resident_id"]
+    pg.commit()
+    cur.close()
+    catalog = ActivityGroupCatalog()
+    try:
+        with pg_app.app_context():
+            assert catalog.ratings(["Catalog Climbing"])["Catalog Climbing"]["count"] == 0
+        version = catalog.version
+
+        checkouts = database.pool_stats()["checkouts"]
+        with pg_app.app_context():
+            catalog.groups()
+            catalog.ratings(["Catalog Climbing"])
+        assert database.pool_stats()["checkouts"] == checkouts
+
+        with pg_app.app_context():
+            Review.create(resident, "Catalog Climbing", "Good", 4, datetime.date.today())
+
+        def rated():
+            with pg_app.app_context():
+                return catalog.ratings(["Catalog Climbing"])["Catalog Climbing"]["count"] == 1
+
+        _wait_for(rated)
+        assert catalog.version > version
+    finally:
+        catalog.close()
@@ -0,0 +1,195 @@
+"""Fixtures for tests that need a real PostgreSQL server.
+
+These tests are skipped unless TEST_DATABASE_URL points at a scratch database.
+Each test session migrates a private schema and drops it afterwards.
+"""
+import os
+
+import psycopg2
+import pytest
+from flask import Flask
+from psycopg2.extras import RealDictCursor
+
+from app.utils import database
+from app.utils.migrations import upgrade
+from app.utils.pool import ConnectionPool
+
+SCHEMA = f"test_{os.getpid()}"
+
+SEED_SQL = """
+INSERT INTO resident (username, email, password_hash, role)
+SELECT 'user' || i, 'user' || i || '@example.com', 'x', 'user'
+FROM generate_series(1, 20000) AS i;
+
+INSERT INTO activity_group (name, category, description, email, event_frequency)
+SELECT 'Group ' || i, 'Category ' || (i % 20), 'Description ' || i, 'group@example.com', 'weekly'
+FROM generate_series(1, 500) AS i;
+
+INSERT INTO event (activity_group_name, date, max_participants, created_by)
+SELECT 'Group ' || (1 + i % 500), CURRENT_DATE + (i % 730 - 365), 50, 1 + i % 50
+FROM generate_series(1, 20000) AS i;
+
+INSERT INTO registrations (event_id, user_id, status)
+SELECT 1 + i % 20000,
+       1 + ((i % 20000) * 13 + (i / 20000) * 1999) % 20000,
+       CASE i % 10 WHEN 0 THEN 'cancelled' WHEN 1 THEN 'completed' ELSE 'registered' END
+FROM generate_series(0, 199999) AS i
+ON CONFLICT DO NOTHING;
+
+INSERT INTO waitlist (event_id, user_id, created_at)
+SELECT 1 + i % 20000,
+       1 + ((i % 20000) * 17 + (i / 20000) * 3001 + 11) % 20000,
+       NOW() - i * INTERVAL '1 second'
+FROM generate_series(0, 99999) AS i
+ON CONFLICT DO NOTHING;
+
+INSERT INTO review (resident_id, activity_group_name, content, star_rating, review_date)
+SELECT 1 + i % 20000, 'Group ' || (1 + i % 500), 'Review ' || i, 1 + i % 5, CURRENT_DATE - i % 1000
+FROM generate_series(0, 99999) AS i;
+
+INSERT INTO prerequisite (event_id, prerequisite_event_id, minimum_performance, qualification_period)
+SELECT i, i + 1, 1, 365
+FROM generate_series(1, 10000) AS i;
+
+INSERT INTO session (activity_group_name, event_id, date, attendance)
+SELECT 'Group ' || (1 + i % 500), 1 + i % 20000, CURRENT_DATE - i % 365, i % 40
+FROM generate_series(0, 39999) AS i;
+
+UPDATE event e
+SET registered_count = (
+        SELECT COUNT(*) FROM registrations r WHERE r.event_id = e.id AND r.status = 'registered'
+    ),
+    waitlist_count = (SELECT COUNT(*) FROM waitlist w WHERE w.event_id = e.id);
+
+INSERT INTO review_stats
+SELECT activity_group_name, COUNT(*), SUM(star_rating),
+       COUNT(*) FILTER (WHERE star_rating = 1), COUNT(*) FILTER (WHERE star_rating = 2),
+       COUNT(*) FILTER (WHERE star_rating = 3), COUNT(*) FILTER (WHERE star_rating = 4),
+       COUNT(*) FILTER (WHERE star_rating = 5)
+FROM review
+GROUP BY activity_group_name
+ON CONFLICT DO NOTHING;
+"""
+
+
+@pytest.fixture(scope="session")
+def pg():
+    """A migrated, empty schema on the TEST_DATABASE_URL server."""
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    conn = psycopg2.connect(url, cursor_factory=RealDictCursor)
+    cur = conn.cursor()
+    cur.execute(f"CREATE SCHEMA {SCHEMA}")
+    cur.execute(f"SET search_path TO {SCHEMA}, public")
+    conn.commit()
+    upgrade(conn)
+
+    yield conn
+
+    conn.rollback()
+    cur.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    conn.commit()
+    cur.close()
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def seeded_pg(pg):
+    """``pg`` filled with production-like volumes and fresh planner statistics."""
+    cur = pg.cursor()
+    cur.execute(SEED_SQL)
+    pg.commit()
+    pg.autocommit = True
+    # VACUUM also flushes GIN pending lists, as autovacuum would in production
+    cur.execute("VACUUM ANALYZE")
+    pg.autocommit = False
+    cur.close()
+    return pg
+
+
+@pytest.fixture(scope="session")
+def pg_app(pg):
+    """A bare Flask app whose get_db connections come from a pool on the test schema."""
+    previous_url = os.environ.get("DATABASE_URL")
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+
+    @database.on_connect
+    def _use_test_schema(conn):
+        cur = conn.cursor()
+        cur.execute(f"SET search_path TO {SCHEMA}, public")
+        cur.close()
+
+    database._pool = ConnectionPool(database._connect, min_size=0, max_size=64, timeout=30)
+    app = Flask(__name__)
+    app.teardown_appcontext(database.close_db)
+
+    yield app
+
+    database._pool.closeall()
+    database._pool = None
+    database._connect_hooks.remove(_use_test_schema)
+    if previous_url is None:
+        os.environ.pop("DATABASE_URL", None)
+    else:
+        os.environ["DATABASE_URL"] = previous_url
+
+
+@pytest.fixture
+def make_event(pg):
+    """Factory creating an event with ``capacity`` seats and ``residents`` fresh users."""
+
+    def make(capacity, residents):
+        cur = pg.cursor()
+        cur.execute(
+            """
+            INSERT INTO activity_group (name, category, description, email, event_frequency)
+            VALUES ('Test Group', 'Test', 'Events created by tests', 'test@example.com', 'weekly')
+            ON CONFLICT (name) DO NOTHING
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO event (activity_group_name, date, max_participants)
+            VALUES ('Test Group', CURRENT_DATE + 7, %s) RETURNING id
+            """,
+            (capacity,),
+        )
+        event_id = cur.fetchone()["id"]
+        cur.execute(
+            """
+            INSERT INTO resident (username, email, password_hash, role)
+            SELECT 'resident_' || %s || '_' || i, NULL, 'x', 'user'
+            FROM generate_series(1, %s) AS i
+            ORDER BY i
+            RETURNING resident_id
+            """,
+            (event_id, residents),
+        )
+        user_ids = sorted(row["resident_id"] for row in cur.fetchall())
+        pg.commit()
+        cur.close()
+        return event_id, user_ids
+
+    return make
+
+
+def fetch_one(pg, sql, params=()):
+    """Run a read-only query on the test connection and return the first row."""
+    cur = pg.cursor()
+    cur.execute(sql, params)
+    row = cur.fetchone()
+    pg.commit()
+    cur.close()
+    return row
+
+
+def walk_pages(fetch):
+    """Every page from ``fetch(after) -> (rows, next token)``, starting at the first."""
+    pages, after = [], None
+    while True:
+        rows, after = fetch(after)
+        pages.append(rows)
+        if after is None:
+            return pages
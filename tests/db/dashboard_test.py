@@ -0,0 +1,34 @@
+import pytest
+
+from app.models.events import Event
+from tests.db.conftest import walk_pages
+
+
+def test_organizer_pages_cover_their_events_only(pg, pg_app, make_event):
+    _, (organizer,) = make_event(10, 1)
+    mine = [make_event(10, 0)[0] for _ in range(5)]
+    cur = pg.cursor()
+    cur.execute("UPDATE event SET created_by = %s WHERE id = ANY(%s)", (organizer, mine))
+    pg.commit()
+    cur.close()
+
+    with pg_app.app_context():
+        pages = walk_pages(lambda after: Event.get_created_by(organizer, after=after, per_page=2))
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sorted(event["id"] for page in pages for event in page) == mine
+
+
+def test_registrant_pages_follow_sign_up_order(pg, pg_app, make_event):
+    event_id, user_ids = make_event(3, 5)
+
+    with pg_app.app_context():
+        for user_id in user_ids:
+            Event.register_user(event_id, user_id)
+
+        registered = walk_pages(lambda after: Event.get_registrants(event_id, "registered", after, per_page=2))
+        waitlisted = walk_pages(lambda after: Event.get_registrants(event_id, "waitlisted", after, per_page=1))
+        assert [u["resident_id"] for page in registered for u in page] == user_ids[:3]
+        assert [u["resident_id"] for page in waitlisted for u in page] == user_ids[3:]
+
+        with pytest.raises(ValueError):
+            Event.get_registrants(event_id, "registered", after="garbage")
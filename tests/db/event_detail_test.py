@@ -0,0 +1,64 @@
+from app.models.events import Event
+from app.utils import database
+from app.utils.maps_manager import MapsManager
+
+
+def test_detail_matches_the_separate_lookups(pg, pg_app, make_event):
+    event_id, user_ids = make_event(1, 3)
+    first, _ = make_event(10, 0)
+    second, _ = make_event(10, 0)
+    cur = pg.cursor()
+    cur.execute(
+        """
+        INSERT INTO prerequisite (event_id, prerequisite_event_id, minimum_performance, qualification_period)
+        VALUES (%s, %s, 3, 30), (%s, %s, 1, 365)
+        """,
+        (event_id, first, event_id, second),
+    )
+    pg.commit()
+    cur.close()
+
+    with pg_app.app_context():
+        MapsManager().set_event_map(event_id, '<iframe src="https://maps.example.com/e"></iframe>')
+        Event.register_user(event_id, user_ids[0])
+        Event.register_user(event_id, user_ids[1])
+
+        anonymous = Event.get_detail(event_id)
+        registered = Event.get_detail(event_id, user_ids[0])
+        waitlisted = Event.get_detail(event_id, user_ids[1])
+        stranger = Event.get_detail(event_id, user_ids[2])
+        assert Event.get_detail(-1) is None
+        event = Event.get(event_id)
+
+    assert {key: anonymous[key] for key in event if not key.startswith("search_")} == {
+        key: value for key, value in event.items() if not key.startswith("search_")
+    }
+    assert anonymous["maps_embed"] == "https://maps.example.com/e"
+    assert (anonymous["is_registered"], anonymous["is_waitlisted"]) == (False, False)
+    assert (registered["is_registered"], registered["is_waitlisted"]) == (True, False)
+    assert (waitlisted["is_registered"], waitlisted["is_waitlisted"]) == (False, True)
+    assert (stranger["is_registered"], stranger["is_waitlisted"]) == (False, False)
+    assert [(p["prerequisite_event_id"], p["minimum_performance"]) for p in anonymous["prerequisites"]] == [
+        (first, 3), (second, 1)
+    ]
+    assert anonymous["prerequisites"][0]["activity_group_name"] == "Test Group"
+
+
+def test_detail_survives_a_new_event_column(pg, pg_app, make_event):
+    event_id, _ = make_event(1, 0)
+    cur = pg.cursor()
+    try:
+        with pg_app.app_context():
+            assert Event.get_detail(event_id)["id"] == event_id
+            database.get_db().commit()
+
+            cur.execute("ALTER TABLE event ADD COLUMN detail_probe integer")
+            pg.commit()
+
+            # Same pooled connection, so EXECUTE reuses the statement prepared above
+            assert Event.get_detail(event_id)["id"] == event_id
+    finally:
+        pg.rollback()
+        cur.execute("ALTER TABLE event DROP COLUMN IF EXISTS detail_probe")
+        pg.commit()
+        cur.close()
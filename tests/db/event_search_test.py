@@ -0,0 +1,61 @@
+from app.models.events import Event
+
+
+def _location(pg, address, city):
+    cur = pg.cursor()
+    cur.execute(
+        """
+        INSERT INTO location (address, city, state, zip_code)
+        VALUES (%s, %s, 'MA', '02118') RETURNING id
+        """,
+        (address, city),
+    )
+    location_id = cur.fetchone()["id"]
+    pg.commit()
+    cur.close()
+    return location_id
+
+
+def _set(pg, event_id, name, location_id=None):
+    cur = pg.cursor()
+    cur.execute(
+        "UPDATE event SET name = %s, location_id = %s WHERE id = %s",
+        (name, location_id, event_id),
+    )
+    pg.commit()
+    cur.close()
+
+
+def test_search_matches_prefixes_and_ranks_name_hits_first(pg, pg_app, make_event):
+    harbor = _location(pg, "1 Quokkaside Pier", "Boston")
+    by_name, _ = make_event(10, 0)
+    by_address, _ = make_event(10, 0)
+    unrelated, _ = make_event(10, 0)
+    _set(pg, by_name, "Quokkaside Rowing", None)
+    _set(pg, by_address, "Evening Yoga", harbor)
+    _set(pg, unrelated, "Chess Night", None)
+
+    with pg_app.app_context():
+        assert [e["id"] for e in Event.search("quokka")] == [by_name, by_address]
+        assert [e["id"] for e in Event.search("quokkaside yog")] == [by_address]
+        assert [e["id"] for e in Event.get_all(search_query="Quokka", exclude_event_id=by_name)] == [
+            by_address
+        ]
+        # Query syntax is treated as plain words
+        assert Event.search("quokka:* | !") == Event.search("quokka")
+        assert Event.search("&&") == []
+
+
+def test_location_edits_reindex_their_events(pg, pg_app, make_event):
+    venue = _location(pg, "5 Main St", "Wallabyville")
+    event_id, _ = make_event(10, 0)
+    _set(pg, event_id, "Book Club", venue)
+
+    cur = pg.cursor()
+    cur.execute("UPDATE location SET city = 'Numbatford' WHERE id = %s", (venue,))
+    pg.commit()
+    cur.close()
+
+    with pg_app.app_context():
+        assert Event.search("wallabyville") == []
+        assert [e["id"] for e in Event.search_events("book", None, "numbat")] == [event_id]
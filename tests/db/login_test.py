@@ -0,0 +1,27 @@
+from app.models.users import User
+from app.services.passwords import hash_password, hash_rounds, password_hasher
+from tests.db.conftest import fetch_one
+
+
+def test_login_upgrades_hashes_made_with_another_work_factor(pg, pg_app, make_event, monkeypatch):
+    _, (user_id,) = make_event(10, 1)
+    cur = pg.cursor()
+    cur.execute(
+        "UPDATE resident SET password_hash = %s WHERE resident_id = %s RETURNING username",
+        (hash_password("s3cret", 4), user_id),
+    )
+    username = cur.fetchone()["username"]
+    pg.commit()
+    cur.close()
+    monkeypatch.setattr(password_hasher, "workers", 0)
+    monkeypatch.setattr(password_hasher, "rounds", 5)
+
+    with pg_app.app_context():
+        assert User.validate(username, "wrong") is None
+        stored = fetch_one(pg, "SELECT password_hash FROM resident WHERE resident_id = %s", (user_id,))
+        assert hash_rounds(stored["password_hash"]) == 4
+
+        assert User.validate(username, "s3cret").id == user_id
+        stored = fetch_one(pg, "SELECT password_hash FROM resident WHERE resident_id = %s", (user_id,))
+        assert hash_rounds(stored["password_hash"]) == 5
+        assert User.validate(username, "s3cret").id == user_id
@@ -0,0 +1,233 @@
+import socketserver
+import threading
+
+import pytest
+
+from app.models.events import Event, waitlist_promoted
+from app.utils.email import OutboxWorker, enqueue_email, enqueue_emails
+from tests.db.conftest import fetch_one
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: records messages, refuses *@bounce.test."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost stand-in")
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode().rstrip("\r\n")
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif command == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                if "@bounce.test" in line:
+                    self.reply("550 No such user")
+                else:
+                    recipients.append(line.split(":", 1)[1].strip("<> "))
+                    self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (chunk := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(chunk)
+                self.server.messages.append((recipients, b"".join(data).decode()))
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.messages = []
+    server.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def outbox(pg):
+    cur = pg.cursor()
+    cur.execute("DELETE FROM notification_outbox")
+    pg.commit()
+    cur.close()
+
+
+def _worker(smtp_server, **kwargs):
+    config = {
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_PORT": smtp_server.server_address[1],
+        "MAIL_USE_TLS": False,
+        "MAIL_DEFAULT_SENDER": "events@localhost",
+    }
+    return OutboxWorker(config, **kwargs)
+
+
+def test_worker_delivers_batches_over_one_connection(pg_app, outbox, smtp_server):
+    with pg_app.app_context():
+        enqueue_emails((f"user{i}@example.com", f"Hello {i}", "Body") for i in range(25))
+
+    worker = _worker(smtp_server, batch_size=10)
+    with pg_app.app_context():
+        results = [worker.run_once() for _ in range(4)]
+    worker.close()
+
+    assert results == [(10, 0), (10, 0), (5, 0), (0, 0)]
+    assert smtp_server.connections == 1
+    assert sorted(r[0] for r, _ in smtp_server.messages) == sorted(
+        f"user{i}@example.com" for i in range(25)
+    )
+
+
+def test_failed_delivery_is_retried_with_backoff_then_given_up(pg, pg_app, outbox, smtp_server):
+    with pg_app.app_context():
+        enqueue_email("nobody@bounce.test", "Hi", "Body")
+        enqueue_email("ok@example.com", "Hi", "Body")
+
+    worker = _worker(smtp_server, max_attempts=2, backoff=60)
+    with pg_app.app_context():
+        assert worker.run_once() == (1, 1)
+        # Not due again until the backoff has passed
+        assert worker.run_once() == (0, 0)
+
+    row = fetch_one(
+        pg,
+        """
+        SELECT status, attempts, last_error, next_attempt_at > NOW() + INTERVAL '50 seconds' AS delayed
+        FROM notification_outbox WHERE recipient = 'nobody@bounce.test'
+        """,
+    )
+    assert (row["status"], row["attempts"], row["delayed"]) == ("pending", 1, True)
+    assert "No such user" in row["last_error"]
+
+    cur = pg.cursor()
+    cur.execute("UPDATE notification_outbox SET next_attempt_at = NOW() WHERE status = 'pending'")
+    pg.commit()
+    cur.close()
+    with pg_app.app_context():
+        assert worker.run_once() == (0, 1)
+    worker.close()
+
+    assert fetch_one(
+        pg, "SELECT status FROM notification_outbox WHERE recipient = 'nobody@bounce.test'"
+    ) == {"status": "failed"}
+    assert fetch_one(
+        pg, "SELECT status FROM notification_outbox WHERE recipient = 'ok@example.com'"
+    ) == {"status": "sent"}
+
+
+def test_promotion_enqueues_mail_only_when_committed(pg, pg_app, outbox, make_event):
+    event_id, user_ids = make_event(1, 3)
+    cur = pg.cursor()
+    cur.execute(
+        "UPDATE resident SET email = username || '@example.com' WHERE resident_id = ANY(%s)",
+        (user_ids,),
+    )
+    pg.commit()
+    cur.close()
+
+    with pg_app.app_context():
+        for user_id in user_ids:
+            Event.register_user(event_id, user_id)
+        Event.cancel_registration(event_id, user_ids[0])
+
+    row = fetch_one(pg, "SELECT recipient, subject FROM notification_outbox")
+    assert row["recipient"] == f"resident_{event_id}_2@example.com"
+    assert row["subject"].startswith("You're registered")
+
+    def fail(sender, user_ids):
+        raise RuntimeError("rolled back after the outbox insert")
+
+    with waitlist_promoted.connected_to(fail), pg_app.app_context():
+        with pytest.raises(RuntimeError):
+            Event.update(event_id, max_participants=2)
+
+    assert fetch_one(pg, "SELECT COUNT(*) AS n FROM notification_outbox") == {"n": 1}
+
+
+def test_unexpected_error_fails_only_that_message(pg, pg_app, outbox, smtp_server):
+    with pg_app.app_context():
+        enqueue_email("broken@example.com", "Hi", "Body")
+        enqueue_email("ok@example.com", "Hi", "Body")
+
+    worker = _worker(smtp_server, max_attempts=1)
+    build_message = worker._build_message
+
+    def fussy_build(row):
+        if row["recipient"] == "broken@example.com":
+            raise UnicodeEncodeError("ascii", "", 0, 1, "unencodable header")
+        return build_message(row)
+
+    worker._build_message = fussy_build
+    with pg_app.app_context():
+        assert worker.run_once() == (1, 1)
+    worker.close()
+
+    row = fetch_one(
+        pg, "SELECT status, last_error FROM notification_outbox WHERE recipient = 'broken@example.com'"
+    )
+    assert row["status"] == "failed"
+    assert "unencodable header" in row["last_error"]
+
+
+def test_stale_claim_on_final_attempt_is_given_up(pg, pg_app, outbox, smtp_server):
+    with pg_app.app_context():
+        enqueue_email("crashed@example.com", "Hi", "Body")
+        enqueue_email("retry@example.com", "Hi", "Body")
+    cur = pg.cursor()
+    cur.execute(
+        """
+        UPDATE notification_outbox
+        SET status = 'sending', claimed_at = NOW() - INTERVAL '1 hour',
+            attempts = CASE recipient WHEN 'crashed@example.com' THEN 3 ELSE 1 END
+        """
+    )
+    pg.commit()
+    cur.close()
+
+    worker = _worker(smtp_server, max_attempts=3, claim_timeout=60)
+    with pg_app.app_context():
+        assert worker.run_once() == (1, 0)
+    worker.close()
+
+    assert [r for r, _ in smtp_server.messages] == [["retry@example.com"]]
+    assert fetch_one(
+        pg, "SELECT status FROM notification_outbox WHERE recipient = 'crashed@example.com'"
+    ) == {"status": "failed"}
+
+
+def test_notify_waitlist_skips_users_without_email(pg, pg_app, outbox, make_event):
+    event_id, user_ids = make_event(1, 3)
+    with pg_app.app_context():
+        for user_id in user_ids:
+            Event.register_user(event_id, user_id)
+        assert Event.notify_waitlist(event_id)["success"] is False
+
+    cur = pg.cursor()
+    cur.execute(
+        "UPDATE resident SET email = username || '@example.com' WHERE resident_id = %s",
+        (user_ids[2],),
+    )
+    pg.commit()
+    cur.close()
+
+    with pg_app.app_context():
+        result = Event.notify_waitlist(event_id)
+    assert result["email"] == f"resident_{event_id}_3@example.com"
+    assert fetch_one(pg, "SELECT recipient FROM notification_outbox") == {"recipient": result["email"]}
@@ -0,0 +1,65 @@
+import pytest
+
+from app.models.events import Event
+from app.models.reviews import Review
+from app.models.sessions import Session
+from tests.db.conftest import walk_pages
+
+
+def test_review_pages_cover_every_review_once_across_equal_dates(pg, pg_app, make_event):
+    _, residents = make_event(10, 3)
+    cur = pg.cursor()
+    # Seven reviews on only three distinct dates
+    cur.execute(
+        """
+        INSERT INTO review (resident_id, activity_group_name, content, star_rating, review_date)
+        SELECT %s, 'Test Group', 'Review ' || i, 1 + i %% 5, DATE '2024-05-01' + i / 3
+        FROM generate_series(0, 6) AS i
+        RETURNING review_id, review_date
+        """,
+        (residents[0],),
+    )
+    rows = sorted(cur.fetchall(), key=lambda r: (r["review_date"], r["review_id"]), reverse=True)
+    expected = [r["review_id"] for r in rows]
+    pg.commit()
+    cur.close()
+
+    with pg_app.app_context():
+        pages = walk_pages(lambda after: Review.get_by_resident(residents[0], after=after, per_page=3))
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [r["review_id"] for page in pages for r in page] == expected
+
+        group_pages = walk_pages(lambda after: Review.get_by_activity_group("Test Group", after=after, per_page=5))
+        assert [r["review_id"] for page in group_pages for r in page][:7] == expected
+
+        with pytest.raises(ValueError):
+            Review.get_by_resident(residents[0], after="garbage")
+
+
+def test_session_and_event_pages_follow_date_then_id(pg, pg_app, make_event):
+    event_id, _ = make_event(10, 0)
+    cur = pg.cursor()
+    cur.execute(
+        """
+        INSERT INTO session (activity_group_name, event_id, date, attendance)
+        SELECT 'Test Group', %s, DATE '2024-01-01' + i / 2, i FROM generate_series(0, 4) AS i
+        RETURNING id
+        """,
+        (event_id,),
+    )
+    session_ids = [row["id"] for row in cur.fetchall()]
+    pg.commit()
+    cur.close()
+
+    with pg_app.app_context():
+        pages = walk_pages(lambda after: Session.get_by_event(event_id, after=after, per_page=2))
+        assert [s["id"] for page in pages for s in page] == [
+            session_ids[4], session_ids[3], session_ids[2], session_ids[1], session_ids[0]
+        ]
+
+        for _ in range(3):
+            make_event(10, 0)
+        pages = walk_pages(lambda after: Event.get_page(after=after, per_page=2))
+        keys = [(e["date"], e["id"]) for page in pages for e in page]
+        assert len(pages) > 1
+        assert keys == sorted(set(keys), reverse=True)
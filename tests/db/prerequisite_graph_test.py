@@ -0,0 +1,71 @@
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_INTRANS
+
+from app.models.prerequisite import Prerequisite
+from app.services.prerequisite_graph import LOCK_KEY, PrerequisiteGraph
+from app.utils.database import get_db
+
+
+def _chain(make_event, length):
+    return [make_event(10, 0)[0] for _ in range(length)]
+
+
+def test_transitive_lookups_and_cycle_rejection(pg_app, make_event):
+    a, b, c, d = _chain(make_event, 4)
+    with pg_app.app_context():
+        # a requires b, b requires c, c requires d
+        Prerequisite.create(a, b, 1, 30, False)
+        Prerequisite.create(b, c, 1, 30, False)
+        Prerequisite.create(c, str(d), 1, 30, False)
+
+        graph = PrerequisiteGraph(refresh_interval=0)
+        assert graph.prerequisites_of(a) == [b, c, d]
+        assert graph.dependents_of(d) == [c, b, a]
+        assert [e["id"] for e in Prerequisite.get_all_prerequisites(b)] == [c, d]
+
+        with pytest.raises(ValueError, match="circular"):
+            Prerequisite.create(d, a, 1, 30, False)
+        with pytest.raises(ValueError, match="already exists"):
+            Prerequisite.create(a, b, 1, 30, False)
+        assert graph.prerequisites_of(d) == []
+
+
+def test_other_workers_catch_up_incrementally(pg, pg_app, make_event):
+    a, b, c = _chain(make_event, 3)
+    with pg_app.app_context():
+        other = PrerequisiteGraph(refresh_interval=3600)
+        assert other.prerequisites_of(a) == []
+
+        Prerequisite.create(a, b, 1, 30, False)
+        Prerequisite.create(b, c, 1, 30, False)
+        # Within the refresh interval the other worker still serves its snapshot
+        assert other.prerequisites_of(a) == []
+        other.refresh(force=True)
+        assert other.prerequisites_of(a) == [b, c]
+
+    # Writes that bypass the model (e.g. Event.delete) are logged by the trigger
+    cur = pg.cursor()
+    cur.execute("DELETE FROM prerequisite WHERE event_id = %s", (b,))
+    pg.commit()
+    cur.close()
+
+    with pg_app.app_context():
+        other.refresh(force=True)
+        assert other.prerequisites_of(a) == [b]
+        assert other.dependents_of(c) == []
+
+
+def test_load_releases_its_lock_before_the_request_ends(pg, pg_app, make_event):
+    a, b = _chain(make_event, 2)
+    with pg_app.app_context():
+        Prerequisite.create(a, b, 1, 30, False)
+        graph = PrerequisiteGraph(refresh_interval=3600)
+        assert graph.prerequisites_of(a) == [b]
+        assert get_db().get_transaction_status() == TRANSACTION_STATUS_INTRANS
+
+        # A writer on another connection gets the exclusive lock straight away
+        cur = pg.cursor()
+        cur.execute("SELECT pg_try_advisory_xact_lock(%s) AS locked", (LOCK_KEY,))
+        assert cur.fetchone()["locked"]
+        pg.rollback()
+        cur.close()
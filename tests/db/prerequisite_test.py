@@ -0,0 +1,42 @@
+from app.models.prerequisite import Prerequisite
+
+
+def _complete(pg, event_id, user_id, attendance, days_ago):
+    cur = pg.cursor()
+    cur.execute(
+        "INSERT INTO registrations (event_id, user_id, status) VALUES (%s, %s, 'completed')",
+        (event_id, user_id),
+    )
+    cur.execute(
+        """
+        INSERT INTO session (activity_group_name, event_id, date, attendance)
+        VALUES ('Test Group', %s, CURRENT_DATE - %s, %s)
+        """,
+        (event_id, days_ago, attendance),
+    )
+    pg.commit()
+    cur.close()
+
+
+def test_check_prerequisites_reports_every_unmet_prerequisite(pg, pg_app, make_event):
+    target, (user_id,) = make_event(10, 1)
+    passed, _ = make_event(10, 0)
+    too_low, _ = make_event(10, 0)
+    expired, _ = make_event(10, 0)
+    never, _ = make_event(10, 0)
+
+    _complete(pg, passed, user_id, attendance=8, days_ago=10)
+    _complete(pg, too_low, user_id, attendance=2, days_ago=10)
+    _complete(pg, expired, user_id, attendance=8, days_ago=400)
+
+    with pg_app.app_context():
+        assert Prerequisite.check_prerequisites(user_id, target) == (True, [])
+        for prerequisite_id in (passed, too_low, expired, never):
+            Prerequisite.create(target, prerequisite_id, 5, 365, False)
+
+        met, unmet = Prerequisite.check_prerequisites(user_id, target)
+
+    assert not met
+    assert [p["prerequisite_event_id"] for p in unmet] == [too_low, expired, never]
+    assert unmet[0]["event_name"] == "Test Group"
+    assert unmet[0]["minimum_performance"] == 5
@@ -0,0 +1,77 @@
+import datetime
+
+from app.models.prerequisite import Prerequisite
+from app.services.qualifications import QualificationCache
+from tests.db.conftest import fetch_one
+
+QUALIFIED_UNTIL = "SELECT qualified_until FROM qualification WHERE user_id = %s AND prerequisite_id = %s"
+
+
+def _execute(pg, sql, params=()):
+    cur = pg.cursor()
+    cur.execute(sql, params)
+    pg.commit()
+    cur.close()
+
+
+def test_triggers_track_completion_and_attendance(pg, pg_app, make_event):
+    target, (user_id,) = make_event(10, 1)
+    required, _ = make_event(10, 0)
+    with pg_app.app_context():
+        Prerequisite.create(target, required, 5, 30, False)
+    prerequisite_id = fetch_one(pg, "SELECT id FROM prerequisite WHERE event_id = %s", (target,))["id"]
+
+    _execute(pg, "INSERT INTO registrations (event_id, user_id) VALUES (%s, %s)", (required, user_id))
+    _execute(
+        pg,
+        """
+        INSERT INTO session (activity_group_name, event_id, date, attendance)
+        VALUES ('Test Group', %s, CURRENT_DATE - 10, 3)
+        """,
+        (required,),
+    )
+    # Registered but not completed, and attendance below the minimum
+    assert fetch_one(pg, QUALIFIED_UNTIL, (user_id, prerequisite_id)) is None
+
+    _execute(pg, "UPDATE registrations SET status = 'completed' WHERE event_id = %s", (required,))
+    assert fetch_one(pg, QUALIFIED_UNTIL, (user_id, prerequisite_id)) is None
+
+    _execute(pg, "UPDATE session SET attendance = 8 WHERE event_id = %s", (required,))
+    assert fetch_one(pg, QUALIFIED_UNTIL, (user_id, prerequisite_id)) == {
+        "qualified_until": datetime.date.today() + datetime.timedelta(days=20)
+    }
+
+    _execute(pg, "UPDATE registrations SET status = 'cancelled' WHERE event_id = %s", (required,))
+    assert fetch_one(pg, QUALIFIED_UNTIL, (user_id, prerequisite_id)) is None
+
+
+def test_cache_serves_repeat_checks_and_expires_qualifications(pg, pg_app, make_event):
+    target, (user_id,) = make_event(10, 1)
+    required, _ = make_event(10, 0)
+    _execute(
+        pg,
+        """
+        INSERT INTO registrations (event_id, user_id, status) VALUES (%s, %s, 'completed');
+        INSERT INTO session (activity_group_name, event_id, date, attendance)
+        VALUES ('Test Group', %s, CURRENT_DATE - 10, 8);
+        """,
+        (required, user_id, required),
+    )
+    with pg_app.app_context():
+        Prerequisite.create(target, required, 5, 30, False)
+
+        cache = QualificationCache(maxsize=1, ttl=60)
+        today = datetime.date.today()
+        assert cache.unmet(user_id, target, today) == []
+        assert cache.unmet(user_id, target, today) == []
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Served from the cache, but past qualified_until it no longer counts
+        later = today + datetime.timedelta(days=21)
+        assert [p["prerequisite_event_id"] for p in cache.unmet(user_id, target, later)] == [required]
+        assert cache.hits == 2
+
+        # maxsize=1: another key evicts the first
+        cache.unmet(user_id, required, today)
+        cache.unmet(user_id, target, today)
+        assert cache.misses == 3
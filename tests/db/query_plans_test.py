@@ -0,0 +1,179 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.events import (
+    CLAIM_SEAT_SQL,
+    EVENT_DETAIL_SQL,
+    EVENTS_PAGE_AFTER,
+    EVENTS_PAGE_SQL,
+    ORGANIZER_EVENTS_AFTER,
+    ORGANIZER_EVENTS_SQL,
+    REGISTERED_EVENTS_SQL,
+    REGISTRANT_LISTS,
+    SEARCH_CANDIDATES,
+    SEARCH_MATCH,
+    SEARCH_SQL,
+    WAITLIST_HEAD_SQL,
+    WAITLISTED_EVENTS_SQL,
+)
+from app.models.prerequisite import DEPENDENT_EVENTS_SQL, PREREQUISITES_SQL
+from app.models.reviews import GROUP_REVIEWS_SQL, RESIDENT_REVIEWS_SQL, REVIEWS_AFTER
+from app.models.sessions import EVENT_SESSIONS_AFTER, EVENT_SESSIONS_SQL, SESSIONS_AFTER, SESSIONS_SQL
+from app.services.qualifications import PREREQUISITE_STATUS_SQL
+
+YESTERDAY = datetime.now() - timedelta(days=1)
+
+
+def _days_ago(days):
+    return date.today() - timedelta(days=days)
+
+
+# The app's own queries: (query, params, tables that must not be sequentially scanned)
+HOT_QUERIES = {
+    "claim_seat": (
+        CLAIM_SEAT_SQL,
+        {"event_id": 4242, "user_id": 77},
+        {"event", "registrations", "waitlist"},
+    ),
+    "waitlist_head": (
+        WAITLIST_HEAD_SQL,
+        (4242,),
+        {"waitlist", "resident", "event"},
+    ),
+    "event_detail": (
+        EVENT_DETAIL_SQL,
+        {"event_id": 4242, "user_id": 77},
+        {"event", "registrations", "waitlist", "prerequisite"},
+    ),
+    "prerequisites_of_event": (
+        PREREQUISITES_SQL,
+        (4242,),
+        {"prerequisite", "event"},
+    ),
+    "prerequisite_status": (
+        PREREQUISITE_STATUS_SQL,
+        {"user_id": 77, "event_id": 4242},
+        {"prerequisite", "event", "qualification"},
+    ),
+    "dependents_of_event": (
+        DEPENDENT_EVENTS_SQL,
+        (4242,),
+        {"prerequisite", "event"},
+    ),
+    "event_sessions": (
+        EVENT_SESSIONS_SQL.format(after=""),
+        (4242, 11),
+        {"session"},
+    ),
+    "events_by_date": (
+        EVENTS_PAGE_SQL.format(after=""),
+        (21,),
+        {"event"},
+    ),
+    "event_search": (
+        SEARCH_SQL.format(conditions=f"({SEARCH_MATCH})"),
+        {"tsquery": "477:*", "candidates": SEARCH_CANDIDATES, "limit": 50},
+        {"event"},
+    ),
+    "organizer_events": (
+        ORGANIZER_EVENTS_SQL.format(after=""),
+        (7, 51),
+        {"event"},
+    ),
+    "profile_registered_events": (
+        REGISTERED_EVENTS_SQL,
+        (77,),
+        {"registrations", "event"},
+    ),
+    "profile_waitlisted_events": (
+        WAITLISTED_EVENTS_SQL,
+        (77,),
+        {"waitlist", "event"},
+    ),
+}
+
+# Keyset pages deep into a listing: (query, params, paginated table); the
+# (key) < (last key) condition must be an index seek, not a filter
+KEYSET_QUERIES = {
+    "group_reviews_page": (
+        GROUP_REVIEWS_SQL.format(after=REVIEWS_AFTER),
+        ("Group 7", _days_ago(900), 50000, 11),
+        "review",
+    ),
+    "resident_reviews_page": (
+        RESIDENT_REVIEWS_SQL.format(after=REVIEWS_AFTER),
+        (77, _days_ago(500), 50000, 11),
+        "review",
+    ),
+    "sessions_page": (
+        SESSIONS_SQL.format(after=SESSIONS_AFTER),
+        (_days_ago(300), 20000, 11),
+        "session",
+    ),
+    "event_sessions_page": (
+        EVENT_SESSIONS_SQL.format(after=EVENT_SESSIONS_AFTER),
+        (4242, _days_ago(0), 20000, 11),
+        "session",
+    ),
+    "organizer_events_page": (
+        ORGANIZER_EVENTS_SQL.format(after=ORGANIZER_EVENTS_AFTER),
+        (7, _days_ago(0), 10000, 51),
+        "event",
+    ),
+    "event_registrants_page": (
+        REGISTRANT_LISTS["registered"][0].format(after=REGISTRANT_LISTS["registered"][1]),
+        (4242, YESTERDAY, 1000, 51),
+        "registrations",
+    ),
+    "event_waitlist_page": (
+        REGISTRANT_LISTS["waitlisted"][0].format(after=REGISTRANT_LISTS["waitlisted"][1]),
+        (4242, YESTERDAY, 1000, 51),
+        "waitlist",
+    ),
+    "events_page": (
+        EVENTS_PAGE_SQL.format(after=EVENTS_PAGE_AFTER),
+        (_days_ago(300), 10000, 21),
+        "event",
+    ),
+}
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _seq_scanned_tables(plan):
+    tables = set()
+    if plan.get("Node Type") == "Seq Scan":
+        tables.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables |= _seq_scanned_tables(child)
+    return tables
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index(seeded_pg, name):
+    query, params, tables = HOT_QUERIES[name]
+    cur = seeded_pg.cursor()
+    cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+    plan = cur.fetchone()["QUERY PLAN"][0]["Plan"]
+    cur.close()
+
+    assert not _seq_scanned_tables(plan) & tables, f"{name} fell back to a seq scan: {plan}"
+
+
+@pytest.mark.parametrize("name", sorted(KEYSET_QUERIES))
+def test_keyset_page_seeks_past_earlier_rows(seeded_pg, name):
+    query, params, table = KEYSET_QUERIES[name]
+    cur = seeded_pg.cursor()
+    cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+    plan = cur.fetchone()["QUERY PLAN"][0]["Plan"]
+    cur.close()
+
+    scans = [node for node in _nodes(plan) if node.get("Relation Name") == table]
+    scans += [node for node in _nodes(plan) if node["Node Type"] == "Bitmap Index Scan"]
+    assert any("ROW(" in node.get("Index Cond", "") for node in scans), f"{name}: {plan}"
+    assert table not in _seq_scanned_tables(plan)
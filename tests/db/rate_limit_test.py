@@ -0,0 +1,104 @@
+import pytest
+from flask import Flask
+
+from app.utils import rate_limit
+from app.utils.database import close_db
+from app.utils.rate_limit import RateLimiter, parse_limit, trust_proxies
+
+
+def _clear(pg):
+    cur = pg.cursor()
+    cur.execute("DELETE FROM rate_limit_bucket")
+    pg.commit()
+    cur.close()
+
+
+def test_parse_limit():
+    assert parse_limit("5/60") == (5.0, 5 / 60)
+    assert parse_limit("0") is None and parse_limit("") is None
+    with pytest.raises(ValueError):
+        parse_limit("0.5/60")
+
+
+def test_buckets_are_per_ip_and_per_username_and_refill(pg, pg_app):
+    _clear(pg)
+    limiter = RateLimiter({"login": {"ip": (2, 0.001), "username": (2, 0.001)}})
+
+    with pg_app.app_context():
+        assert limiter.take("login", "10.0.0.1", "Alice") is None
+        assert limiter.take("login", "10.0.0.2", "alice ") is None
+        # Third attempt on the same username from yet another address
+        assert limiter.take("login", "10.0.0.3", "ALICE") == ("username", 1000)
+        assert limiter.take("login", "10.0.0.1", "bob") is None
+        assert limiter.take("login", "10.0.0.1", "carol") == ("ip", 1000)
+
+        cur = pg.cursor()
+        cur.execute("UPDATE rate_limit_bucket SET updated_at = updated_at - INTERVAL '2000 seconds'")
+        pg.commit()
+        cur.close()
+        assert limiter.take("login", "10.0.0.1", "alice") is None
+        assert limiter.prune() >= 1
+
+    assert limiter.stats() == {"login": {"allowed": 4, "ip": 1, "username": 1}}
+
+
+def test_rejected_username_does_not_spend_the_ip_token(pg, pg_app):
+    _clear(pg)
+    limiter = RateLimiter({"login": {"ip": (2, 0.001), "username": (1, 0.001)}})
+
+    with pg_app.app_context():
+        assert limiter.take("login", "10.0.0.1", "alice") is None
+        for _ in range(3):
+            assert limiter.take("login", "10.0.0.1", "alice") == ("username", 1000)
+        assert limiter.take("login", "10.0.0.1", "bob") is None
+        assert limiter.take("login", "10.0.0.1", "carol") == ("ip", 1000)
+
+
+def test_rejected_posts_never_reach_the_view(pg, pg_app, monkeypatch, tmp_path):
+    _clear(pg)
+    monkeypatch.setattr(rate_limit, "rate_limiter", RateLimiter({"login": {"ip": (1, 0.01), "username": None}}))
+    (tmp_path / "login.html").write_text("login form")
+    app = Flask(__name__, template_folder=str(tmp_path))
+    app.secret_key = "test"
+    app.teardown_appcontext(close_db)
+    calls = []
+
+    @app.route("/login", methods=["GET", "POST"])
+    @rate_limit.rate_limited("login", "login.html")
+    def login():
+        calls.append(1)
+        return "ok"
+
+    client = app.test_client()
+    assert client.post("/login", data={"username": "a"}).status_code == 200
+    rejected = client.post("/login", data={"username": "b"})
+    assert rejected.status_code == 429 and rejected.headers["Retry-After"] == "100"
+    assert client.get("/login").status_code == 200
+    assert len(calls) == 2
+
+
+def test_trusted_proxy_hops_key_buckets_on_the_client(pg, pg_app, monkeypatch, tmp_path):
+    _clear(pg)
+    monkeypatch.setattr(rate_limit, "rate_limiter", RateLimiter({"login": {"ip": (1, 0.01), "username": None}}))
+    (tmp_path / "login.html").write_text("login form")
+    app = Flask(__name__, template_folder=str(tmp_path))
+    app.secret_key = "test"
+    app.teardown_appcontext(close_db)
+
+    @app.route("/login", methods=["POST"])
+    @rate_limit.rate_limited("login", "login.html")
+    def login():
+        return "ok"
+
+    assert trust_proxies(app, 1) == 1
+    client = app.test_client()
+
+    def post(forwarded_for):
+        return client.post(
+            "/login", data={"username": "a"}, headers={"X-Forwarded-For": forwarded_for}
+        ).status_code
+
+    assert post("198.51.100.1") == 200
+    assert post("198.51.100.2") == 200
+    # Only the last entry is trusted; a forged first one does not buy a new bucket
+    assert post("203.0.113.9, 198.51.100.1") == 429
@@ -0,0 +1,126 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models import events
+from app.models.events import Event
+from tests.db.conftest import fetch_one
+
+CAPACITY = 20
+REGISTRANTS = 300
+
+
+def test_concurrent_registrations_never_oversell(pg, pg_app, make_event):
+    event_id, user_ids = make_event(CAPACITY, REGISTRANTS)
+
+    def register(user_id):
+        with pg_app.app_context():
+            started = time.perf_counter()
+            registered = Event.register_user(event_id, user_id)
+            return registered, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=50) as executor:
+        results = list(executor.map(register, user_ids))
+
+    assert sum(1 for registered, _ in results if registered) == CAPACITY
+    counts = fetch_one(
+        pg,
+        """
+        SELECT registered_count, waitlist_count,
+               (SELECT COUNT(*) FROM registrations
+                WHERE event_id = %(id)s AND status = 'registered') AS registrations,
+               (SELECT COUNT(*) FROM waitlist WHERE event_id = %(id)s) AS waitlisted
+        FROM event WHERE id = %(id)s
+        """,
+        {"id": event_id},
+    )
+    assert counts["registrations"] == counts["registered_count"] == CAPACITY
+    assert counts["waitlisted"] == counts["waitlist_count"] == REGISTRANTS - CAPACITY
+
+    latencies = sorted(elapsed for _, elapsed in results)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    assert p99 < 2.0, f"p99 registration latency {p99:.3f}s"
+
+
+def test_repeat_registration_is_rejected(pg_app, make_event):
+    event_id, user_ids = make_event(CAPACITY, 1)
+
+    with pg_app.app_context():
+        assert Event.register_user(event_id, user_ids[0]) is True
+        with pytest.raises(ValueError):
+            Event.register_user(event_id, user_ids[0])
+
+
+def _lock_waiters(pg):
+    cur = pg.cursor()
+    cur.execute("SELECT COUNT(*) AS waiting FROM pg_locks WHERE NOT granted")
+    waiting = cur.fetchone()["waiting"]
+    cur.close()
+    pg.rollback()
+    return waiting
+
+
+def test_cancellation_while_joining_a_full_event_promotes_the_joiner(
+    pg, pg_app, make_event, monkeypatch
+):
+    event_id, (seated, joining) = make_event(1, 2)
+    with pg_app.app_context():
+        assert Event.register_user(event_id, seated) is True
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    cancelling = []
+
+    def cancel():
+        with pg_app.app_context():
+            Event.cancel_registration(event_id, seated)
+
+    class PausingCursor:
+        """Cancels the seated user just before the joiner's waitlist insert runs."""
+
+        def __init__(self, cursor):
+            self._cursor = cursor
+
+        def __getattr__(self, name):
+            return getattr(self._cursor, name)
+
+        def execute(self, sql, params=None):
+            if "INSERT INTO waitlist" in sql and not cancelling:
+                cancelling.append(executor.submit(cancel))
+                deadline = time.monotonic() + 5
+                while not (cancelling[0].done() or _lock_waiters(pg)):
+                    assert time.monotonic() < deadline, "cancellation neither finished nor blocked"
+                    time.sleep(0.01)
+            return self._cursor.execute(sql, params)
+
+    class PausingConnection:
+        def __init__(self, conn):
+            self._conn = conn
+
+        def __getattr__(self, name):
+            return getattr(self._conn, name)
+
+        def cursor(self):
+            return PausingCursor(self._conn.cursor())
+
+    real_get_db = events.get_db
+    monkeypatch.setattr(events, "get_db", lambda: PausingConnection(real_get_db()))
+
+    with pg_app.app_context():
+        assert Event.register_user(event_id, joining) is False
+    cancelling[0].result()
+    executor.shutdown()
+
+    counts = fetch_one(
+        pg,
+        """
+        SELECT registered_count, waitlist_count,
+               (SELECT array_agg(user_id) FROM registrations
+                WHERE event_id = %(id)s AND status = 'registered') AS registered
+        FROM event WHERE id = %(id)s
+        """,
+        {"id": event_id},
+    )
+    assert counts["registered"] == [joining]
+    assert counts["registered_count"] == 1
+    assert counts["waitlist_count"] == 0
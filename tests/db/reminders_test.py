@@ -0,0 +1,45 @@
+import datetime
+
+from app.models.events import Event
+from app.utils.reminders import send_event_reminders
+
+DAY = datetime.date(2099, 3, 14)
+
+
+def test_one_digest_per_resident_and_no_resends(pg, pg_app, make_event):
+    first, residents = make_event(10, 3)
+    second, _ = make_event(10, 0)
+    cur = pg.cursor()
+    cur.execute("DELETE FROM notification_outbox")
+    cur.execute("UPDATE event SET date = %s, name = 'Event ' || id WHERE id IN (%s, %s)", (DAY, first, second))
+    cur.execute(
+        "UPDATE resident SET email = username || '@example.com' WHERE resident_id = ANY(%s)",
+        (residents[:2],),
+    )
+    pg.commit()
+    cur.close()
+
+    with pg_app.app_context():
+        for user_id in residents:
+            Event.register_user(first, user_id)
+        Event.register_user(second, residents[0])
+
+        # Small batches exercise the bulk hand-off boundaries
+        assert send_event_reminders(DAY, batch_size=1) == (2, 2)
+        assert send_event_reminders(DAY) == (0, 0)
+
+    cur = pg.cursor()
+    cur.execute("SELECT recipient, subject, body FROM notification_outbox ORDER BY recipient")
+    rows = cur.fetchall()
+    pg.commit()
+    cur.close()
+
+    assert [row["recipient"] for row in rows] == [
+        f"resident_{first}_1@example.com",
+        f"resident_{first}_2@example.com",
+    ]
+    assert rows[0]["subject"] == f"Reminder: your events on {DAY}"
+    assert f"Hello resident_{first}_1," in rows[0]["body"]
+    assert f"Event {first} on {DAY}" in rows[0]["body"]
+    assert f"Event {second} on {DAY}" in rows[0]["body"]
+    assert f"Event {second}" not in rows[1]["body"]
@@ -0,0 +1,73 @@
+import datetime
+
+from app.models.reviews import Review
+from tests.db.conftest import fetch_one
+
+STATS = (
+    "SELECT review_count, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5 "
+    "FROM review_stats WHERE activity_group_name = %s"
+)
+
+
+def _group(pg, name):
+    cur = pg.cursor()
+    cur.execute(
+        """
+        INSERT INTO activity_group (name, category, description, email, event_frequency)
+        VALUES (%s, 'Test', 'Reviewed by tests', 'test@example.com', 'weekly')
+        ON CONFLICT (name) DO NOTHING
+        """,
+        (name,),
+    )
+    pg.commit()
+    cur.close()
+
+
+def test_writes_keep_stats_exact(pg, pg_app, make_event):
+    _, residents = make_event(10, 3)
+    _group(pg, "Stats Group")
+    today = datetime.date.today()
+
+    with pg_app.app_context():
+        ids = [
+            Review.create(resident, "Stats Group", "Fine", rating, today)
+            for resident, rating in zip(residents, (5, 4, 4))
+        ]
+        assert fetch_one(pg, STATS, ("Stats Group",)) == {
+            "review_count": 3, "rating_sum": 13,
+            "stars_1": 0, "stars_2": 0, "stars_3": 0, "stars_4": 2, "stars_5": 1,
+        }
+
+        review = Review.get(ids[1])
+        review.star_rating = 1
+        review.update()
+        Review.get(ids[0]).delete()
+        assert fetch_one(pg, STATS, ("Stats Group",)) == {
+            "review_count": 2, "rating_sum": 5,
+            "stars_1": 1, "stars_2": 0, "stars_3": 0, "stars_4": 1, "stars_5": 0,
+        }
+
+        ratings = Review.get_ratings(["Stats Group", "Nobody Reviewed"])
+        assert ratings["Stats Group"] == {"count": 2, "average": 2.5, "histogram": [1, 0, 0, 1, 0]}
+        assert ratings["Nobody Reviewed"]["count"] == 0
+        assert Review.get_average_rating("Stats Group") == 2.5
+
+
+def test_reconcile_repairs_drift(pg, pg_app, make_event):
+    _, residents = make_event(10, 1)
+    _group(pg, "Drift Group")
+
+    with pg_app.app_context():
+        Review.create(residents[0], "Drift Group", "Great", 5, datetime.date.today())
+
+        cur = pg.cursor()
+        cur.execute(
+            "UPDATE review_stats SET review_count = 9, stars_2 = 3 WHERE activity_group_name = 'Drift Group'"
+        )
+        pg.commit()
+        cur.close()
+
+        assert "Drift Group" in Review.reconcile_stats()
+        assert Review.reconcile_stats() == []
+        assert Review.get_ratings(["Drift Group"])["Drift Group"]["histogram"] == [0, 0, 0, 0, 1]
+    assert fetch_one(pg, STATS, ("Drift Group",))["review_count"] == 1
@@ -0,0 +1,35 @@
+from app.models.events import Event
+from tests.db.conftest import fetch_one
+
+COUNTERS = "SELECT registered_count, waitlist_count FROM event WHERE id = %s"
+
+
+def test_cancellation_and_promotion_keep_counters_exact(pg, pg_app, make_event):
+    event_id, user_ids = make_event(2, 4)
+
+    with pg_app.app_context():
+        for user_id in user_ids:
+            Event.register_user(event_id, user_id)
+        assert fetch_one(pg, COUNTERS, (event_id,)) == {"registered_count": 2, "waitlist_count": 2}
+
+        Event.cancel_registration(event_id, user_ids[0])
+        assert fetch_one(pg, COUNTERS, (event_id,)) == {"registered_count": 2, "waitlist_count": 1}
+
+
+def test_reconcile_repairs_drift(pg, pg_app, make_event):
+    event_id, user_ids = make_event(5, 2)
+
+    with pg_app.app_context():
+        for user_id in user_ids:
+            Event.register_user(event_id, user_id)
+
+        cur = pg.cursor()
+        cur.execute(
+            "UPDATE event SET registered_count = 40, waitlist_count = 3 WHERE id = %s", (event_id,)
+        )
+        pg.commit()
+        cur.close()
+
+        assert Event.reconcile_counts() == [event_id]
+        assert Event.reconcile_counts() == []
+    assert fetch_one(pg, COUNTERS, (event_id,)) == {"registered_count": 2, "waitlist_count": 0}
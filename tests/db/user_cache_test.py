@@ -0,0 +1,34 @@
+import pytest
+
+from app.models.users import User
+from app.services import user_cache as user_cache_module
+from app.services.user_cache import user_cache
+
+
+def test_loader_hits_skip_the_database_and_writes_invalidate(pg, pg_app, make_event, monkeypatch):
+    _, (user_id,) = make_event(10, 1)
+    user_cache.invalidate()
+    hits, misses = user_cache.hits, user_cache.misses
+
+    with pg_app.app_context():
+        user = User.load(str(user_id))
+        assert (user.id, user.role, user.hashed_password) == (user_id, "user", None)
+
+    with monkeypatch.context() as patched, pg_app.app_context():
+        patched.setattr(user_cache_module, "get_db", lambda: pytest.fail("cache hit touched the database"))
+        assert User.load(user_id).username == user.username
+    assert (user_cache.hits - hits, user_cache.misses - misses) == (1, 1)
+
+    # A role change made elsewhere shows up only once the entry is invalidated or expires
+    cur = pg.cursor()
+    cur.execute("UPDATE resident SET role = 'admin' WHERE resident_id = %s", (user_id,))
+    pg.commit()
+    cur.close()
+    with pg_app.app_context():
+        assert not User.load(user_id).is_admin
+        user_cache.invalidate(user_id)
+        assert User.load(user_id).is_admin
+
+        user.soft_delete()
+        assert User.load(user_id) is None
+        assert User.load("not-a-number") is None
@@ -0,0 +1,52 @@
+from app.models.events import Event, waitlist_promoted
+from tests.db.conftest import fetch_one
+
+COUNTERS = "SELECT registered_count, waitlist_count FROM event WHERE id = %s"
+
+
+def _fill(pg_app, event_id, user_ids):
+    with pg_app.app_context():
+        for user_id in user_ids:
+            Event.register_user(event_id, user_id)
+
+
+def test_capacity_increase_promotes_waitlist_head_in_order(pg, pg_app, make_event):
+    event_id, user_ids = make_event(2, 7)
+    _fill(pg_app, event_id, user_ids)
+    received = []
+
+    def on_promoted(sender, user_ids):
+        received.append((sender, user_ids))
+
+    with waitlist_promoted.connected_to(on_promoted), pg_app.app_context():
+        Event.update(event_id, max_participants=5)
+
+    assert received == [(event_id, user_ids[2:5])]
+    assert fetch_one(pg, COUNTERS, (event_id,)) == {"registered_count": 5, "waitlist_count": 2}
+
+
+def test_bulk_removal_fills_every_freed_seat(pg, pg_app, make_event):
+    event_id, user_ids = make_event(3, 6)
+    _fill(pg_app, event_id, user_ids)
+
+    with pg_app.app_context():
+        promoted = Event.remove_registrations(event_id, [user_ids[0], user_ids[1], user_ids[5]])
+
+    assert promoted == [user_ids[3], user_ids[4]]
+    assert fetch_one(pg, COUNTERS, (event_id,)) == {"registered_count": 3, "waitlist_count": 0}
+
+
+def test_failed_promotion_rolls_back_with_the_cancellation(pg, pg_app, make_event):
+    event_id, user_ids = make_event(1, 2)
+    _fill(pg_app, event_id, user_ids)
+
+    def fail(sender, user_ids):
+        raise RuntimeError("notification backend down")
+
+    with waitlist_promoted.connected_to(fail), pg_app.app_context():
+        try:
+            Event.cancel_registration(event_id, user_ids[0])
+        except RuntimeError:
+            pass
+
+    assert fetch_one(pg, COUNTERS, (event_id,)) == {"registered_count": 1, "waitlist_count": 1}
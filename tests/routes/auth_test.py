@@ -19,9 +19,9 @@ def test_register_post_success(client, app):
             # Mock customer check to return a valid resident
             mock_cursor.execute.return_value.fetchone.return_value = {"resident_id": "TESTID"}
 
-            # Mock the bcrypt password hashing
-            with patch("app.routes.auth.bcrypt.generate_password_hash") as mock_hash:
-                mock_hash.return_value = b"hashed_password"
+            # Mock the password hashing
+            with patch("app.models.users.password_hasher.hash") as mock_hash:
+                mock_hash.return_value = "hashed_password"
 
                 response = client.post(
                     "/register",
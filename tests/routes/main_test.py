@@ -43,23 +43,24 @@ def test_index_route(client):
     assert b"You can't spell Boston without activities" in response.data
 
 
-def test_index_no_category_calls_get_all_and_shows_no_results(monkeypatch, client):
+def test_index_no_category_filters_everything_and_shows_no_results(monkeypatch, client):
     mock_svc = MagicMock()
-    mock_svc.get_all_activity_groups.return_value = []
+    mock_svc.filter_activity_groups.return_value = ([], [])
+    mock_svc.get_ratings.return_value = {}
     monkeypatch.setattr("app.routes.main.ActivityGroupsService", lambda: mock_svc)
 
     resp = client.get("/")
     assert resp.status_code == 200
 
-    mock_svc.get_all_activity_groups.assert_called_once()
-    mock_svc.search_activity_groups.assert_not_called()
+    mock_svc.filter_activity_groups.assert_called_once_with("", {})
 
     assert b"No activities found" in resp.data
 
 
 def test_index_displays_group_and_free_label(monkeypatch, client):
     mock_svc = MagicMock()
-    mock_svc.get_all_activity_groups.return_value = [DUMMY_FREE_ACTIVITY_GROUP]
+    mock_svc.filter_activity_groups.return_value = ([DUMMY_FREE_ACTIVITY_GROUP], [])
+    mock_svc.get_ratings.return_value = {}
     monkeypatch.setattr("app.routes.main.ActivityGroupsService", lambda: mock_svc)
 
     resp = client.get("/")
@@ -69,17 +70,31 @@ def test_index_displays_group_and_free_label(monkeypatch, client):
     assert "<strong>Age:</strong> 18+" in html
 
 
-def test_index_with_category_calls_search_and_displays_fee_and_public(monkeypatch, client):
+def test_index_with_category_searches_and_displays_fee_and_public(monkeypatch, client):
     mock_svc = MagicMock()
-    mock_svc.search_activity_groups.return_value = [DUMMY_PAID_ACTIVITY_GROUP]
+    mock_svc.filter_activity_groups.return_value = ([DUMMY_PAID_ACTIVITY_GROUP], [])
+    mock_svc.get_ratings.return_value = {}
     monkeypatch.setattr("app.routes.main.ActivityGroupsService", lambda: mock_svc)
 
-    resp = client.get("/?category=choir")
+    resp = client.get("/?category=choir&fee=over-50&fee=free")
     assert resp.status_code == 200
 
-    mock_svc.search_activity_groups.assert_called_once_with("choir")
-    mock_svc.get_all_activity_groups.assert_not_called()
+    mock_svc.filter_activity_groups.assert_called_once_with("choir", {"fee": ["over-50", "free"]})
 
     html = resp.data.decode()
     assert "$50" in html
     assert "<strong>Open to public:</strong> Yes" in html
+
+
+def test_index_displays_group_rating(monkeypatch, client):
+    mock_svc = MagicMock()
+    mock_svc.filter_activity_groups.return_value = ([DUMMY_FREE_ACTIVITY_GROUP], [])
+    mock_svc.get_ratings.return_value = {
+        "Test Group": {"count": 4, "average": 4.25, "histogram": [0, 0, 1, 1, 2]}
+    }
+    monkeypatch.setattr("app.routes.main.ActivityGroupsService", lambda: mock_svc)
+
+    resp = client.get("/")
+
+    mock_svc.get_ratings.assert_called_once_with(["Test Group"])
+    assert "4.2 (4 reviews)" in resp.data.decode()
@@ -0,0 +1,54 @@
+import pytest
+from flask import Flask
+from flask_login import LoginManager
+
+from app.routes.status import status_bp
+
+STATS = ["/status/db-pool", "/status/user-cache", "/status/password-hasher", "/status/rate-limits"]
+
+
+class Principal:
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+
+    def __init__(self, role):
+        self.role = role
+
+    @property
+    def is_admin(self):
+        return self.role == "admin"
+
+    def get_id(self):
+        return self.role
+
+
+@pytest.fixture
+def status_client():
+    app = Flask(__name__)
+    app.secret_key = "test"
+    login_manager = LoginManager(app)
+    login_manager.login_view = "login"
+    login_manager.user_loader(Principal)
+    app.add_url_rule("/", "main.index", lambda: "index")
+    app.add_url_rule("/login", "login", lambda: "login")
+    app.register_blueprint(status_bp, url_prefix="/status")
+    return app.test_client()
+
+
+def _log_in(client, role):
+    with client.session_transaction() as session:
+        session["_user_id"] = role
+
+
+@pytest.mark.parametrize("path", STATS)
+def test_stats_need_an_admin(status_client, path):
+    assert status_client.get(path).status_code == 302
+    _log_in(status_client, "user")
+    assert status_client.get(path).status_code == 302
+    _log_in(status_client, "admin")
+    assert status_client.get(path).status_code == 200
+
+
+def test_health_check_stays_public(status_client):
+    assert status_client.get("/status/").status_code == 200
@@ -0,0 +1,68 @@
+from app.models.activity_groups import ActivityGroup
+from app.services.activity_group_facets import ActivityGroupFacets
+
+
+def _group(name, category, fee, frequency, min_age, public):
+    return ActivityGroup(
+        name=name,
+        category=category,
+        description="desc",
+        founding_date="2021-01-01",
+        website="http://example.com",
+        email="x@y.com",
+        phone_number="123",
+        total_members=5,
+        social_media_links="{}",
+        event_frequency=frequency,
+        membership_fee=fee,
+        open_to_public=public,
+        is_active=True,
+        min_age=min_age,
+    )
+
+
+GROUPS = [
+    _group("Chess Club", "Games", 0, "weekly", 8, True),
+    _group("Choir", "Music", 40, "weekly", 18, True),
+    _group("Jazz Night", "Music", 60, "monthly", 21, False),
+    _group("Rowing", "Sports", 20, "biweekly", 13, True),
+    _group("Yoga", "Sports", 0, "weekly", 18, False),
+]
+FACETS = ActivityGroupFacets(GROUPS)
+
+
+def _select(filters, within=None):
+    positions, facets = FACETS.select(filters, within)
+    counts = {
+        facet["name"]: {option["key"]: option["count"] for option in facet["options"]}
+        for facet in facets
+    }
+    return [GROUPS[i].name for i in positions], counts
+
+
+def test_no_filters_counts_every_option():
+    names, counts = _select({})
+    assert names == [group.name for group in GROUPS]
+    assert counts["interest"] == {"Games": 1, "Music": 2, "Sports": 2}
+    assert counts["fee"] == {"free": 2, "under-25": 1, "25-50": 1, "over-50": 1}
+    assert counts["frequency"] == {"weekly": 3, "biweekly": 1, "monthly": 1}
+    assert counts["age"] == {"all-ages": 1, "13-plus": 1, "18-plus": 2, "21-plus": 1}
+    assert counts["public"] == {"yes": 3, "no": 2}
+
+
+def test_options_or_within_a_facet_and_counts_ignore_their_own_facet():
+    names, counts = _select({"interest": ["Music", "Sports"], "public": ["yes"]})
+    assert names == ["Choir", "Rowing"]
+    # Counts for a facet apply only the other facets' filters
+    assert counts["interest"] == {"Games": 1, "Music": 1, "Sports": 1}
+    assert counts["public"] == {"yes": 2, "no": 2}
+    assert counts["fee"] == {"free": 0, "under-25": 1, "25-50": 1, "over-50": 0}
+
+
+def test_within_keeps_search_order_and_unknown_options_are_ignored():
+    within = [GROUPS[4], GROUPS[1], GROUPS[0]]
+    names, counts = _select({"frequency": ["weekly"]}, within)
+    assert names == ["Yoga", "Choir", "Chess Club"]
+    assert counts["interest"] == {"Games": 1, "Music": 1, "Sports": 1}
+
+    assert _select({"fee": ["priceless"]})[0] == [group.name for group in GROUPS]
@@ -0,0 +1,56 @@
+from app.models.activity_groups import ActivityGroup, EventFrequency
+from app.services.activity_group_index import ActivityGroupIndex
+
+
+def _group(name, category):
+    return ActivityGroup(
+        name=name,
+        category=category,
+        description="desc",
+        founding_date="2021-01-01",
+        website="http://example.com",
+        email="x@y.com",
+        phone_number="123",
+        total_members=5,
+        social_media_links="{}",
+        event_frequency=EventFrequency.WEEKLY,
+        membership_fee=0,
+        open_to_public=True,
+        is_active=True,
+        min_age=18,
+    )
+
+
+INDEX = ActivityGroupIndex([
+    _group("Boston Rowing Club", "Sports"),
+    _group("Row Boat Restorers", "Crafts"),
+    _group("Rowing", "Sports"),
+    _group("Chess Club", "Games"),
+    _group("Harrowing Tales Book Club", "Reading"),
+    _group("Choir of Dorchester", "Music"),
+])
+
+
+def _names(query):
+    return [group.name for group in INDEX.search(query)]
+
+
+def test_search_ranks_exact_then_prefix_then_substring():
+    assert _names("rowing") == ["Rowing", "Boston Rowing Club", "Harrowing Tales Book Club"]
+    assert _names("row") == [
+        "Row Boat Restorers", "Rowing", "Boston Rowing Club", "Harrowing Tales Book Club",
+    ]
+
+
+def test_search_matches_words_across_name_and_category():
+    assert _names("club bo") == ["Boston Rowing Club", "Harrowing Tales Book Club"]
+    assert _names("sport") == ["Boston Rowing Club", "Rowing"]
+    assert _names("usi") == ["Choir of Dorchester"]
+    # Two-letter substrings only match as word prefixes
+    assert _names("ch") == ["Chess Club", "Choir of Dorchester"]
+
+
+def test_search_treats_regex_syntax_as_text():
+    assert _names("(a+)+$") == []
+    assert _names("ches.") == ["Chess Club"]
+    assert _names("") == []
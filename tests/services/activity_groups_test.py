@@ -1,10 +1,18 @@
-from app.models.activity_groups import ActivityGroup, EventFrequency
+from datetime import date
+from unittest.mock import Mock
+
+import pytest
+
+from app.models.activity_groups import EventFrequency
+from app.services import activity_groups
+from app.services.activity_group_catalog import ActivityGroupCatalog
+from app.services.activity_groups import ActivityGroupsService
 
 RAW_ACTIVITY_GROUPS = [
     {
-        "name": "Test Activity Group 1",
-        "category": "Test Category 1",
-        "description": "Test Description 1",
+        "name": "Test Activity Group 2",
+        "category": "Test Category 2",
+        "description": "Test Description 2",
         "founding_date": "2020-01-01",
         "website": "https://example.com",
         "email": "info@example.com",
@@ -12,15 +20,15 @@ RAW_ACTIVITY_GROUPS = [
         "social_media_links": '{"facebook":"goodbook","instagram":"goodgram"}',
         "is_active": True,
         "total_members": 0,
-        "event_frequency": "weekly",
-        "membership_fee": 0,
+        "event_frequency": "monthly",
+        "membership_fee": 25,
         "open_to_public": True,
         "min_age": 18,
     },
     {
-        "name": "Test Activity Group 2",
-        "category": "Test Category 2",
-        "description": "Test Description 2",
+        "name": "Test Activity Group 1",
+        "category": "Test Category 1",
+        "description": "Test Description 1",
         "founding_date": "2020-01-01",
         "website": "https://example.com",
         "email": "info@example.com",
@@ -35,76 +43,88 @@ RAW_ACTIVITY_GROUPS = [
     },
 ]
 
+RAW_REVIEW_STATS = {
+    "activity_group_name": "Test Activity Group 1",
+    "review_count": 2,
+    "rating_sum": 9,
+    "stars_1": 0,
+    "stars_2": 0,
+    "stars_3": 0,
+    "stars_4": 1,
+    "stars_5": 1,
+}
+
+
+@pytest.fixture
+def catalog_cursor(monkeypatch):
+    """A catalog without a listener whose single load reads the RAW_* rows."""
+    results = {
+        "activity_group": sorted(RAW_ACTIVITY_GROUPS, key=lambda row: row["name"]),
+        "review_stats": [RAW_REVIEW_STATS],
+    }
+    cursor = Mock()
+    cursor.fetchone.return_value = {"version": 1}
+
+    def fetchall():
+        query = cursor.execute.call_args.args[0]
+        return next(rows for table, rows in results.items() if f"FROM {table}" in query)
+
+    cursor.fetchall.side_effect = fetchall
+    conn = Mock()
+    conn.cursor.return_value = cursor
+    monkeypatch.setattr("app.services.activity_group_catalog.database.get_db", lambda: conn)
+
+    catalog = ActivityGroupCatalog(poll_interval=3600)
+    catalog.close()
+    monkeypatch.setattr(activity_groups, "activity_group_catalog", catalog)
+    return cursor
+
+
+def test_get_all_activity_groups(catalog_cursor):
+    result = ActivityGroupsService().get_all_activity_groups()
+
+    assert [group.name for group in result] == ["Test Activity Group 1", "Test Activity Group 2"]
+    assert result[0].category == "Test Category 1"
+    assert result[0].founding_date == date(2020, 1, 1)
+    assert result[0].social_media_links == '{"facebook":"goodbook","instagram":"goodgram"}'
+    assert result[0].event_frequency == EventFrequency.WEEKLY
+    assert result[1].event_frequency == EventFrequency.MONTHLY
+    assert result[1].membership_fee == 25
+
+
+def test_reads_are_served_from_one_load(catalog_cursor):
+    service = ActivityGroupsService()
+    service.get_all_activity_groups()
+    service.search_activity_groups("1")
+    service.filter_activity_groups("", {})
+    service.get_ratings(["Test Activity Group 1"])
+
+    queries = [call.args[0] for call in catalog_cursor.execute.call_args_list]
+    assert sum("FROM activity_group" in query for query in queries) == 1
+
+
+def test_search_activity_groups(catalog_cursor):
+    result = ActivityGroupsService().search_activity_groups("1")
+
+    assert [group.name for group in result] == ["Test Activity Group 1"]
+    assert result[0].category == "Test Category 1"
+
+
+def test_filter_activity_groups(catalog_cursor):
+    groups, facets = ActivityGroupsService().filter_activity_groups(
+        "Test", {"frequency": ["monthly"]}
+    )
+
+    assert [group.name for group in groups] == ["Test Activity Group 2"]
+    counts = {
+        facet["name"]: {option["key"]: option["count"] for option in facet["options"]}
+        for facet in facets
+    }
+    assert counts["frequency"] == {"weekly": 1, "monthly": 1, "biweekly": 0}
+
+
+def test_get_ratings(catalog_cursor):
+    ratings = ActivityGroupsService().get_ratings(["Test Activity Group 1", "Test Activity Group 2"])
 
-def test_get_all_activity_groups(app, mock_db, mock_activity_groups_service):
-    with app.app_context():
-        # Arrange
-        cols = list(ActivityGroup.model_fields.keys())
-
-        rows = [tuple(d[col] for col in cols) for d in RAW_ACTIVITY_GROUPS]
-        mock_db.fetchall.return_value = rows
-        mock_activity_groups_service.columns = cols
-
-        # Act
-        result = mock_activity_groups_service.get_all_activity_groups()
-
-        # Assert
-        assert len(result) == 2
-        assert result[0].name == "Test Activity Group 1"
-        assert result[0].category == "Test Category 1"
-        assert result[0].description == "Test Description 1"
-        assert result[0].founding_date == "2020-01-01"
-        assert result[0].website == "https://example.com"
-        assert result[0].email == "info@example.com"
-        assert result[0].phone_number == "+1 (555) 555-5555"
-        assert result[0].social_media_links == '{"facebook":"goodbook","instagram":"goodgram"}'
-        assert result[0].is_active == True
-        assert result[0].total_members == 0
-        assert result[0].event_frequency == EventFrequency.WEEKLY
-        assert result[0].membership_fee == 0
-        assert result[0].open_to_public == True
-        assert result[0].min_age == 18
-        assert result[1].name == "Test Activity Group 2"
-        assert result[1].category == "Test Category 2"
-        assert result[1].description == "Test Description 2"
-        assert result[1].founding_date == "2020-01-01"
-        assert result[1].website == "https://example.com"
-        assert result[1].email == "info@example.com"
-        assert result[1].phone_number == "+1 (555) 555-5555"
-        assert result[1].social_media_links == '{"facebook":"goodbook","instagram":"goodgram"}'
-        assert result[1].is_active == True
-        assert result[1].total_members == 0
-        assert result[1].event_frequency == EventFrequency.WEEKLY
-        assert result[1].membership_fee == 0
-        assert result[1].open_to_public == True
-        assert result[1].min_age == 18
-
-
-def test_search_activity_groups(app, mock_db, mock_activity_groups_service):
-    with app.app_context():
-        # Arrange
-        cols = list(ActivityGroup.model_fields.keys())
-
-        rows = [tuple(d[col] for col in cols) for d in RAW_ACTIVITY_GROUPS]
-        mock_db.fetchall.return_value = rows
-        mock_activity_groups_service.columns = cols
-
-        # Act
-        result = mock_activity_groups_service.search_activity_groups("1")
-
-        # Assert
-        assert len(result) == 1
-        assert result[0].name == "Test Activity Group 1"
-        assert result[0].category == "Test Category 1"
-        assert result[0].description == "Test Description 1"
-        assert result[0].founding_date == "2020-01-01"
-        assert result[0].website == "https://example.com"
-        assert result[0].email == "info@example.com"
-        assert result[0].phone_number == "+1 (555) 555-5555"
-        assert result[0].social_media_links == '{"facebook":"goodbook","instagram":"goodgram"}'
-        assert result[0].is_active == True
-        assert result[0].total_members == 0
-        assert result[0].event_frequency == EventFrequency.WEEKLY
-        assert result[0].membership_fee == 0
-        assert result[0].open_to_public == True
-        assert result[0].min_age == 18
+    assert ratings["Test Activity Group 1"] == {"count": 2, "average": 4.5, "histogram": [0, 0, 0, 1, 1]}
+    assert ratings["Test Activity Group 2"]["count"] == 0
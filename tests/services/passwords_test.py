@@ -0,0 +1,67 @@
+import os
+import time
+
+import pytest
+
+from app.services.passwords import PasswordHasher, PasswordHasherBusy, hash_rounds
+
+
+def test_hash_verify_and_rehash_on_the_calling_thread():
+    hasher = PasswordHasher(workers=0, max_pending=2, rounds=4)
+    password_hash = hasher.hash("correct horse")
+
+    assert hash_rounds(password_hash) == 4
+    assert hasher.verify("correct horse", password_hash)
+    assert not hasher.verify("wrong horse", password_hash)
+    assert not hasher.verify("correct horse", "not a bcrypt hash")
+    assert not hasher.needs_rehash(password_hash)
+    assert PasswordHasher(workers=0, rounds=5).needs_rehash(password_hash)
+
+    # bcrypt only reads 72 bytes; longer passwords must not raise
+    long_hash = hasher.hash("x" * 100)
+    assert hasher.verify("x" * 72, long_hash)
+
+
+def test_full_queue_rejects_immediately():
+    hasher = PasswordHasher(workers=0, max_pending=0, rounds=4)
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash("anything")
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_worker_processes_hash_and_verify():
+    hasher = PasswordHasher(workers=1, max_pending=2, rounds=4)
+    try:
+        password_hash = hasher.hash("pool password")
+        assert hasher.verify("pool password", password_hash)
+        assert hasher.stats()["completed"] == 2
+    finally:
+        hasher.close()
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes():
+    hasher = PasswordHasher(workers=1, max_pending=1, rounds=4)
+    try:
+        password_hash = hasher.hash("warm up the pool")
+        hasher.timeout = 0.2
+        with pytest.raises(PasswordHasherBusy):
+            hasher._run(time.sleep, 1.0)
+        with pytest.raises(PasswordHasherBusy):
+            hasher.verify("warm up the pool", password_hash)
+        assert hasher.stats()["timed_out"] == 1
+        assert hasher.stats()["rejected"] == 1
+
+        time.sleep(1.5)
+        assert hasher.verify("warm up the pool", password_hash)
+    finally:
+        hasher.close()
+
+
+def test_dead_worker_process_surfaces_as_busy():
+    hasher = PasswordHasher(workers=1, max_pending=2, rounds=4)
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher._run(os._exit, 1)
+        assert hasher.verify("after a crash", hasher.hash("after a crash"))
+    finally:
+        hasher.close()
@@ -0,0 +1,78 @@
+import ast
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+from app.utils import database
+
+APP_DIR = Path(__file__).resolve().parents[2] / "app"
+DATA_LAYER = APP_DIR / "utils" / "database.py"
+
+
+def _raw_connect_calls(path):
+    tree = ast.parse(path.read_text(), filename=str(path))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == "psycopg2":
+            if any(alias.name == "connect" for alias in node.names):
+                yield node.lineno
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "connect"
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "psycopg2"
+        ):
+            yield node.lineno
+
+
+def test_no_module_opens_raw_psycopg2_connections():
+    offenders = [
+        f"{path.relative_to(APP_DIR.parent)}:{lineno}"
+        for path in sorted(APP_DIR.rglob("*.py"))
+        if path != DATA_LAYER
+        for lineno in _raw_connect_calls(path)
+    ]
+    assert offenders == [], "use app.utils.database.get_db instead of psycopg2.connect"
+
+
+def test_auth_routes_use_shared_get_db():
+    from app.routes import auth
+
+    assert auth.get_db is database.get_db
+
+
+def test_checkout_hooks_run_for_every_get_db():
+    conn = MagicMock()
+    pool = MagicMock()
+    pool.getconn.return_value = conn
+    seen = []
+
+    with patch.object(database, "get_pool", return_value=pool), patch.object(
+        database, "_checkout_hooks", [seen.append]
+    ):
+        with Flask(__name__).app_context():
+            assert database.get_db() is conn
+            assert database.get_db() is conn
+
+    assert seen == [conn]
+
+
+def test_prepared_statement_is_prepared_once_per_connection():
+    statement = database.PreparedStatement(
+        "probe", "SELECT %(b)s, %(a)s, x %% 2 FROM t WHERE a = %(a)s", "a", "b"
+    )
+    first, second = MagicMock(), MagicMock()
+    first.connection, second.connection = MagicMock(), MagicMock()
+
+    statement.execute(first, {"a": 1, "b": 2})
+    statement.execute(first, {"a": 3, "b": 4})
+    statement.execute(second, {"a": 5, "b": 6})
+
+    prepare = "PREPARE probe AS SELECT $2, $1, x % 2 FROM t WHERE a = $1"
+    assert [c.args for c in first.execute.call_args_list] == [
+        (prepare,),
+        ("EXECUTE probe (%s, %s)", [1, 2]),
+        ("EXECUTE probe (%s, %s)", [3, 4]),
+    ]
+    assert second.execute.call_args_list[0].args == (prepare,)
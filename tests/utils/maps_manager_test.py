@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils.maps_manager import MapsManager
+
+
+@pytest.fixture
+def maps_db():
+    conn = MagicMock()
+    cursor = conn.cursor.return_value
+    cursor.fetchall.return_value = [{"event_id": 1, "embed_url": "https://maps/1"}]
+    with patch("app.utils.maps_manager.get_db", return_value=conn):
+        yield cursor
+
+
+def test_bulk_lookup_queries_once_and_caches_hits_and_misses(maps_db):
+    manager = MapsManager(cache_ttl=60)
+
+    assert manager.get_event_maps([1, 2]) == {1: "https://maps/1", 2: None}
+    assert manager.get_event_maps([1, 2]) == {1: "https://maps/1", 2: None}
+    assert maps_db.execute.call_count == 1
+
+
+def test_write_invalidates_cached_entry(maps_db):
+    manager = MapsManager(cache_ttl=60)
+    manager.get_event_map(1)
+
+    manager.set_event_map(1, '<iframe src="https://maps/new"></iframe>')
+    maps_db.fetchall.return_value = [{"event_id": 1, "embed_url": "https://maps/new"}]
+
+    assert manager.get_event_map(1) == "https://maps/new"
+    assert maps_db.execute.call_args_list[1].args[1] == (1, "https://maps/new")
+
+
+def test_cache_evicts_least_recently_used(maps_db):
+    manager = MapsManager(cache_ttl=60, maxsize=2)
+    manager.get_event_maps([1, 2])
+    manager.get_event_map(1)
+    manager.get_event_map(3)
+
+    manager.get_event_maps([1, 3])
+    assert maps_db.execute.call_count == 2
+    manager.get_event_map(2)
+    assert maps_db.execute.call_count == 3
+
+
+def test_read_racing_an_invalidation_is_not_cached(maps_db):
+    manager = MapsManager(cache_ttl=60)
+
+    def fetch_then_write():
+        manager.invalidate(1)
+        return [{"event_id": 1, "embed_url": "https://maps/old"}]
+
+    maps_db.fetchall.side_effect = fetch_then_write
+    assert manager.get_event_map(1) == "https://maps/old"
+
+    maps_db.fetchall.side_effect = None
+    maps_db.fetchall.return_value = [{"event_id": 1, "embed_url": "https://maps/new"}]
+    assert manager.get_event_map(1) == "https://maps/new"
@@ -0,0 +1,26 @@
+import pytest
+
+from app.utils.migrations import MIGRATIONS_DIR, discover_migrations
+
+
+def test_discover_migrations_orders_by_version_and_ignores_other_files(tmp_path):
+    (tmp_path / "0002_add_indexes.sql").write_text("SELECT 1;")
+    (tmp_path / "0001_initial.sql").write_text("SELECT 1;")
+    (tmp_path / "README.md").write_text("notes")
+
+    migrations = discover_migrations(tmp_path)
+
+    assert [(m.version, m.name) for m in migrations] == [(1, "initial"), (2, "add_indexes")]
+
+
+def test_discover_migrations_rejects_duplicate_versions(tmp_path):
+    (tmp_path / "0001_initial.sql").write_text("SELECT 1;")
+    (tmp_path / "0001_other.sql").write_text("SELECT 1;")
+
+    with pytest.raises(ValueError):
+        discover_migrations(tmp_path)
+
+
+def test_shipped_migrations_never_drop_tables():
+    for migration in discover_migrations(MIGRATIONS_DIR):
+        assert "DROP TABLE" not in migration.path.read_text().upper(), migration.path.name
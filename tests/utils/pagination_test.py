@@ -0,0 +1,46 @@
+import base64
+import datetime
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+def test_tokens_round_trip_dates_and_ids():
+    token = encode_cursor(datetime.date(2025, 3, 9), 4242)
+    assert "=" not in token
+    assert decode_cursor(token, datetime.date, int) == (datetime.date(2025, 3, 9), 4242)
+    edge = encode_cursor(datetime.date(9999, 12, 31), 2**63 - 1)
+    assert decode_cursor(edge, datetime.date, int) == (datetime.date(9999, 12, 31), 2**63 - 1)
+
+
+def _raw_token(payload):
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "not base64!",
+        encode_cursor(1),
+        encode_cursor("x", 1),
+        "e30",
+        # int(inf), ids past bigint, and a year Python's date cannot hold
+        _raw_token('["2025-01-01",1e999]'),
+        encode_cursor(datetime.date(2025, 1, 1), 2**63),
+        encode_cursor(datetime.date(2025, 1, 1), -2**63 - 1),
+        _raw_token('["+10000-01-01",1]'),
+    ],
+)
+def test_malformed_tokens_raise_value_error(token):
+    with pytest.raises(ValueError, match="Invalid page token"):
+        decode_cursor(token, datetime.date, int)
+
+
+def test_keyset_page_returns_a_token_only_when_rows_remain():
+    rows = [{"date": datetime.date(2025, 1, 3 - i), "id": 10 - i} for i in range(3)]
+    page, token = keyset_page(rows, 2, "date", "id")
+    assert page == rows[:2]
+    assert decode_cursor(token, datetime.date, int) == (datetime.date(2025, 1, 2), 9)
+    assert keyset_page(rows, 3, "date", "id") == (rows, None)
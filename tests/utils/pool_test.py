@@ -0,0 +1,83 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from psycopg2 import extensions
+
+from app.utils.pool import ConnectionPool, PoolTimeout
+
+
+def make_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+def test_pool_prefills_min_size_and_reuses_connections():
+    connect = MagicMock(side_effect=make_connection)
+    pool = ConnectionPool(connect, min_size=2, max_size=4)
+    assert connect.call_count == 2
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+    assert connect.call_count == 2
+
+
+def test_pool_times_out_when_exhausted():
+    pool = ConnectionPool(make_connection, min_size=0, max_size=1, timeout=0.05)
+    pool.getconn()
+
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiting_checkout_is_served_when_a_connection_is_returned():
+    pool = ConnectionPool(make_connection, min_size=0, max_size=1, timeout=2)
+    conn = pool.getconn()
+    got = []
+
+    waiter = threading.Thread(target=lambda: got.append(pool.getconn()))
+    waiter.start()
+    pool.putconn(conn)
+    waiter.join()
+
+    assert got == [conn]
+    stats = pool.stats()
+    assert stats["waits"] == 1
+    assert stats["in_use"] == 1
+
+
+def test_unhealthy_connection_is_replaced_on_borrow():
+    pool = ConnectionPool(make_connection, min_size=1, max_size=2)
+    broken = pool.getconn()
+    pool.putconn(broken)
+    broken.cursor.side_effect = Exception("server closed the connection")
+
+    conn = pool.getconn()
+    assert conn is not broken
+    broken.close.assert_called_once()
+    assert pool.stats()["connections_discarded"] == 1
+
+
+def test_connection_is_recycled_after_max_uses():
+    pool = ConnectionPool(make_connection, min_size=0, max_size=1, max_uses=2)
+    first = pool.getconn()
+    pool.putconn(first)
+    assert pool.getconn() is first
+    pool.putconn(first)
+
+    assert pool.getconn() is not first
+    first.close.assert_called_once()
+
+
+def test_open_transaction_is_rolled_back_on_return():
+    pool = ConnectionPool(make_connection, min_size=0, max_size=1, health_check=False)
+    conn = pool.getconn()
+    conn.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_INTRANS
+
+    pool.putconn(conn)
+    conn.rollback.assert_called_once()
+    assert pool.stats()["idle"] == 1